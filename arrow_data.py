@@ -0,0 +1,348 @@
+import numpy as np
+from typing import Dict, Iterator, List, Tuple
+
+from classes.decision_tree_encoded_dataset import DecisionTreeEncodedDataset
+from classes.decision_tree_schema import DecisionTreeSchema
+
+"""
+Collection of functions to read Apache Arrow tables and record batches (and Polars data frames) directly into NumPy arrays,
+without converting them into a pandas DataFrame first.
+pyarrow (and polars) are optional dependencies, they are only imported when such data is passed.
+"""
+
+
+def is_arrow_data(data: object) -> bool:
+    """
+    Check if data is a pyarrow Table or RecordBatch or a Polars DataFrame, without importing pyarrow or polars.
+
+    Parameters:
+    data (object): The data to check
+
+    Returns:
+    bool: True if the data comes from pyarrow or polars, False otherwise (e.g. for a pandas DataFrame)
+    """
+    return type(data).__module__.split(".")[0] in ("pyarrow", "polars")
+
+
+def to_arrow_table(data: object) -> "pyarrow.Table":
+    """
+    Get a pyarrow Table of Arrow data. Record batches and Polars data frames share their buffers with the table.
+
+    Parameters:
+    data (object): A pyarrow Table or RecordBatch or a Polars DataFrame
+
+    Returns:
+    pyarrow.Table: The table
+    """
+    pa = _import_pyarrow()
+    if isinstance(data, pa.Table):
+        return data
+    if isinstance(data, pa.RecordBatch):
+        return pa.Table.from_batches([data])
+
+    # Polars data frames are Arrow data themselves
+    if type(data).__module__.split(".")[0] == "polars" and hasattr(data, "to_arrow"):
+        table = data.to_arrow()
+        if isinstance(table, pa.Table):
+            return table
+
+    raise ValueError(
+        f"Data of type '{type(data).__name__}' not supported (select either a pandas DataFrame, a pyarrow Table or RecordBatch or a Polars DataFrame)."
+    )
+
+
+def _import_pyarrow():
+    """
+    Import pyarrow, which is only needed to read Arrow (and Polars) data.
+
+    Returns:
+    module: The pyarrow module
+    """
+    try:
+        import pyarrow
+    except ImportError as error:
+        raise ImportError("Reading Arrow (or Polars) data requires pyarrow (pip install pyarrow).") from error
+
+    return pyarrow
+
+
+def get_attribute_type(table: "pyarrow.Table", attribute: str) -> str:
+    """
+    Infer the type of an attribute from the Arrow type of its column (see DecisionTreeSchema).
+    Boolean columns are "boolean", dictionary-encoded columns "categorical", all other numeric columns "numeric"
+    and all other columns (e.g. strings) "categorical".
+
+    Parameters:
+    table (pyarrow.Table): The table
+    attribute (str): The attribute
+
+    Returns:
+    str: The type of the attribute ("categorical", "numeric" or "boolean")
+    """
+    pa = _import_pyarrow()
+    arrow_type = table.schema.field(attribute).type
+    if pa.types.is_dictionary(arrow_type):
+        return "categorical"
+    elif pa.types.is_boolean(arrow_type):
+        return "boolean"
+    elif pa.types.is_integer(arrow_type) or pa.types.is_floating(arrow_type) or pa.types.is_decimal(arrow_type):
+        return "numeric"
+    else:
+        return "categorical"
+
+
+def infer_schema(
+    table: "pyarrow.Table", attributes: List[str], schema: DecisionTreeSchema = None
+) -> DecisionTreeSchema:
+    """
+    Infer the types of the given attributes from the Arrow types of their columns (see get_attribute_type).
+
+    Parameters:
+    table (pyarrow.Table): The table
+    attributes (List[str]): The attributes to infer the types of
+    schema (DecisionTreeSchema), default None: The types of attributes that are not inferred. If set to None, the types of all attributes are inferred.
+
+    Returns:
+    DecisionTreeSchema: The schema of the attributes
+    """
+    attribute_types = dict()
+    for attribute in attributes:
+        if schema is not None and attribute in schema.attribute_types:
+            attribute_types[attribute] = schema.get_type(attribute)
+        else:
+            attribute_types[attribute] = get_attribute_type(table, attribute)
+
+    return DecisionTreeSchema(attribute_types)
+
+
+def get_numeric_column(table: "pyarrow.Table", attribute: str) -> np.ndarray:
+    """
+    Get the values of a numeric column as a float array. Missing values are NaN.
+    A float column with a single chunk and without missing values is read without a copy.
+
+    Parameters:
+    table (pyarrow.Table): The table
+    attribute (str): The attribute of the column
+
+    Returns:
+    np.ndarray: The values of the column
+    """
+    pa = _import_pyarrow()
+    column = table.column(attribute)
+    try:
+        column = column.cast(pa.float64())
+    except pa.ArrowException as error:
+        raise ValueError(f"Attribute '{attribute}' is not numeric (type {column.type}).") from error
+
+    return np.ascontiguousarray(column.to_numpy(), dtype=np.float64)
+
+
+def get_category_codes(table: "pyarrow.Table", attribute: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Get the category codes and categories of a column.
+    Dictionary-encoded columns keep their indices as codes (a single chunk without missing values is read without a copy),
+    all other columns are dictionary-encoded in the order of appearance of their values (like pd.factorize).
+    Missing values get their own code after the categories, with the category NaN.
+
+    Parameters:
+    table (pyarrow.Table): The table
+    attribute (str): The attribute of the column
+
+    Returns:
+    np.ndarray: The category code of every row
+    np.ndarray: The value of every category code
+    """
+    pa = _import_pyarrow()
+    column = table.column(attribute)
+    if not pa.types.is_dictionary(column.type):
+        column = column.dictionary_encode()
+    # All chunks share the same dictionary, so their indices are codes of the same categories
+    column = column.unify_dictionaries()
+    array = column.chunk(0) if column.num_chunks == 1 else column.combine_chunks()
+
+    indices = array.indices
+    categories = array.dictionary.to_numpy(zero_copy_only=False)
+    if indices.null_count > 0:
+        indices = indices.cast(pa.int64()).fill_null(len(categories))
+        categories = np.append(categories.astype(object), np.nan)
+
+    return indices.to_numpy(zero_copy_only=False), categories
+
+
+def get_boolean_codes(table: "pyarrow.Table", attribute: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Get the category codes and categories of a boolean attribute. False and True are the codes 0 and 1
+    (the bits of a boolean column are unpacked into bytes). Missing values get their own code after the categories.
+
+    Parameters:
+    table (pyarrow.Table): The table
+    attribute (str): The attribute of the column
+
+    Returns:
+    np.ndarray: The category code of every row
+    np.ndarray: The value of every category code
+    """
+    pa = _import_pyarrow()
+    column = table.column(attribute)
+    if pa.types.is_boolean(column.type) and column.null_count == 0:
+        return column.to_numpy().view(np.uint8), np.array([False, True], dtype=object)
+
+    codes, categories = get_category_codes(table, attribute)
+    # NaN is the only value that is not equal to itself
+    if not all(value in (False, True) for value in categories if value == value):
+        raise ValueError(f"Attribute '{attribute}' is not boolean (type {column.type}).")
+
+    return codes, categories
+
+
+def get_class_codes(table: "pyarrow.Table", target_attribute: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Get the class codes and the (sorted) class labels of the target attribute.
+
+    Parameters:
+    table (pyarrow.Table): The table
+    target_attribute (str): The target attribute used as the class label
+
+    Returns:
+    np.ndarray: The integer encoded class label of every row
+    np.ndarray: The original class labels of the class codes (sorted)
+    """
+    codes, categories = get_category_codes(table, target_attribute)
+
+    # Only the values that occur are class labels (a dictionary can hold unused values)
+    occurs = np.bincount(codes, minlength=len(categories)) > 0
+    class_labels, label_codes = np.unique(categories[occurs], return_inverse=True)
+    class_codes_of_categories = np.zeros(len(categories), dtype=np.intp)
+    class_codes_of_categories[occurs] = label_codes
+
+    return class_codes_of_categories[codes], class_labels
+
+
+def get_values(table: "pyarrow.Table", attribute: str) -> np.ndarray:
+    """
+    Get the (decoded) values of a column, as used to predict rows one at a time.
+    Numeric columns are float arrays with NaN for missing values, all other columns object arrays.
+
+    Parameters:
+    table (pyarrow.Table): The table
+    attribute (str): The attribute of the column
+
+    Returns:
+    np.ndarray: The value of every row
+    """
+    if get_attribute_type(table, attribute) == "numeric":
+        return get_numeric_column(table, attribute)
+
+    codes, categories = get_category_codes(table, attribute)
+    return np.asarray(categories, dtype=object)[codes]
+
+
+def iterate_rows(table: "pyarrow.Table") -> Iterator[Dict[str, object]]:
+    """
+    Iterate over the rows of a table as dictionaries of their values (see get_values), like pd.DataFrame.iterrows.
+
+    Parameters:
+    table (pyarrow.Table): The table
+
+    Returns:
+    Iterator[Dict[str, object]]: The value of every attribute of every row
+    """
+    attributes = list(table.column_names)
+    columns = [get_values(table, attribute) for attribute in attributes]
+    for values in zip(*columns):
+        yield dict(zip(attributes, values))
+
+
+def encode_dataset(
+    table: "pyarrow.Table",
+    attributes: List[str],
+    target_attribute: str,
+    sample_weights: np.ndarray = None,
+    schema: DecisionTreeSchema = None,
+) -> DecisionTreeEncodedDataset:
+    """
+    Encode the given attributes and the target attribute of a table, reading the Arrow buffers directly
+    (see DecisionTreeEncodedDataset.from_dataframe for pandas DataFrames).
+    Numeric attributes are continuous, categorical and boolean attributes discrete-valued.
+
+    Parameters:
+    table (pyarrow.Table): The table to encode
+    attributes (List[str]): The attributes to encode
+    target_attribute (str): The target attribute used as the class label
+    sample_weights (np.ndarray), default None: The weight of every row. If set to None, every row has weight 1.
+    schema (DecisionTreeSchema), default None: The types of the attributes. The types of attributes that are not in the schema are inferred from the Arrow types of their columns (see infer_schema).
+
+    Returns:
+    DecisionTreeEncodedDataset: The encoded dataset
+    """
+    schema = infer_schema(table, attributes, schema)
+
+    columns = dict()
+    categories = dict()
+    for attribute in attributes:
+        if not schema.is_discrete(attribute):
+            columns[attribute] = get_numeric_column(table, attribute)
+        elif schema.get_type(attribute) == "boolean":
+            columns[attribute], attribute_categories = get_boolean_codes(table, attribute)
+            categories[attribute] = np.asarray(attribute_categories, dtype=object)
+        else:
+            columns[attribute], attribute_categories = get_category_codes(table, attribute)
+            categories[attribute] = np.asarray(attribute_categories, dtype=object)
+
+    class_codes, class_labels = get_class_codes(table, target_attribute)
+
+    if sample_weights is not None:
+        sample_weights = np.array(sample_weights, dtype=np.float64)
+
+    return DecisionTreeEncodedDataset(columns, categories, class_codes, class_labels, sample_weights)
+
+
+def remove_rows(table: "pyarrow.Table", keep: np.ndarray) -> "pyarrow.Table":
+    """
+    Remove rows of a table.
+
+    Parameters:
+    table (pyarrow.Table): The table
+    keep (np.ndarray): A boolean mask of the rows to keep
+
+    Returns:
+    pyarrow.Table: The rows to keep
+    """
+    pa = _import_pyarrow()
+    return table.filter(pa.array(keep, type=pa.bool_()))
+
+
+def compress_duplicate_rows(
+    table: "pyarrow.Table", sample_weight: np.ndarray = None
+) -> Tuple["pyarrow.Table", np.ndarray]:
+    """
+    Collapse identical rows of a table into one row weighted by the number (or the total weight) of its copies
+    (see sample_weights.compress_duplicate_rows). The rows keep the order of their first appearance.
+
+    Parameters:
+    table (pyarrow.Table): The table to compress
+    sample_weight (np.ndarray), default None: The weight of every row. If set to None, every row has weight 1.
+
+    Returns:
+    pyarrow.Table: The distinct rows of the table
+    np.ndarray: The weight of every distinct row (integer counts if sample_weight is None)
+    """
+    pa = _import_pyarrow()
+    attributes = list(table.column_names)
+
+    # A name for the weight column that is not the name of an attribute
+    weight_column = "weight"
+    while weight_column in attributes:
+        weight_column = f"_{weight_column}"
+
+    if sample_weight is None:
+        weights = pa.array(np.ones(len(table), dtype=np.int64))
+    else:
+        weights = pa.array(sample_weight, type=pa.float64())
+
+    # Without threads, the groups are in the order of their first appearance
+    groups = table.append_column(weight_column, weights).group_by(
+        attributes, use_threads=False
+    ).aggregate([(weight_column, "sum")])
+
+    return groups.select(attributes), groups.column(f"{weight_column}_sum").to_numpy()
@@ -0,0 +1,229 @@
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from classes.decision_tree_encoded_dataset import DecisionTreeEncodedDataset
+
+
+class DecisionTreeAttributeLists:
+    """
+    A class holding the presorted attribute lists of the continuous attributes of one node in a decision tree
+    (as in the SLIQ algorithm).
+
+    Every attribute list holds the ids of the rows of the node, sorted by the value of the attribute.
+    The lists are sorted once for the whole dataset and then handed down to the child nodes with a stable partition,
+    so the rows of every node stay sorted and never have to be sorted again.
+    The partition happens in place: the attribute lists of a child node are views of a contiguous part of the
+    attribute lists of its parent node.
+    """
+
+    def __init__(
+        self,
+        values: Dict[str, np.ndarray],
+        class_list: np.ndarray,
+        row_ids: Dict[str, np.ndarray],
+        branch_of_row_id: np.ndarray,
+        sample_weights: np.ndarray = None,
+    ):
+        """
+        Initialize the attribute lists
+
+        Parameters:
+        values (Dict[str, np.ndarray]): The values of every continuous attribute for all rows of the dataset
+        class_list (np.ndarray): The integer encoded class label for all rows of the dataset
+        row_ids (Dict[str, np.ndarray]): The ids of the rows of the node for every attribute, sorted by the value of the attribute
+        branch_of_row_id (np.ndarray): A buffer with one entry per row of the dataset, used to partition the attribute lists
+        sample_weights (np.ndarray), default None: The weight of every row of the dataset. If set to None, every row has weight 1.
+        """
+        # The values, class labels and weights of the whole dataset (shared between all nodes)
+        self.values = values
+        self.class_list = class_list
+        self.sample_weights = sample_weights
+
+        # The sorted row ids of the node
+        self.row_ids = row_ids
+
+        # The buffer to mark the branch of every row when partitioning (shared between all nodes)
+        self.branch_of_row_id = branch_of_row_id
+
+    @classmethod
+    def from_encoded_dataset(
+        cls, dataset: DecisionTreeEncodedDataset, attributes: List[str]
+    ) -> "DecisionTreeAttributeLists":
+        """
+        Sort the given continuous attributes of an encoded dataset once.
+        The row ids are the positions of the rows in the dataset.
+
+        Parameters:
+        dataset (DecisionTreeEncodedDataset): The encoded dataset to sort
+        attributes (List[str]): The continuous attributes to sort
+
+        Returns:
+        DecisionTreeAttributeLists: The attribute lists of the root node
+        """
+        values = {attribute: dataset.get_column(attribute) for attribute in attributes}
+        class_list = dataset.class_codes
+        row_ids = {
+            attribute: np.argsort(values[attribute], kind="stable")
+            for attribute in attributes
+        }
+
+        return cls(
+            values,
+            class_list,
+            row_ids,
+            np.zeros(len(class_list), dtype=np.intp),
+            dataset.sample_weights,
+        )
+
+    @classmethod
+    def from_arrays(
+        cls, arrays: Dict[str, np.ndarray], dataset: DecisionTreeEncodedDataset
+    ) -> "DecisionTreeAttributeLists":
+        """
+        Reassemble attribute lists from their arrays (see get_arrays), e.g. from arrays in shared memory
+
+        Parameters:
+        arrays (Dict[str, np.ndarray]): The arrays of the attribute lists by name
+        dataset (DecisionTreeEncodedDataset): The encoded dataset the attribute lists were sorted from
+
+        Returns:
+        DecisionTreeAttributeLists: The attribute lists
+        """
+        row_ids = {
+            name.partition(":")[2]: array
+            for name, array in arrays.items()
+            if name.startswith("row_ids:")
+        }
+        values = {attribute: dataset.get_column(attribute) for attribute in row_ids}
+
+        return cls(
+            values,
+            dataset.class_codes,
+            row_ids,
+            arrays["branch_of_row_id"],
+            dataset.sample_weights,
+        )
+
+    def get_arrays(self) -> Dict[str, np.ndarray]:
+        """
+        Get the sorted row ids ("row_ids:<attribute>") and the partition buffer ("branch_of_row_id") by name
+
+        Returns:
+        Dict[str, np.ndarray]: The arrays of the attribute lists
+        """
+        arrays = {"branch_of_row_id": self.branch_of_row_id}
+        for attribute, row_ids in self.row_ids.items():
+            arrays[f"row_ids:{attribute}"] = row_ids
+
+        return arrays
+
+    def get_range(self, start: int, end: int) -> "DecisionTreeAttributeLists":
+        """
+        Get the attribute lists of the rows at the positions start to end (exclusive) of every attribute list
+
+        Parameters:
+        start (int): The first position
+        end (int): The position after the last position
+
+        Returns:
+        DecisionTreeAttributeLists: The attribute lists (views)
+        """
+        row_ids = {attribute: ids[start:end] for attribute, ids in self.row_ids.items()}
+
+        return DecisionTreeAttributeLists(
+            self.values, self.class_list, row_ids, self.branch_of_row_id, self.sample_weights
+        )
+
+    def get_attributes(self) -> List[str]:
+        """
+        Get the attributes that have an attribute list
+
+        Returns:
+        List[str]: The attributes that have an attribute list
+        """
+        return list(self.row_ids.keys())
+
+    def get_sorted(self, attribute: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the values and class labels of the rows of the node, sorted by the value of the attribute
+
+        Parameters:
+        attribute (str): The attribute to get the sorted values for
+
+        Returns:
+        np.ndarray: The sorted values of the attribute
+        np.ndarray: The integer encoded class labels in the same order
+        """
+        row_ids = self.row_ids[attribute]
+
+        return self.values[attribute][row_ids], self.class_list[row_ids]
+
+    def get_sorted_sample_weights(self, attribute: str) -> np.ndarray:
+        """
+        Get the weights of the rows of the node, sorted by the value of the attribute
+
+        Parameters:
+        attribute (str): The attribute to get the sorted weights for
+
+        Returns:
+        np.ndarray: The weights of the rows in the same order as get_sorted (None if every row has weight 1)
+        """
+        if self.sample_weights is None:
+            return None
+        return self.sample_weights[self.row_ids[attribute]]
+
+    def partition(
+        self,
+        row_ids: np.ndarray,
+        branch_of_row: np.ndarray,
+        n_branches: int,
+        attributes: List[str],
+    ) -> List["DecisionTreeAttributeLists"]:
+        """
+        Partition the attribute lists of the node into the attribute lists of its child nodes.
+        The attribute lists are reordered in place with a stable partition, so they stay sorted.
+
+        Parameters:
+        row_ids (np.ndarray): The ids of the rows of the node
+        branch_of_row (np.ndarray): The branch (child node) every row in row_ids falls into (-1 for no branch, these rows are moved behind the rows of all branches)
+        n_branches (int): The number of branches
+        attributes (List[str]): The attributes the child nodes still consider
+
+        Returns:
+        List[DecisionTreeAttributeLists]: The attribute lists of every child node
+        """
+        # Mark the branch of every row of the node
+        self.branch_of_row_id[row_ids] = branch_of_row
+
+        # The attribute lists of every branch are a contiguous part of the attribute lists of the node
+        counts = np.bincount(branch_of_row[branch_of_row >= 0], minlength=n_branches)
+        ends = np.cumsum(counts)
+        starts = ends - counts
+
+        child_row_ids = [dict() for _ in range(n_branches)]
+        for attribute in attributes:
+            if attribute not in self.row_ids:
+                continue
+
+            # Move the rows of every branch together, keeping their (sorted) order
+            sorted_row_ids = self.row_ids[attribute]
+            branches = self.branch_of_row_id[sorted_row_ids]
+            sorted_row_ids[:] = np.concatenate(
+                [sorted_row_ids[branches == branch] for branch in range(n_branches)]
+                + [sorted_row_ids[branches < 0]]
+            )
+
+            for branch in range(n_branches):
+                child_row_ids[branch][attribute] = sorted_row_ids[starts[branch] : ends[branch]]
+
+        return [
+            DecisionTreeAttributeLists(
+                self.values,
+                self.class_list,
+                child_row_ids[branch],
+                self.branch_of_row_id,
+                self.sample_weights,
+            )
+            for branch in range(n_branches)
+        ]
@@ -1,3 +1,5 @@
+import numpy as np
+
 from classes.decision_tree_decision_outcome import DecisionTreeDecisionOutcome
 from classes.decision_tree_node import DecisionTreeNode
 
@@ -53,6 +55,19 @@ class DecisionTreeBranch:
 
         return self.label.value_matches(value)
 
+    def values_match(self, values: np.ndarray) -> np.ndarray:
+        """
+        Check which of the given values match/comply with the branch label
+
+        Parameters:
+        values (np.ndarray): The values to check
+
+        Returns:
+        np.ndarray: A boolean mask, True for every value that matches/complies with the branch label
+        """
+
+        return self.label.values_match(values)
+
     def __str__(self, level: int = 0) -> str:
         """
         Get a string representation of the branch
@@ -0,0 +1,245 @@
+import ast
+import importlib
+import py_compile
+import types
+from typing import Callable, List
+
+import numpy as np
+
+from classes.decision_tree_node import DecisionTreeNode
+from classes.decision_tree_leaf_node import DecisionTreeLeafNode
+from classes.decision_tree_internal_node import DecisionTreeInternalNode
+from classes.decision_tree_decision_outcome import DecisionTreeDecisionOutcome
+from classes.decision_tree_decision_outcome_above import (
+    DecisionTreeDecisionOutcomeAbove,
+)
+from classes.decision_tree_decision_outcome_below_equal import (
+    DecisionTreeDecisionOutcomeBelowEqual,
+)
+from classes.decision_tree_decision_outcome_equals import (
+    DecisionTreeDecisionOutcomeEquals,
+)
+from classes.decision_tree_decision_outcome_in_list import (
+    DecisionTreeDecisionOutcomeInList,
+)
+
+
+class DecisionTreeCodeGenerator:
+    """
+    A class generating the Python source of a function that predicts a single row with a decision tree.
+
+    Every internal node becomes an if/elif statement on the value of its attribute and every leaf a return of its
+    class label, so a row is predicted without visiting node objects. The thresholds, values and class labels are
+    written as Python literals. Subtrees below MAX_NESTING levels are moved into functions of their own, so deep trees
+    stay within the nesting limit of the Python parser.
+
+    The rows are either dictionaries (or other mappings like pd.Series) of the values of the attributes, or tuples of
+    the values in the order of the attributes of the generator.
+    """
+
+    # The maximum number of nested if statements in one function
+    MAX_NESTING = 50
+
+    def __init__(self, tree: DecisionTreeNode, attributes: List[str], row_format: str = "dict"):
+        """
+        Initialize the code generator
+
+        Parameters:
+        tree (DecisionTreeNode): The root node of the decision tree
+        attributes (List[str]): The attributes of a row (their order is the order of the values of a tuple)
+        row_format (str), default "dict": How the rows are passed to the generated function ("dict" or "tuple")
+        """
+        if row_format not in ["dict", "tuple"]:
+            raise ValueError(f"Row format '{row_format}' not valid (select either 'dict' or 'tuple').")
+
+        self.tree = tree
+        self.attributes = list(attributes)
+        self.row_format = row_format
+
+        # The lines of every generated function (the first one predicts the whole tree)
+        self.functions: List[List[str]] = []
+
+    def get_source(self) -> str:
+        """
+        Generate the source of a module with the function predict(row)
+
+        Returns:
+        str: The source of the module
+        """
+        self.functions = []
+        self._add_function(self.tree, "predict")
+
+        header = [
+            '"""',
+            "Predictor of a decision tree, generated by DecisionTree.generate_predictor (do not edit).",
+            '"""',
+            "",
+            "# The attributes of a row (the order of the values of a tuple)",
+            f"ATTRIBUTES = {self._get_literal(tuple(self.attributes))}",
+            "",
+            "",
+            "def _no_matching_branch(value, attribute):",
+            "    return ValueError(f\"No matching branch found for value '{value}' of attribute '{attribute}'\")",
+        ]
+
+        return "\n".join(header + [line for function in self.functions for line in ["", ""] + function]) + "\n"
+
+    def compile_function(self) -> Callable:
+        """
+        Compile the generated source (see get_source) in memory
+
+        Returns:
+        Callable: The function predict(row)
+        """
+        namespace = dict()
+        exec(compile(self.get_source(), "<decision tree predictor>", "exec"), namespace)
+
+        return namespace["predict"]
+
+    def write_module(self, module_path: str) -> Callable:
+        """
+        Write the generated source (see get_source) to a module that is importable like any other module.
+        The bytecode of the module is written to __pycache__ with a hash of the source, so later imports (also in other
+        processes) reuse it only as long as the source is unchanged. A bytecode file is not checked against the
+        modification time of the source, which would reuse stale bytecode for a tree written to the same path within a second.
+
+        Parameters:
+        module_path (str): The path of the module file (e.g. "predictor.py")
+
+        Returns:
+        Callable: The function predict(row) of the module
+        """
+        source = self.get_source()
+        with open(module_path, "w", encoding="utf-8") as module_file:
+            module_file.write(source)
+
+        py_compile.compile(
+            module_path, doraise=True, invalidation_mode=py_compile.PycInvalidationMode.CHECKED_HASH
+        )
+        importlib.invalidate_caches()
+
+        # The function is compiled from the source that was just written, not from any cached bytecode
+        module = types.ModuleType("decision_tree_predictor")
+        module.__file__ = module_path
+        exec(compile(source, module_path, "exec"), module.__dict__)
+
+        return module.predict
+
+    def _add_function(self, node: DecisionTreeNode, name: str):
+        """
+        Generate a function predicting the rows that reach a node
+
+        Parameters:
+        node (DecisionTreeNode): The root node of the subtree
+        name (str): The name of the function
+        """
+        lines = [f"def {name}(row):"]
+        self.functions.append(lines)
+        self._add_node(node, lines, 1)
+
+    def _add_node(self, node: DecisionTreeNode, lines: List[str], level: int):
+        """
+        Generate the statements of a node.
+        This is a recursive function that generates the statements of all nodes of the subtree.
+
+        Parameters:
+        node (DecisionTreeNode): The node
+        lines (List[str]): The lines of the function the statements are added to
+        level (int): The indentation level of the statements
+        """
+        indentation = "    " * level
+
+        if isinstance(node, DecisionTreeLeafNode):
+            lines.append(f"{indentation}return {self._get_literal(node.get_label())}")
+        elif isinstance(node, DecisionTreeInternalNode):
+            # Continue deep subtrees in a function of their own
+            if level > self.MAX_NESTING:
+                name = f"_predict_subtree_{len(self.functions)}"
+                lines.append(f"{indentation}return {name}(row)")
+                self._add_function(node, name)
+                return
+
+            attribute = node.get_label()
+            lines.append(f"{indentation}value = row[{self._get_row_key(attribute)}]")
+            for index, branch in enumerate(node.get_branches()):
+                keyword = "if" if index == 0 else "elif"
+                lines.append(f"{indentation}{keyword} {self._get_condition(branch.get_label())}:")
+                self._add_node(branch.get_branch_node(), lines, level + 1)
+
+            # Like in DecisionTree._predict_tuple, a value without a matching branch is an error
+            lines.append(f"{indentation}raise _no_matching_branch(value, {self._get_literal(attribute)})")
+        else:
+            raise TypeError("Unknown node type encountered in code generation.")
+
+    def _get_row_key(self, attribute: str) -> str:
+        """
+        Get the source of the key of the value of an attribute in a row
+
+        Parameters:
+        attribute (str): The attribute
+
+        Returns:
+        str: The attribute (rows of format "dict") or its position (rows of format "tuple")
+        """
+        if self.row_format == "dict":
+            return self._get_literal(attribute)
+
+        if attribute not in self.attributes:
+            raise ValueError(f"Attribute '{attribute}' not in the attributes of a row.")
+
+        return str(self.attributes.index(attribute))
+
+    def _get_condition(self, outcome: DecisionTreeDecisionOutcome) -> str:
+        """
+        Get the source of the condition of a decision outcome on the variable "value"
+
+        Parameters:
+        outcome (DecisionTreeDecisionOutcome): The decision outcome
+
+        Returns:
+        str: The condition
+        """
+        if isinstance(outcome, DecisionTreeDecisionOutcomeBelowEqual):
+            return f"value <= {self._get_literal(outcome.value)}"
+        if isinstance(outcome, DecisionTreeDecisionOutcomeAbove):
+            return f"value > {self._get_literal(outcome.value)}"
+
+        # Missing values (NaN) are not equal to any value, so they never match
+        if isinstance(outcome, DecisionTreeDecisionOutcomeEquals):
+            if outcome.value != outcome.value:
+                return "False"
+            return f"value == {self._get_literal(outcome.value)}"
+        if isinstance(outcome, DecisionTreeDecisionOutcomeInList):
+            values = [self._get_literal(value) for value in outcome.value if value == value]
+            if not values:
+                return "False"
+            # A set of literals is a constant, so the lookup is a single hash lookup
+            return "value in {" + ", ".join(values) + "}"
+
+        raise ValueError(f"Decision outcome '{outcome}' can not be generated.")
+
+    @staticmethod
+    def _get_literal(value: object) -> str:
+        """
+        Get the source of a value as a Python literal (NumPy scalars are written as their Python values)
+
+        Parameters:
+        value (object): The value
+
+        Returns:
+        str: The literal
+        """
+        if isinstance(value, np.generic):
+            value = value.item()
+        if isinstance(value, tuple):
+            return "(" + "".join(DecisionTreeCodeGenerator._get_literal(item) + ", " for item in value) + ")"
+
+        literal = repr(value)
+        try:
+            is_literal = ast.literal_eval(literal) == value
+        except (ValueError, SyntaxError):
+            is_literal = False
+        if not is_literal:
+            raise ValueError(f"Value '{value}' can not be written as a Python literal.")
+
+        return literal
@@ -0,0 +1,275 @@
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from classes.decision_tree_node import DecisionTreeNode
+from classes.decision_tree_leaf_node import DecisionTreeLeafNode
+from classes.decision_tree_internal_node import DecisionTreeInternalNode
+from classes.decision_tree_decision_outcome_above import (
+    DecisionTreeDecisionOutcomeAbove,
+)
+from classes.decision_tree_decision_outcome_below_equal import (
+    DecisionTreeDecisionOutcomeBelowEqual,
+)
+from classes.decision_tree_decision_outcome_equals import (
+    DecisionTreeDecisionOutcomeEquals,
+)
+from classes.decision_tree_decision_outcome_in_list import (
+    DecisionTreeDecisionOutcomeInList,
+)
+
+
+class DecisionTreeCompiledTree:
+    """
+    A decision tree flattened into parallel NumPy arrays, as used to predict many rows at once.
+
+    Every node is a position in the arrays (the root node is position 0), holding the kind of the node, the attribute
+    it splits on and, depending on the kind:
+    - "threshold" nodes: The threshold and the positions of the child nodes below or equal to / above the threshold
+    - "categorical" nodes: A category set, i.e. a row of a table holding the position of the child node of every value
+      (the values of an attribute are numbered once for the whole tree)
+    - leaves: The code of their class label
+
+    All rows are advanced through the tree level by level at once, with one array lookup per level instead of
+    visiting the nodes row by row.
+    """
+
+    # The kinds of nodes
+    LEAF = 0
+    THRESHOLD = 1
+    CATEGORICAL = 2
+
+    def __init__(self, tree: DecisionTreeNode):
+        """
+        Flatten a decision tree
+
+        Parameters:
+        tree (DecisionTreeNode): The root node of the decision tree
+        """
+        # The tree the arrays were flattened from
+        self.tree = tree
+
+        # The attributes the tree splits on, and the values of every categorical attribute (numbered by their position)
+        self.attributes: List[str] = []
+        self.vocabularies: Dict[str, Dict[object, int]] = dict()
+
+        # The class labels of the leaves, in the order of their codes
+        self.labels: Dict[str | int | float, int] = dict()
+
+        # The nodes in breadth-first order, the children of a node are added when the node is flattened
+        nodes = [tree]
+        kinds = []
+        features = []
+        thresholds = []
+        children = []
+        category_sets = []
+        category_children = []
+        label_codes = []
+
+        position = 0
+        while position < len(nodes):
+            node = nodes[position]
+            position += 1
+
+            if isinstance(node, DecisionTreeLeafNode):
+                kinds.append(self.LEAF)
+                features.append(-1)
+                thresholds.append(np.nan)
+                children.append((-1, -1))
+                category_sets.append(-1)
+                label_codes.append(self.labels.setdefault(node.get_label(), len(self.labels)))
+                continue
+            if not isinstance(node, DecisionTreeInternalNode):
+                raise TypeError("Unknown node type encountered in compilation.")
+
+            attribute = node.get_label()
+            if attribute not in self.attributes:
+                self.attributes.append(attribute)
+            features.append(self.attributes.index(attribute))
+            label_codes.append(-1)
+
+            outcomes = [branch.get_label() for branch in node.get_branches()]
+            child_positions = [
+                len(nodes) + branch_index for branch_index in range(len(outcomes))
+            ]
+            nodes.extend(branch.get_branch_node() for branch in node.get_branches())
+
+            threshold = self._get_threshold(outcomes)
+            if threshold is not None:
+                kinds.append(self.THRESHOLD)
+                thresholds.append(threshold)
+                below_equal = [
+                    isinstance(outcome, DecisionTreeDecisionOutcomeBelowEqual) for outcome in outcomes
+                ].index(True)
+                children.append((child_positions[below_equal], child_positions[1 - below_equal]))
+                category_sets.append(-1)
+            elif all(
+                isinstance(outcome, (DecisionTreeDecisionOutcomeEquals, DecisionTreeDecisionOutcomeInList))
+                for outcome in outcomes
+            ):
+                kinds.append(self.CATEGORICAL)
+                thresholds.append(np.nan)
+                children.append((-1, -1))
+                category_sets.append(len(category_children))
+                category_children.append(self._get_children_of_values(attribute, outcomes, child_positions))
+            else:
+                raise ValueError(
+                    f"Branches of attribute '{attribute}' can not be compiled (select either one value or list of values per branch, or a threshold)."
+                )
+
+        self.kinds = np.array(kinds, dtype=np.int8)
+        self.features = np.array(features, dtype=np.intp)
+        self.thresholds = np.array(thresholds, dtype=np.float64)
+        self.children = np.array(children, dtype=np.intp).reshape(-1, 2)
+        self.category_sets = np.array(category_sets, dtype=np.intp)
+        self.label_codes = np.array(label_codes, dtype=np.intp)
+
+        # The child of every value code of every category set. The last column is for values that are not in the vocabulary
+        # of the attribute (no branch, -1).
+        n_codes = max([len(vocabulary) for vocabulary in self.vocabularies.values()], default=0)
+        self.category_children = np.full((len(category_children), n_codes + 1), -1, dtype=np.intp)
+        for category_set, children_of_values in enumerate(category_children):
+            for code, child in children_of_values.items():
+                self.category_children[category_set, code] = child
+
+        self.label_array = np.empty(len(self.labels), dtype=object)
+        self.label_array[:] = list(self.labels)
+
+    @staticmethod
+    def _get_threshold(outcomes: List[object]) -> float:
+        """
+        Get the threshold of a node with one branch below or equal to and one branch above the same threshold
+
+        Parameters:
+        outcomes (List[DecisionTreeDecisionOutcome]): The decision outcomes of the branches of the node
+
+        Returns:
+        float: The threshold (None if the branches are not split at a threshold)
+        """
+        kinds = {type(outcome) for outcome in outcomes}
+        if (
+            len(outcomes) != 2
+            or kinds != {DecisionTreeDecisionOutcomeBelowEqual, DecisionTreeDecisionOutcomeAbove}
+            or not (outcomes[0].value is outcomes[1].value or outcomes[0].value == outcomes[1].value)
+        ):
+            return None
+
+        return float(outcomes[0].value)
+
+    def _get_children_of_values(
+        self, attribute: str, outcomes: List[object], child_positions: List[int]
+    ) -> Dict[int, int]:
+        """
+        Get the child of every value of a categorical node, numbering new values in the vocabulary of the attribute.
+        Like in DecisionTree._predict_tuple, a value in several branches goes to the first of them and missing values
+        (NaN) are in no branch.
+
+        Parameters:
+        attribute (str): The attribute of the node
+        outcomes (List[DecisionTreeDecisionOutcome]): The decision outcomes of the branches of the node
+        child_positions (List[int]): The position of the child node of every branch
+
+        Returns:
+        Dict[int, int]: The position of the child node of every value code
+        """
+        vocabulary = self.vocabularies.setdefault(attribute, dict())
+        children_of_values = dict()
+        for outcome, child in zip(outcomes, child_positions):
+            values = outcome.value if isinstance(outcome, DecisionTreeDecisionOutcomeInList) else [outcome.value]
+            for value in values:
+                # NaN is the only value that is not equal to itself
+                if value != value:
+                    continue
+                code = vocabulary.setdefault(value, len(vocabulary))
+                children_of_values.setdefault(code, child)
+
+        return children_of_values
+
+    def get_n_nodes(self) -> int:
+        """
+        Get the number of nodes of the tree
+
+        Returns:
+        int: The number of nodes
+        """
+        return len(self.kinds)
+
+    def predict(self, columns: Dict[str, np.ndarray], n_rows: int) -> List[str | int | float]:
+        """
+        Predict the class label of every row, advancing all rows through the tree one level at a time.
+
+        Parameters:
+        columns (Dict[str, np.ndarray]): The values of every attribute the tree splits on (one value per row)
+        n_rows (int): The number of rows
+
+        Returns:
+        List[str | int | float]: The predicted class label of every row
+        """
+        # The values of the attributes as floats (for thresholds) and as value codes (for category sets)
+        numeric_values = np.zeros((n_rows, len(self.attributes)))
+        value_codes = np.zeros((n_rows, len(self.attributes)), dtype=np.intp)
+        numeric_features = set(self.features[self.kinds == self.THRESHOLD].tolist())
+        for feature, attribute in enumerate(self.attributes):
+            if feature in numeric_features:
+                numeric_values[:, feature] = np.asarray(columns[attribute], dtype=np.float64)
+            if attribute in self.vocabularies:
+                value_codes[:, feature] = self._get_value_codes(attribute, columns[attribute])
+
+        # The node of every row, and the rows that did not reach a leaf yet
+        nodes = np.zeros(n_rows, dtype=np.intp)
+        rows = np.flatnonzero(self.kinds[nodes] != self.LEAF)
+        while len(rows) > 0:
+            row_nodes = nodes[rows]
+            row_features = self.features[row_nodes]
+            next_nodes = np.full(len(rows), -1, dtype=np.intp)
+
+            is_threshold = self.kinds[row_nodes] == self.THRESHOLD
+            if is_threshold.any():
+                threshold_nodes = row_nodes[is_threshold]
+                values = numeric_values[rows[is_threshold], row_features[is_threshold]]
+                thresholds = self.thresholds[threshold_nodes]
+                next_nodes[is_threshold] = np.where(
+                    values <= thresholds,
+                    self.children[threshold_nodes, 0],
+                    np.where(values > thresholds, self.children[threshold_nodes, 1], -1),
+                )
+
+            is_categorical = ~is_threshold
+            if is_categorical.any():
+                codes = value_codes[rows[is_categorical], row_features[is_categorical]]
+                next_nodes[is_categorical] = self.category_children[
+                    self.category_sets[row_nodes[is_categorical]], codes
+                ]
+
+            # Values without a matching branch (e.g. missing values or values not seen in training)
+            if np.any(next_nodes < 0):
+                row_index = np.flatnonzero(next_nodes < 0)[0]
+                attribute = self.attributes[row_features[row_index]]
+                value = columns[attribute][rows[row_index]]
+                raise ValueError(f"No matching branch found for value '{value}' of attribute '{attribute}'")
+
+            nodes[rows] = next_nodes
+            rows = rows[self.kinds[next_nodes] != self.LEAF]
+
+        return list(self.label_array[self.label_codes[nodes]])
+
+    def _get_value_codes(self, attribute: str, values: np.ndarray) -> np.ndarray:
+        """
+        Get the code of every value of a categorical attribute in its vocabulary
+
+        Parameters:
+        attribute (str): The attribute
+        values (np.ndarray): The values of the attribute
+
+        Returns:
+        np.ndarray: The code of every value (the number of codes of the tree for values that are not in the vocabulary)
+        """
+        # The values of the vocabulary are in the order of their codes
+        known_values = pd.Index(list(self.vocabularies[attribute]), dtype=object)
+        codes = known_values.get_indexer(pd.Index(values, dtype=object))
+
+        # Unknown values (-1) get the last code, which has no branch
+        codes[codes < 0] = self.category_children.shape[1] - 1
+
+        return codes
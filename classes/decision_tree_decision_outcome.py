@@ -1,3 +1,6 @@
+import numpy as np
+
+
 class DecisionTreeDecisionOutcome:
     """
     Abstract superclass for all possible decision outcomes in a decision tree
@@ -15,6 +18,18 @@ class DecisionTreeDecisionOutcome:
         """
         raise NotImplementedError()
 
+    def values_match(self, values: np.ndarray) -> np.ndarray:
+        """
+        Check which of the given values match the criteria to fall into this decision outcome (vectorized value_matches)
+
+        Parameters:
+        values (np.ndarray): The values to check
+
+        Returns:
+        np.ndarray: A boolean mask, True for every value that matches the criteria
+        """
+        raise NotImplementedError()
+
     def __str__(self) -> str:
         """
         Return a string representation of the decision outcome
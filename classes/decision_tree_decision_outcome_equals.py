@@ -1,3 +1,5 @@
+import numpy as np
+
 from classes.decision_tree_decision_outcome import DecisionTreeDecisionOutcome
 
 
@@ -28,6 +30,18 @@ class DecisionTreeDecisionOutcomeEquals(DecisionTreeDecisionOutcome):
         """
         return self.value == value
 
+    def values_match(self, values: np.ndarray) -> np.ndarray:
+        """
+        Check which of the given values match the criteria to fall into this decision outcome
+
+        Parameters:
+        values (np.ndarray): The values to check
+
+        Returns:
+        np.ndarray: A boolean mask, True for every value that matches the criteria
+        """
+        return np.asarray(values == self.value, dtype=bool)
+
     def __eq__(self, decisionOutcome: object) -> bool:
         """
         Check if the given value is equal to this decision outcome
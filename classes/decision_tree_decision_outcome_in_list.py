@@ -1,5 +1,8 @@
 from typing import List
 
+import numpy as np
+import pandas as pd
+
 from classes.decision_tree_decision_outcome import DecisionTreeDecisionOutcome
 
 
@@ -28,7 +31,22 @@ class DecisionTreeDecisionOutcomeInList(DecisionTreeDecisionOutcome):
         Returns:
         bool: True if the value matches the criteria, False otherwise
         """
-        return value in self.value
+        # "in" compares by identity first, so a missing value (NaN) would match the same NaN object in the list
+        return value == value and value in self.value
+
+    def values_match(self, values: np.ndarray) -> np.ndarray:
+        """
+        Check which of the given values match the criteria to fall into this decision outcome
+
+        Parameters:
+        values (np.ndarray): The values to check
+
+        Returns:
+        np.ndarray: A boolean mask, True for every value that matches the criteria
+        """
+        # Hash-based lookup of every value in the list (like "in", but for all values at once).
+        # Unlike "in", isin would match missing values (NaN) to NaN in the list, so NaN is left out of the list.
+        return pd.Index(values, dtype=object).isin([value for value in self.value if value == value])
 
     def __eq__(self, decisionOutcome: object) -> bool:
         """
@@ -0,0 +1,511 @@
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from classes.decision_tree_schema import DecisionTreeSchema
+
+
+class DecisionTreeEncodedDataset:
+    """
+    A class holding a dataset encoded into contiguous NumPy arrays, as used to fit a decision tree.
+
+    Discrete-valued attributes are stored as integer category codes, continuous attributes as float arrays
+    and the target attribute as integer class codes. The codes of pandas Categorical and boolean columns are
+    the memory of the columns themselves (no copy), so they can be smaller integers than np.intp. The codes are only decoded back into the original values
+    when the decision outcomes of the tree are created.
+
+    The arrays are read-only and shared by all nodes of the tree, a node only holds the positions of its rows.
+    """
+
+    def __init__(
+        self,
+        columns: Dict[str, np.ndarray],
+        categories: Dict[str, np.ndarray],
+        class_codes: np.ndarray,
+        class_labels: np.ndarray,
+        sample_weights: np.ndarray = None,
+    ):
+        """
+        Initialize the encoded dataset
+
+        Parameters:
+        columns (Dict[str, np.ndarray]): The encoded values of every attribute (category codes or floats)
+        categories (Dict[str, np.ndarray]): The original values of the category codes of every discrete-valued attribute
+        class_codes (np.ndarray): The integer encoded class label of every row
+        class_labels (np.ndarray): The original class labels of the class codes (sorted)
+        sample_weights (np.ndarray), default None: The weight of every row. If set to None, every row has weight 1.
+        """
+        self.columns = columns
+        self.categories = categories
+        self.class_codes = class_codes
+        self.class_labels = class_labels
+        self.sample_weights = sample_weights
+
+        # The bin codes and bin thresholds of the continuous attributes (see bin_continuous_attributes)
+        self.bins = dict()
+        self.bin_thresholds = dict()
+
+        # Whether every attribute has missing values, checked once on demand (see has_missing_values)
+        self.missing_values = dict()
+
+        # The encoded dataset is shared by all nodes, so make sure that no node modifies it
+        for array in [*self.columns.values(), self.class_codes]:
+            array.flags.writeable = False
+        if self.sample_weights is not None:
+            self.sample_weights.flags.writeable = False
+
+    @classmethod
+    def from_dataframe(
+        cls,
+        dataset: pd.DataFrame,
+        attributes: List[str],
+        target_attribute: str,
+        sample_weights: np.ndarray = None,
+        schema: DecisionTreeSchema = None,
+    ) -> "DecisionTreeEncodedDataset":
+        """
+        Encode the given attributes and the target attribute of a dataset.
+        Numeric attributes are continuous, categorical and boolean attributes discrete-valued.
+
+        Parameters:
+        dataset (pd.DataFrame): The dataset to encode
+        attributes (List[str]): The attributes to encode
+        target_attribute (str): The target attribute used as the class label
+        sample_weights (np.ndarray), default None: The weight of every row. If set to None, every row has weight 1.
+        schema (DecisionTreeSchema), default None: The types of the attributes. The types of attributes that are not in the schema are inferred from the dtypes of their columns (see DecisionTreeSchema.infer).
+
+        Returns:
+        DecisionTreeEncodedDataset: The encoded dataset
+        """
+        if schema is None:
+            schema = DecisionTreeSchema.infer(dataset, attributes)
+        else:
+            schema = schema.complete(dataset, attributes)
+
+        columns = dict()
+        categories = dict()
+        for attribute in attributes:
+            column = dataset[attribute]
+            if not schema.is_discrete(attribute):
+                try:
+                    columns[attribute] = np.ascontiguousarray(column.to_numpy(dtype=np.float64))
+                except (TypeError, ValueError) as error:
+                    raise ValueError(
+                        f"Attribute '{attribute}' is not numeric (dtype {column.dtype})."
+                    ) from error
+            elif (
+                schema.get_type(attribute) == "boolean"
+                and column.dtype != np.bool_
+                and not column.dropna().isin([False, True]).all()
+            ):
+                raise ValueError(f"Attribute '{attribute}' is not boolean (dtype {column.dtype}).")
+            elif isinstance(column.dtype, pd.CategoricalDtype):
+                columns[attribute], categories[attribute] = cls._get_categorical_codes(column)
+            elif column.dtype == np.bool_:
+                # False and True are the codes 0 and 1, i.e. the bytes of the column
+                columns[attribute] = column.to_numpy().view(np.uint8)
+                categories[attribute] = np.array([False, True], dtype=object)
+            else:
+                # The codes follow the order of appearance of the values
+                codes, uniques = pd.factorize(column, use_na_sentinel=False)
+                columns[attribute] = codes.astype(np.intp)
+                categories[attribute] = np.asarray(uniques, dtype=object)
+
+        # The class labels are sorted, so the first of equally frequent classes is the smallest one
+        class_labels, class_codes = np.unique(
+            dataset[target_attribute].to_numpy(), return_inverse=True
+        )
+
+        if sample_weights is not None:
+            sample_weights = np.array(sample_weights, dtype=np.float64)
+
+        return cls(columns, categories, class_codes.astype(np.intp), class_labels, sample_weights)
+
+    @staticmethod
+    def _get_categorical_codes(column: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the category codes and categories of a pandas Categorical column.
+        The codes are the codes of the column itself, unless the column has missing values (code -1):
+        then the missing values get their own code after the categories, like in all other discrete-valued attributes.
+
+        Parameters:
+        column (pd.Series): The column with a pandas Categorical dtype
+
+        Returns:
+        np.ndarray: The category code of every row
+        np.ndarray: The value of every category code
+        """
+        codes = column.cat.codes.to_numpy()
+        categories = np.asarray(column.cat.categories, dtype=object)
+        if np.any(codes < 0):
+            codes = codes.astype(np.intp)
+            codes[codes < 0] = len(categories)
+            categories = np.append(categories, np.array([np.nan], dtype=object))
+
+        return codes, categories
+
+    @classmethod
+    def from_arrays(
+        cls,
+        arrays: Dict[str, np.ndarray],
+        categories: Dict[str, np.ndarray],
+        class_labels: np.ndarray,
+        bin_thresholds: Dict[str, np.ndarray],
+    ) -> "DecisionTreeEncodedDataset":
+        """
+        Reassemble an encoded dataset from its arrays (see get_arrays), e.g. from arrays in shared memory.
+
+        Parameters:
+        arrays (Dict[str, np.ndarray]): The arrays of the encoded dataset by name
+        categories (Dict[str, np.ndarray]): The original values of the category codes of every discrete-valued attribute
+        class_labels (np.ndarray): The original class labels of the class codes (sorted)
+        bin_thresholds (Dict[str, np.ndarray]): The bin thresholds of the continuous attributes (empty if not binned)
+
+        Returns:
+        DecisionTreeEncodedDataset: The encoded dataset
+        """
+        columns = dict()
+        bins = dict()
+        for name, array in arrays.items():
+            kind, _, attribute = name.partition(":")
+            if kind == "column":
+                columns[attribute] = array
+            elif kind == "bins":
+                array.flags.writeable = False
+                bins[attribute] = array
+
+        dataset = cls(
+            columns, categories, arrays["class_codes"], class_labels, arrays.get("sample_weights")
+        )
+        dataset.bins = bins
+        dataset.bin_thresholds = bin_thresholds
+
+        return dataset
+
+    def get_arrays(self) -> Dict[str, np.ndarray]:
+        """
+        Get all (large) arrays of the encoded dataset by name, i.e. everything except the categories and labels
+
+        Returns:
+        Dict[str, np.ndarray]: The columns ("column:<attribute>"), bin codes ("bins:<attribute>"), class codes ("class_codes") and sample weights ("sample_weights", if any)
+        """
+        arrays = {"class_codes": self.class_codes}
+        if self.sample_weights is not None:
+            arrays["sample_weights"] = self.sample_weights
+        for attribute, column in self.columns.items():
+            arrays[f"column:{attribute}"] = column
+        for attribute, bins in self.bins.items():
+            arrays[f"bins:{attribute}"] = bins
+
+        return arrays
+
+    def __len__(self) -> int:
+        """
+        Get the number of rows of the dataset
+
+        Returns:
+        int: The number of rows
+        """
+        return len(self.class_codes)
+
+    def get_n_classes(self) -> int:
+        """
+        Get the number of distinct class labels (of the whole dataset the encoding was created from)
+
+        Returns:
+        int: The number of distinct class labels
+        """
+        return len(self.class_labels)
+
+    def is_categorical(self, attribute: str) -> bool:
+        """
+        Check if an attribute is discrete-valued (encoded as category codes)
+
+        Parameters:
+        attribute (str): The attribute to check
+
+        Returns:
+        bool: True if the attribute is discrete-valued, False if it is continuous
+        """
+        return attribute in self.categories
+
+    def get_column(self, attribute: str) -> np.ndarray:
+        """
+        Get the encoded values of an attribute
+
+        Parameters:
+        attribute (str): The attribute to get the values for
+
+        Returns:
+        np.ndarray: The category codes (discrete-valued attribute) or values (continuous attribute)
+        """
+        return self.columns[attribute]
+
+    def get_categories(self, attribute: str) -> np.ndarray:
+        """
+        Get the original values of the category codes of a discrete-valued attribute
+
+        Parameters:
+        attribute (str): The attribute to get the categories for
+
+        Returns:
+        np.ndarray: The original value of every category code
+        """
+        return self.categories[attribute]
+
+    def get_sample_weights(self, rows: np.ndarray) -> np.ndarray:
+        """
+        Get the weights of the given rows
+
+        Parameters:
+        rows (np.ndarray): The positions of the rows
+
+        Returns:
+        np.ndarray: The weight of every given row (None if every row has weight 1)
+        """
+        if self.sample_weights is None:
+            return None
+        return self.sample_weights[rows]
+
+    def bin_continuous_attributes(self, max_bins: int):
+        """
+        Quantize every continuous attribute into at most max_bins bins, stored as uint8 bin codes.
+
+        If an attribute has at most max_bins distinct values, every distinct value gets its own bin.
+        Otherwise the bins are chosen at (weighted) quantiles of the values, so they hold roughly the same number (weight) of rows.
+        A value falls into bin b if it is above the threshold of bin b-1 and below or equal to the threshold of bin b.
+        Missing values (NaN) fall into an extra bin after the last one, which is below or above no threshold.
+
+        Parameters:
+        max_bins (int): The maximum number of bins per attribute (at most 256)
+        """
+        for attribute, values in self.columns.items():
+            if self.is_categorical(attribute):
+                continue
+
+            # Missing values do not take part in choosing the bins
+            present = ~np.isnan(values)
+            present_values = values[present]
+            distinct_values = np.unique(present_values)
+            if len(distinct_values) == 0:
+                distinct_values = np.zeros(1)
+
+            # The bin code of missing values has to fit into uint8 as well
+            n_value_bins = max_bins if present.all() else min(max_bins, 255)
+            if len(distinct_values) <= n_value_bins:
+                upper_values = distinct_values[:-1]
+            elif self.sample_weights is None:
+                # The largest value of every bin (a value that occurs in the dataset)
+                upper_values = np.unique(
+                    np.quantile(
+                        present_values, np.linspace(0, 1, n_value_bins + 1)[1:-1], method="lower"
+                    )
+                )
+            else:
+                upper_values = np.unique(
+                    self._get_weighted_lower_quantiles(
+                        present_values,
+                        self.sample_weights[present],
+                        np.linspace(0, 1, n_value_bins + 1)[1:-1],
+                    )
+                )
+            upper_values = upper_values[upper_values < distinct_values[-1]]
+
+            # The thresholds lie in the middle between the largest value of a bin and the smallest value of the next bin
+            next_values = distinct_values[
+                np.searchsorted(distinct_values, upper_values, side="right")
+            ]
+            thresholds = (upper_values + next_values) / 2
+
+            bins = np.searchsorted(thresholds, values, side="left")
+            bins[~present] = len(thresholds) + 1
+            bins = bins.astype(np.uint8)
+            bins.flags.writeable = False
+            self.bins[attribute] = bins
+            self.bin_thresholds[attribute] = thresholds
+
+    @staticmethod
+    def _get_weighted_lower_quantiles(
+        values: np.ndarray, weights: np.ndarray, quantiles: np.ndarray
+    ) -> np.ndarray:
+        """
+        Get the quantiles of weighted values, taking the lower value between two values (like np.quantile with method="lower").
+        With integer weights the quantiles are the same as those of the values repeated by their weights.
+
+        Parameters:
+        values (np.ndarray): The values
+        weights (np.ndarray): The weight of every value
+        quantiles (np.ndarray): The quantiles to get (between 0 and 1)
+
+        Returns:
+        np.ndarray: The value at every quantile
+        """
+        order = np.argsort(values, kind="stable")
+        cumulative_weights = np.cumsum(weights[order])
+
+        # The position of the quantile among the repeated values is floor(q * (n - 1)), i.e. the value holding weight position + 1
+        positions = np.floor(quantiles * (cumulative_weights[-1] - 1))
+        indices = np.searchsorted(cumulative_weights, positions + 1, side="left")
+
+        return values[order][np.minimum(indices, len(values) - 1)]
+
+    def get_bins(self, attribute: str) -> np.ndarray:
+        """
+        Get the bin codes of a continuous attribute (see bin_continuous_attributes)
+
+        Parameters:
+        attribute (str): The continuous attribute to get the bin codes for
+
+        Returns:
+        np.ndarray: The bin code of every row (len(thresholds) + 1 for a missing value)
+        """
+        return self.bins[attribute]
+
+    def get_bin_thresholds(self, attribute: str) -> np.ndarray:
+        """
+        Get the upper thresholds of the bins of a continuous attribute (see bin_continuous_attributes)
+
+        Parameters:
+        attribute (str): The continuous attribute to get the bin thresholds for
+
+        Returns:
+        np.ndarray: The upper threshold of every bin (except the last one)
+        """
+        return self.bin_thresholds[attribute]
+
+    def get_missing_code(self, attribute: str) -> int | None:
+        """
+        Get the category code of the missing values (NaN or None) of a discrete-valued attribute
+
+        Parameters:
+        attribute (str): The discrete-valued attribute to get the code for
+
+        Returns:
+        int|None: The category code of the missing values (None if the attribute has no missing values)
+        """
+        missing_codes = np.flatnonzero(pd.isna(self.categories[attribute]))
+        if len(missing_codes) == 0:
+            return None
+        return int(missing_codes[0])
+
+    def has_missing_values(self, attribute: str) -> bool:
+        """
+        Check if an attribute has missing values (NaN or None) in any row of the dataset
+
+        Parameters:
+        attribute (str): The attribute to check
+
+        Returns:
+        bool: True if any row has a missing value of the attribute
+        """
+        if attribute not in self.missing_values:
+            if self.is_categorical(attribute):
+                self.missing_values[attribute] = self.get_missing_code(attribute) is not None
+            else:
+                self.missing_values[attribute] = bool(np.isnan(self.columns[attribute]).any())
+
+        return self.missing_values[attribute]
+
+    def get_class_counts(self, rows: np.ndarray, attribute: str = None) -> np.ndarray:
+        """
+        Count the class labels of the given rows, either in total or per category of a discrete-valued attribute
+
+        Parameters:
+        rows (np.ndarray): The positions of the rows to count
+        attribute (str), default None: The discrete-valued attribute to count the class labels per category for. If set to None, the class labels of all given rows are counted.
+
+        Returns:
+        np.ndarray: The class counts (a vector of length n_classes if attribute is None, otherwise a matrix with one row per category code)
+        """
+        n_classes = self.get_n_classes()
+        weights = self.get_sample_weights(rows)
+        if attribute is None:
+            return np.bincount(self.class_codes[rows], weights=weights, minlength=n_classes)
+
+        n_categories = len(self.categories[attribute])
+        counts = np.bincount(
+            self.columns[attribute][rows].astype(np.intp) * n_classes + self.class_codes[rows],
+            weights=weights,
+            minlength=n_categories * n_classes,
+        )
+        return counts.reshape(n_categories, n_classes)
+
+    def get_bin_class_counts(self, rows: np.ndarray, attribute: str) -> np.ndarray:
+        """
+        Count the class labels of the given rows per bin of a continuous attribute (see bin_continuous_attributes)
+
+        Parameters:
+        rows (np.ndarray): The positions of the rows to count
+        attribute (str): The continuous attribute to count the class labels per bin for
+
+        Returns:
+        np.ndarray: The class counts (a matrix with one row per bin, the last row counts the rows with a missing value)
+        """
+        n_classes = self.get_n_classes()
+        n_bins = len(self.bin_thresholds[attribute]) + 2
+        counts = np.bincount(
+            self.bins[attribute][rows].astype(np.intp) * n_classes + self.class_codes[rows],
+            weights=self.get_sample_weights(rows),
+            minlength=n_bins * n_classes,
+        )
+        return counts.reshape(n_bins, n_classes)
+
+    def get_threshold_class_counts(
+        self, attribute: str, binned: bool = False
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Count the class labels of all rows below or equal to every candidate threshold of a continuous attribute in one pass.
+        Rows with a missing value are not counted.
+
+        Parameters:
+        attribute (str): The continuous attribute to count the class labels for
+        binned (bool), default False: If set to True, the candidate thresholds are the bin thresholds (see bin_continuous_attributes). Otherwise they lie in the middle between two consecutive distinct values.
+
+        Returns:
+        np.ndarray: The candidate thresholds
+        np.ndarray: The class counts below or equal to every candidate threshold (one row per threshold)
+        np.ndarray: The class counts of all counted rows
+        """
+        n_classes = self.get_n_classes()
+        values = self.columns[attribute]
+        present = ~np.isnan(values)
+
+        if binned:
+            thresholds = self.bin_thresholds[attribute]
+            histogram = np.bincount(
+                self.bins[attribute][present].astype(np.intp) * n_classes
+                + self.class_codes[present],
+                weights=self.get_sample_weights(present),
+                minlength=(len(thresholds) + 1) * n_classes,
+            ).reshape(-1, n_classes)
+            cumulative_counts = np.cumsum(histogram, axis=0)
+            return thresholds, cumulative_counts[:-1], cumulative_counts[-1]
+
+        order = np.flatnonzero(present)[np.argsort(values[present], kind="stable")]
+        sorted_values = values[order]
+        counts = np.eye(n_classes, dtype=np.int64)[self.class_codes[order]]
+        if self.sample_weights is not None:
+            counts = counts * self.sample_weights[order][:, np.newaxis]
+        cumulative_counts = np.cumsum(counts, axis=0).reshape(-1, n_classes)
+
+        # The last row of every distinct value
+        boundaries = np.flatnonzero(sorted_values[1:] != sorted_values[:-1])
+        thresholds = (sorted_values[boundaries] + sorted_values[boundaries + 1]) / 2
+        total_counts = (
+            cumulative_counts[-1] if len(order) > 0 else np.zeros(n_classes, dtype=counts.dtype)
+        )
+
+        return thresholds, cumulative_counts[boundaries], total_counts
+
+    def get_majority_class_label(self, class_counts: np.ndarray) -> str | int | float:
+        """
+        Get the most frequent class label of class counts (the smallest one if there are several)
+
+        Parameters:
+        class_counts (np.ndarray): The class counts of some rows (see get_class_counts)
+
+        Returns:
+        str|int|float: The most frequent class label
+        """
+        return self.class_labels[np.argmax(class_counts)]
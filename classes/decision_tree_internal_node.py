@@ -1,5 +1,7 @@
 from typing import List
 
+import numpy as np
+
 from classes.decision_tree_node import DecisionTreeNode
 from classes.decision_tree_branch import DecisionTreeBranch
 
@@ -7,16 +9,22 @@ from classes.decision_tree_branch import DecisionTreeBranch
 class DecisionTreeInternalNode(DecisionTreeNode):
     """A class representing an interal node in a decision tree"""
 
-    def __init__(self, attribute_label: str, branches: List[DecisionTreeBranch]):
+    def __init__(
+        self,
+        attribute_label: str,
+        branches: List[DecisionTreeBranch],
+        class_counts: np.ndarray = None,
+    ):
         """
         Initialize the internal node
 
         Parameters:
         label (str): The attribute the internal node is based on
         branches (List[DecisionTreeBranch]): The branches starting at the internal node
+        class_counts (np.ndarray), default None: The class counts of the training rows that reached the internal node
         """
         # Call the constructor of the superclass
-        super().__init__()
+        super().__init__(class_counts)
 
         # The attribute the internal node is based on
         self.attribute_label = attribute_label
@@ -1,18 +1,21 @@
+import numpy as np
+
 from classes.decision_tree_node import DecisionTreeNode
 
 
 class DecisionTreeLeafNode(DecisionTreeNode):
     """A class representing a leaf node in a decision tree"""
 
-    def __init__(self, class_label: str | int | float):
+    def __init__(self, class_label: str | int | float, class_counts: np.ndarray = None):
         """
         Initialize the leaf node
 
         Parameters:
         class_label (str|int|float): The class the leaf node represents
+        class_counts (np.ndarray), default None: The class counts of the training rows that reached the leaf node
         """
         # Call the constructor of the superclass
-        super().__init__()
+        super().__init__(class_counts)
 
         # The class the leaf node represents
         self.class_label = class_label
@@ -1,4 +1,24 @@
+import numpy as np
+
+
 class DecisionTreeNode:
     """Abstract superclass for the two decision tree node types"""
 
-    pass
+    def __init__(self, class_counts: np.ndarray = None):
+        """
+        Initialize the node
+
+        Parameters:
+        class_counts (np.ndarray), default None: The class counts of the training rows that reached the node (aligned with the class labels of the decision tree)
+        """
+        # The class counts of the training rows that reached the node (None if unknown)
+        self.class_counts = class_counts
+
+    def get_class_counts(self) -> np.ndarray:
+        """
+        Get the class counts of the training rows that reached the node
+
+        Returns:
+        np.ndarray: The class counts (None if unknown)
+        """
+        return self.class_counts
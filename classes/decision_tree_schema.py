@@ -0,0 +1,125 @@
+from typing import Dict, List
+
+import pandas as pd
+
+
+class DecisionTreeSchema:
+    """
+    A class holding the type of every attribute of a dataset, as used to fit a decision tree.
+
+    There are three types of attributes:
+    - "categorical": Discrete-valued attributes, split on their values. Columns with a pandas Categorical dtype keep
+      their integer codes when encoded.
+    - "numeric": Continuous attributes, split at thresholds
+    - "boolean": Attributes with the values False and True, split like discrete-valued attributes
+
+    The types are fixed once for the whole tree instead of looking at the dtype of a column at every node.
+    """
+
+    # The valid attribute types
+    TYPES = ["categorical", "numeric", "boolean"]
+
+    def __init__(self, attribute_types: Dict[str, str]):
+        """
+        Initialize the schema
+
+        Parameters:
+        attribute_types (Dict[str, str]): The type of every attribute ("categorical", "numeric" or "boolean")
+        """
+        for attribute, attribute_type in attribute_types.items():
+            if attribute_type not in self.TYPES:
+                raise ValueError(
+                    f"Type '{attribute_type}' of attribute '{attribute}' not valid (select either 'categorical', 'numeric' or 'boolean')."
+                )
+
+        self.attribute_types = dict(attribute_types)
+
+    @classmethod
+    def infer(cls, dataset: pd.DataFrame, attributes: List[str]) -> "DecisionTreeSchema":
+        """
+        Infer the types of the given attributes from the dtypes of their columns.
+        Boolean columns are "boolean", pandas Categorical columns "categorical", all other numeric columns "numeric"
+        and all other columns (e.g. strings) "categorical".
+
+        Parameters:
+        dataset (pd.DataFrame): The dataset
+        attributes (List[str]): The attributes to infer the types of
+
+        Returns:
+        DecisionTreeSchema: The schema of the attributes
+        """
+        attribute_types = dict()
+        for attribute in attributes:
+            dtype = dataset[attribute].dtype
+            if isinstance(dtype, pd.CategoricalDtype):
+                attribute_types[attribute] = "categorical"
+            elif pd.api.types.is_bool_dtype(dtype):
+                attribute_types[attribute] = "boolean"
+            elif pd.api.types.is_numeric_dtype(dtype):
+                attribute_types[attribute] = "numeric"
+            else:
+                attribute_types[attribute] = "categorical"
+
+        return cls(attribute_types)
+
+    def complete(self, dataset: pd.DataFrame, attributes: List[str]) -> "DecisionTreeSchema":
+        """
+        Get a schema with the types of the given attributes, inferring the types of the attributes that are not in this schema.
+
+        Parameters:
+        dataset (pd.DataFrame): The dataset
+        attributes (List[str]): The attributes the schema has to hold
+
+        Returns:
+        DecisionTreeSchema: The schema of the given attributes
+        """
+        missing_attributes = [
+            attribute for attribute in attributes if attribute not in self.attribute_types
+        ]
+        if not missing_attributes:
+            return self
+
+        inferred_schema = self.infer(dataset, missing_attributes)
+        return DecisionTreeSchema(
+            {
+                attribute: self.attribute_types.get(attribute)
+                or inferred_schema.attribute_types[attribute]
+                for attribute in attributes
+            }
+        )
+
+    def get_type(self, attribute: str) -> str:
+        """
+        Get the type of an attribute
+
+        Parameters:
+        attribute (str): The attribute
+
+        Returns:
+        str: The type of the attribute ("categorical", "numeric" or "boolean")
+        """
+        if attribute not in self.attribute_types:
+            raise ValueError(f"Attribute '{attribute}' not in schema.")
+
+        return self.attribute_types[attribute]
+
+    def is_discrete(self, attribute: str) -> bool:
+        """
+        Check if an attribute is split on its values (categorical or boolean)
+
+        Parameters:
+        attribute (str): The attribute to check
+
+        Returns:
+        bool: True if the attribute is categorical or boolean, False if it is numeric
+        """
+        return self.get_type(attribute) != "numeric"
+
+    def get_attributes(self) -> List[str]:
+        """
+        Get the attributes of the schema
+
+        Returns:
+        List[str]: The attributes of the schema
+        """
+        return list(self.attribute_types.keys())
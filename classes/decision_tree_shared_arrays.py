@@ -0,0 +1,102 @@
+from multiprocessing import shared_memory
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+
+class DecisionTreeSharedArrays:
+    """
+    A class to share NumPy arrays with the worker processes of a process pool through shared memory.
+
+    The arrays are copied into shared memory once. The worker processes attach to the shared memory with
+    the (small) descriptors of the arrays, so the arrays never have to be pickled.
+    Changes to the arrays are visible to all processes.
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        """
+        Copy the given arrays into shared memory
+
+        Parameters:
+        arrays (Dict[str, np.ndarray]): The arrays to share
+        """
+        # The shared memory blocks (have to be kept open as long as the arrays are used)
+        self.shared_memories: Dict[str, shared_memory.SharedMemory] = dict()
+
+        # The arrays backed by the shared memory blocks
+        self.arrays: Dict[str, np.ndarray] = dict()
+
+        for name, array in arrays.items():
+            # A shared memory block can not be empty
+            shared_memory_block = shared_memory.SharedMemory(
+                create=True, size=max(array.nbytes, 1)
+            )
+            shared_array = np.ndarray(
+                array.shape, dtype=array.dtype, buffer=shared_memory_block.buf
+            )
+            shared_array[...] = array
+
+            self.shared_memories[name] = shared_memory_block
+            self.arrays[name] = shared_array
+
+    def get_array(self, name: str) -> np.ndarray:
+        """
+        Get a shared array
+
+        Parameters:
+        name (str): The name of the array
+
+        Returns:
+        np.ndarray: The array backed by shared memory
+        """
+        return self.arrays[name]
+
+    def get_descriptors(self) -> Dict[str, Tuple[str, Tuple[int, ...], str]]:
+        """
+        Get the descriptors the worker processes need to attach to the shared arrays
+
+        Returns:
+        Dict[str, Tuple[str, Tuple[int, ...], str]]: The name of the shared memory block, the shape and the dtype of every array
+        """
+        return {
+            name: (self.shared_memories[name].name, array.shape, array.dtype.str)
+            for name, array in self.arrays.items()
+        }
+
+    @staticmethod
+    def attach(
+        descriptors: Dict[str, Tuple[str, Tuple[int, ...], str]]
+    ) -> Tuple[Dict[str, np.ndarray], List[shared_memory.SharedMemory]]:
+        """
+        Attach to shared arrays (in a worker process)
+
+        Parameters:
+        descriptors (Dict[str, Tuple[str, Tuple[int, ...], str]]): The descriptors of the shared arrays (see get_descriptors)
+
+        Returns:
+        Dict[str, np.ndarray]: The shared arrays
+        List[shared_memory.SharedMemory]: The shared memory blocks (have to be kept open as long as the arrays are used)
+        """
+        arrays = dict()
+        shared_memories = []
+        for name, (block_name, shape, dtype) in descriptors.items():
+            # The creating process is responsible for unlinking the block
+            shared_memory_block = shared_memory.SharedMemory(name=block_name)
+            arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shared_memory_block.buf)
+            shared_memories.append(shared_memory_block)
+
+        return arrays, shared_memories
+
+    def release(self):
+        """
+        Release the shared memory (the shared arrays can not be used afterwards)
+        """
+        self.arrays = dict()
+        for shared_memory_block in self.shared_memories.values():
+            shared_memory_block.unlink()
+            try:
+                shared_memory_block.close()
+            except BufferError:
+                # Views of the array are still alive (e.g. in a traceback), the memory is freed with the last view
+                pass
+        self.shared_memories = dict()
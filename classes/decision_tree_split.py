@@ -0,0 +1,117 @@
+from typing import List
+
+import numpy as np
+
+from classes.decision_tree_decision_outcome import DecisionTreeDecisionOutcome
+from classes.decision_tree_decision_outcome_above import (
+    DecisionTreeDecisionOutcomeAbove,
+)
+from classes.decision_tree_decision_outcome_below_equal import (
+    DecisionTreeDecisionOutcomeBelowEqual,
+)
+from classes.decision_tree_decision_outcome_equals import (
+    DecisionTreeDecisionOutcomeEquals,
+)
+from classes.decision_tree_decision_outcome_in_list import (
+    DecisionTreeDecisionOutcomeInList,
+)
+
+
+class DecisionTreeSplit:
+    """
+    A class representing a split of an encoded attribute in a decision tree.
+
+    The split works on the encoded values (category codes or floats) and is only decoded into
+    decision outcomes once it has been chosen.
+    There are three kinds of splits:
+    - "threshold": Two branches, one for the values below or equal to a threshold and one for the values above it
+    - "equals": One branch per category code
+    - "in_list": One branch per group of category codes
+    """
+
+    def __init__(
+        self,
+        attribute: str,
+        kind: str,
+        threshold: float = None,
+        groups: List[np.ndarray] = None,
+    ):
+        """
+        Initialize the split
+
+        Parameters:
+        attribute (str): The attribute to split on
+        kind (str): The kind of split ("threshold", "equals" or "in_list")
+        threshold (float), default None: The threshold of a "threshold" split
+        groups (List[np.ndarray]), default None: The category codes of every branch of an "equals" or "in_list" split
+        """
+        self.attribute = attribute
+        self.kind = kind
+        self.threshold = threshold
+        self.groups = groups
+
+    def get_n_branches(self) -> int:
+        """
+        Get the number of branches of the split
+
+        Returns:
+        int: The number of branches
+        """
+        if self.kind == "threshold":
+            return 2
+
+        return len(self.groups)
+
+    def route(self, values: np.ndarray) -> np.ndarray:
+        """
+        Get the branch every value falls into
+
+        Parameters:
+        values (np.ndarray): The encoded values of the attribute
+
+        Returns:
+        np.ndarray: The index of the branch of every value (-1 if the value does not fall into any branch)
+        """
+        if self.kind == "threshold":
+            # Missing values (NaN) are neither below or equal to nor above the threshold
+            return np.where(values <= self.threshold, 0, np.where(values > self.threshold, 1, -1))
+
+        # Look up the branch of every category code
+        n_codes = max(
+            [int(values.max()) + 1 if len(values) > 0 else 0]
+            + [int(group.max()) + 1 for group in self.groups if len(group) > 0]
+        )
+        branch_of_code = np.full(n_codes, -1)
+        for branch_index, group in enumerate(self.groups):
+            branch_of_code[group] = branch_index
+
+        return branch_of_code[values]
+
+    def get_outcomes(
+        self, categories: np.ndarray = None
+    ) -> List[DecisionTreeDecisionOutcome]:
+        """
+        Decode the split into the decision outcomes of its branches
+
+        Parameters:
+        categories (np.ndarray), default None: The original values of the category codes (not needed for "threshold" splits)
+
+        Returns:
+        List[DecisionTreeDecisionOutcome]: The decision outcome of every branch
+        """
+        if self.kind == "threshold":
+            return [
+                DecisionTreeDecisionOutcomeBelowEqual(self.threshold),
+                DecisionTreeDecisionOutcomeAbove(self.threshold),
+            ]
+
+        if self.kind == "equals":
+            return [
+                DecisionTreeDecisionOutcomeEquals(categories[group[0]])
+                for group in self.groups
+            ]
+
+        return [
+            DecisionTreeDecisionOutcomeInList(list(categories[group]))
+            for group in self.groups
+        ]
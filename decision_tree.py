@@ -1,26 +1,27 @@
-import itertools
+import copy
+import os
+import numpy as np
 import pandas as pd
-from typing import List, Tuple, Set
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Callable, Dict, List, Tuple
 
+import arrow_data
 import gini_index
 import information_gain
+import sample_weights
+import split_search
+from classes.decision_tree_attribute_lists import DecisionTreeAttributeLists
+from classes.decision_tree_code_generator import DecisionTreeCodeGenerator
+from classes.decision_tree_compiled_tree import DecisionTreeCompiledTree
+from classes.decision_tree_encoded_dataset import DecisionTreeEncodedDataset
+from classes.decision_tree_schema import DecisionTreeSchema
+from classes.decision_tree_shared_arrays import DecisionTreeSharedArrays
+from classes.decision_tree_split import DecisionTreeSplit
 from classes.decision_tree_node import DecisionTreeNode
 from classes.decision_tree_leaf_node import DecisionTreeLeafNode
 from classes.decision_tree_internal_node import DecisionTreeInternalNode
 from classes.decision_tree_branch import DecisionTreeBranch
 from classes.decision_tree_decision_outcome import DecisionTreeDecisionOutcome
-from classes.decision_tree_decision_outcome_above import (
-    DecisionTreeDecisionOutcomeAbove,
-)
-from classes.decision_tree_decision_outcome_below_equal import (
-    DecisionTreeDecisionOutcomeBelowEqual,
-)
-from classes.decision_tree_decision_outcome_equals import (
-    DecisionTreeDecisionOutcomeEquals,
-)
-from classes.decision_tree_decision_outcome_in_list import (
-    DecisionTreeDecisionOutcomeInList,
-)
 
 class DecisionTree:
     """
@@ -38,22 +39,131 @@ class DecisionTree:
         # Function fit will later produce a decision tree
         self.tree: DecisionTreeNode = None
 
+        # The class labels the class counts of the nodes refer to (set by function fit)
+        self.class_labels: np.ndarray = None
+
+        # The tree flattened into NumPy arrays by function compile (only used by predict as long as it is the flattened tree)
+        self.compiled_tree: DecisionTreeCompiledTree = None
+
+        # How function fit finds the thresholds of continuous attributes ("exact" or "histogram")
+        self.split_finder: str = "exact"
+
+        # The maximum number of bins per continuous attribute if split_finder is "histogram"
+        self.max_bins: int = 255
+
+        # The number of worker processes function fit uses
+        self.n_jobs: int = 1
+
+        # How function fit builds the tree ("recursive", "parallel" or "level_wise")
+        self.builder: str = "recursive"
+
+        # The minimum number of rows of a node to evaluate its attributes (builder "recursive") or to build its
+        # subtree (builder "parallel") in a worker process. Smaller nodes are handled faster inline than a task can be dispatched.
+        self.parallel_min_rows: int = 10000
+
+        # The worker processes and the training data they share with the main process (only set during fit)
+        self._worker_pool: ProcessPoolExecutor = None
+        self._shared_arrays: DecisionTreeSharedArrays = None
+
+        # The branches whose subtrees are left to other tasks (only set in a subtree task of builder "parallel")
+        self._pending_subtrees: List[Tuple[DecisionTreeBranch, np.ndarray, List[str], int]] = None
+
+        # The pre-pruning limits of function fit (see fit)
+        self.max_depth: int = None
+        self.min_samples_split: int = 2
+        self.min_samples_leaf: int = 1
+        self.min_gain: float = None
+        self.max_leaf_nodes: int = None
+
+        # The number of leaves the tree being built has if all of its unfinished nodes become leaves
+        self._n_leaves: int = 1
+
+        # The maximum number of distinct values of a discrete-valued attribute in a node to search all of its splits
+        # into two groups of values for the gini index (see gini_index.find_best_split_of_values_from_counts)
+        self.max_exhaustive_categories: int = 10
+
+        # Which thresholds of continuous attributes function fit evaluates ("all" or "boundary")
+        self.candidate_thresholds: str = "all"
+
+        # The minimum number of rows of a node to choose its split attribute on a sample of its rows, the
+        # confidence parameter and tie threshold of the Hoeffding bound deciding the sample size and the seed of the samples (see fit)
+        self.split_sample_threshold: int = None
+        self.split_sample_delta: float = 1e-6
+        self.split_sample_tie_threshold: float = None
+        self.random_state: int = None
+
+        # The types of the attributes function fit was called with (see DecisionTreeSchema)
+        self.schema: DecisionTreeSchema = None
+
+        # How function fit splits an attribute ("best" searches all splits, "random" draws a single split, see fit)
+        self.splitter: str = "best"
+
+        # The number of attribute evaluations function fit skipped, because an upper bound of their score showed
+        # that they can not beat the best split of their node (see _find_best_encoded_split)
+        self.n_skipped_evaluations: int = 0
+
     def fit(
         self,
-        dataset: pd.DataFrame,
+        dataset: pd.DataFrame | object,
         target_attribute: str,
         attribute_selection_method: str,
+        presort: bool = False,
+        split_finder: str = "exact",
+        max_bins: int = 255,
+        n_jobs: int = 1,
+        builder: str = "recursive",
+        max_depth: int = None,
+        min_samples_split: int = 2,
+        min_samples_leaf: int = 1,
+        min_gain: float = None,
+        max_leaf_nodes: int = None,
+        max_exhaustive_categories: int = 10,
+        candidate_thresholds: str = "all",
+        sample_weight: np.ndarray = None,
+        compress_duplicates: bool = False,
+        split_sample_threshold: int = None,
+        split_sample_delta: float = 1e-6,
+        split_sample_tie_threshold: float = None,
+        random_state: int = None,
+        splitter: str = "best",
+        schema: DecisionTreeSchema = None,
     ):
         """
         Fit decision tree on a given dataset and target attribute, using a specified attribute selection method.
 
         Parameters:
-        dataset (pd.DataFrame): The dataset to fit the decision tree on
+        dataset (pd.DataFrame | object): The dataset to fit the decision tree on, a pandas DataFrame, a pyarrow Table or RecordBatch or a Polars DataFrame. Arrow data is encoded directly from its buffers without a pandas DataFrame, dictionary-encoded columns keep their indices as category codes (see arrow_data.encode_dataset).
         target_attribute (str): The target attribute to predict
         attribute_selection_method (str): The attribute selection method to use
+        presort (bool), default False: If set to True, every continuous attribute is sorted only once for the whole dataset and the sorted rows are handed down to the child nodes (SLIQ-style), instead of sorting the attribute again at every node
+        split_finder (str), default "exact": How the thresholds of continuous attributes are found. "exact" evaluates the midpoint between every pair of adjacent distinct values. "histogram" quantizes every continuous attribute into at most max_bins bins once and only evaluates the bin boundaries.
+        max_bins (int), default 255: The maximum number of bins per continuous attribute if split_finder is "histogram" (between 2 and 256)
+        n_jobs (int), default 1: The number of worker processes (-1 to use all CPUs). With the "recursive" builder, the workers evaluate the attributes of large nodes in parallel. The encoded dataset is shared with the workers through shared memory, the resulting tree is the same as with a single process.
+        builder (str), default "recursive": How the tree is built. "recursive" builds the subtrees one after another. "parallel" builds the subtrees of large partitions as separate tasks in the n_jobs worker processes, idle workers take the next pending subtree from the shared task queue (with n_jobs=1 the tree is built recursively). "level_wise" builds the tree breadth-first without recursion, with one pass over the rows per level and attribute (it always uses presorted continuous attributes and cannot be combined with n_jobs > 1). All builders build the same tree (except with max_leaf_nodes, see there).
+        max_depth (int), default None: The maximum depth of the tree (the root node has depth 0). If set to None, the depth is not limited.
+        min_samples_split (int), default 2: The minimum number of rows (total weight of the rows, see sample_weight) a node needs to be split
+        min_samples_leaf (int), default 1: The minimum number of rows (total weight of the rows, see sample_weight) in every branch of a split. Splits (thresholds, groups of values) that leave fewer rows in a branch are not considered.
+        min_gain (float), default None: The minimum information gain/gini index of a split. Nodes whose best split scores lower become leaves. If set to None, every split is accepted.
+        max_leaf_nodes (int), default None: The maximum number of leaves of the tree. A node is only split if the tree stays within the limit, in the order the builder creates the nodes (depth-first for "recursive", breadth-first for "level_wise"). Cannot be combined with the "parallel" builder. If set to None, the number of leaves is not limited.
+        max_exhaustive_categories (int), default 10: The maximum number of distinct values of a discrete-valued attribute in a node for which the gini index evaluates all splits into two groups of values (2^(k-1) splits), at most 20. Attributes with more values are split by ordering the values and only evaluating the k-1 splits of this order, which is optimal for binary target attributes.
+        candidate_thresholds (str), default "all": Which thresholds of continuous attributes are evaluated. "all" evaluates every threshold of the split finder. "boundary" only evaluates the thresholds where the class changes, i.e. not the thresholds between two values (bins) that only hold rows of the same class. The best threshold is always a boundary (Fayyad and Irani, 1992), so the tree is the same, but far fewer thresholds are scored on attributes that mostly increase with the class.
+        sample_weight (np.ndarray), default None: The non-negative weight of every row of the dataset. All class counts (and therefore the entropy, gini index and the pre-pruning limits) count a row with its weight, so a row with integer weight k is the same as k copies of the row (and a row with weight 0 is left out). If set to None, every row has weight 1.
+        compress_duplicates (bool), default False: If set to True, identical rows are collapsed into one row weighted by the number (total weight) of its copies before the tree is built. The tree is the same, but datasets with many duplicate rows are fitted much faster.
+        split_sample_threshold (int), default None: If set, the split attribute of a node with more rows is chosen on a stratified random sample of its rows (see _find_best_sampled_split). The sample starts with split_sample_threshold rows and doubles (up to a quarter of the rows of the node) until a Hoeffding bound shows that the best attribute on the sample is also the best one on all rows. Only the best split of the chosen attribute is then searched on all rows, so large nodes evaluate far fewer rows. If no sample separates the attributes, all rows are evaluated. The tree may differ from the exact one (with probability of about split_sample_delta per node). Cannot be combined with the "level_wise" builder. If set to None, all rows are evaluated.
+        split_sample_delta (float), default 1e-6: The probability that the Hoeffding bound wrongly separates the two best attributes of a sample (between 0 and 1, exclusive). Smaller values need larger samples.
+        split_sample_tie_threshold (float), default None: If set, the best attribute on a sample is chosen as soon as the Hoeffding bound is below this score difference, even if it does not separate the two best attributes (they score about the same, as in Hoeffding trees). Nodes with nearly tied attributes then do not have to evaluate all rows. If set to None, ties are evaluated on all rows.
+        random_state (int), default None: The seed of the samples of split_sample_threshold and the random splits of splitter "random". Every node (and attribute) draws from its own generator derived from the seed, so the tree does not depend on the builder. If set to None, the samples and splits differ between fits.
+        splitter (str), default "best": How every attribute is split. "best" searches all thresholds/groups of values for the best split. "random" draws a single split per attribute, a threshold uniformly between the smallest and largest value of a continuous attribute or a random group of the values of a discrete-valued attribute for the gini index (as in extremely randomized trees), and only keeps the best of these random splits. Every attribute then costs a single pass over the rows without sorting, which fits approximate trees on large datasets much faster. Cannot be combined with presort, split_finder "histogram" or the "level_wise" builder.
+        schema (DecisionTreeSchema), default None: The type of every attribute ("categorical", "numeric" or "boolean"), fixed once for the whole tree. Categorical and boolean attributes are split on their values, numeric attributes at thresholds. The codes of pandas Categorical columns are used without a copy. The types of attributes that are not in the schema are inferred from the dtypes of their columns (see DecisionTreeSchema.infer, or arrow_data.infer_schema for Arrow data).
         """
+        # Read Arrow data (and Polars data frames) as a pyarrow Table, without converting it into a pandas DataFrame
+        is_arrow = arrow_data.is_arrow_data(dataset)
+        if is_arrow:
+            dataset = arrow_data.to_arrow_table(dataset)
+        column_names = list(dataset.column_names if is_arrow else dataset.columns)
+
         # Make sure that the target_attribute is in the dataset
-        if target_attribute not in dataset.columns:
+        if target_attribute not in column_names:
             raise ValueError(f"Target attribute '{target_attribute}' not in dataset.")
 
         # Make sure that the attribute_selection_method is valid
@@ -65,10 +175,315 @@ class DecisionTree:
                 f"Attribute selection method '{attribute_selection_method}' not valid (select either 'information_gain' or 'gini_index')."
             )
 
+        # Make sure that the split_finder is valid
+        if split_finder not in ["exact", "histogram"]:
+            raise ValueError(
+                f"Split finder '{split_finder}' not valid (select either 'exact' or 'histogram')."
+            )
+
+        # Make sure that the bin codes fit into uint8
+        if split_finder == "histogram" and not 2 <= max_bins <= 256:
+            raise ValueError(f"max_bins has to be between 2 and 256 (got {max_bins}).")
+
+        # Presorting is not needed if the thresholds are found on the bins
+        if split_finder == "histogram" and presort:
+            raise ValueError("presort cannot be combined with split_finder 'histogram'.")
+
+        # Make sure that n_jobs is valid
+        if n_jobs == -1:
+            n_jobs = os.cpu_count() or 1
+        if n_jobs < 1:
+            raise ValueError(f"n_jobs has to be at least 1 or -1 (got {n_jobs}).")
+
+        # Make sure that the builder is valid
+        if builder not in ["recursive", "parallel", "level_wise"]:
+            raise ValueError(
+                f"Builder '{builder}' not valid (select either 'recursive', 'parallel' or 'level_wise')."
+            )
+
+        # The level-wise builder does not use worker processes
+        if builder == "level_wise" and n_jobs > 1:
+            raise ValueError("builder 'level_wise' cannot be combined with n_jobs > 1.")
+
+        # Make sure that the pre-pruning limits are valid
+        if max_depth is not None and max_depth < 0:
+            raise ValueError(f"max_depth has to be at least 0 (got {max_depth}).")
+        if min_samples_split < 2:
+            raise ValueError(f"min_samples_split has to be at least 2 (got {min_samples_split}).")
+        if min_samples_leaf < 1:
+            raise ValueError(f"min_samples_leaf has to be at least 1 (got {min_samples_leaf}).")
+        if max_leaf_nodes is not None and max_leaf_nodes < 2:
+            raise ValueError(f"max_leaf_nodes has to be at least 2 (got {max_leaf_nodes}).")
+
+        # Make sure that max_exhaustive_categories is valid
+        gini_index.check_max_exhaustive_categories(max_exhaustive_categories)
+
+        # Make sure that candidate_thresholds is valid
+        if candidate_thresholds not in ["all", "boundary"]:
+            raise ValueError(
+                f"Candidate thresholds '{candidate_thresholds}' not valid (select either 'all' or 'boundary')."
+            )
+
+        # Make sure that the schema only holds attributes of the dataset
+        if schema is not None:
+            for attribute in schema.get_attributes():
+                if attribute not in column_names or attribute == target_attribute:
+                    raise ValueError(f"Schema attribute '{attribute}' not an attribute of the dataset.")
+
+        # Make sure that there is one valid weight per row
+        sample_weight = sample_weights.check_sample_weight(sample_weight, len(dataset))
+        dataset, sample_weight = sample_weights.remove_zero_weight_rows(dataset, sample_weight)
+
+        # Make sure that the splitter is valid (random splits neither need sorted rows nor bins)
+        if splitter not in ["best", "random"]:
+            raise ValueError(f"Splitter '{splitter}' not valid (select either 'best' or 'random').")
+        if splitter == "random" and (presort or split_finder == "histogram" or builder == "level_wise"):
+            raise ValueError(
+                "splitter 'random' cannot be combined with presort, split_finder 'histogram' or builder 'level_wise'."
+            )
+
+        # Make sure that the sampling options are valid
+        if split_sample_threshold is not None:
+            if split_sample_threshold < 1:
+                raise ValueError(
+                    f"split_sample_threshold has to be at least 1 (got {split_sample_threshold})."
+                )
+            if not 0 < split_sample_delta < 1:
+                raise ValueError(
+                    f"split_sample_delta has to be between 0 and 1 (got {split_sample_delta})."
+                )
+            if split_sample_tie_threshold is not None and split_sample_tie_threshold < 0:
+                raise ValueError(
+                    f"split_sample_tie_threshold has to be at least 0 (got {split_sample_tie_threshold})."
+                )
+            if builder == "level_wise":
+                raise ValueError("split_sample_threshold cannot be combined with builder 'level_wise'.")
+
+        # The subtree tasks of the parallel builder cannot share a leaf counter
+        if max_leaf_nodes is not None and builder == "parallel" and n_jobs > 1:
+            raise ValueError("max_leaf_nodes cannot be combined with builder 'parallel'.")
+
         # TODO
         self.target_attribute = target_attribute
-        attribute_list = [col for col in dataset.columns if col != target_attribute]
-        self.tree = self._build_tree(dataset.copy(), attribute_list, attribute_selection_method)
+        self.split_finder = split_finder
+        self.max_bins = max_bins
+        self.n_jobs = n_jobs
+        self.builder = builder
+        self.max_depth = max_depth
+        self.min_samples_split = min_samples_split
+        self.min_samples_leaf = min_samples_leaf
+        self.min_gain = min_gain
+        self.max_leaf_nodes = max_leaf_nodes
+        self.max_exhaustive_categories = max_exhaustive_categories
+        self.candidate_thresholds = candidate_thresholds
+        self.split_sample_threshold = split_sample_threshold
+        self.split_sample_delta = split_sample_delta
+        self.split_sample_tie_threshold = split_sample_tie_threshold
+        self.random_state = random_state
+        self.splitter = splitter
+        self._n_leaves = 1
+        self.n_skipped_evaluations = 0
+        attribute_list = [col for col in column_names if col != target_attribute]
+
+        # Fix the type of every attribute once
+        if is_arrow:
+            self.schema = arrow_data.infer_schema(dataset, attribute_list, schema)
+        elif schema is None:
+            self.schema = DecisionTreeSchema.infer(dataset, attribute_list)
+        else:
+            self.schema = schema.complete(dataset, attribute_list)
+
+        # Collapse the duplicate rows into weighted rows (the weights keep every class count the same)
+        if compress_duplicates:
+            dataset, sample_weight = sample_weights.compress_duplicate_rows(dataset, sample_weight)
+
+        # Encode the dataset once into NumPy arrays, the whole tree is built on the encoded dataset
+        if is_arrow:
+            data = arrow_data.encode_dataset(
+                dataset, attribute_list, target_attribute, sample_weight, self.schema
+            )
+        else:
+            data = DecisionTreeEncodedDataset.from_dataframe(
+                dataset, attribute_list, target_attribute, sample_weight, self.schema
+            )
+        if split_finder == "histogram":
+            data.bin_continuous_attributes(max_bins)
+        self.class_labels = data.class_labels
+
+        if builder == "level_wise":
+            self.tree = self._build_encoded_tree_level_wise(
+                data, attribute_list, attribute_selection_method
+            )
+            return
+
+        attribute_lists = None
+        if presort:
+            continuous_attributes = [
+                attribute for attribute in attribute_list if not data.is_categorical(attribute)
+            ]
+            attribute_lists = DecisionTreeAttributeLists.from_encoded_dataset(
+                data, continuous_attributes
+            )
+
+        # Every node only holds a view of the positions of its rows (no copies of the dataset)
+        rows = np.arange(len(data))
+
+        if n_jobs == 1:
+            self.tree = self._build_encoded_tree(
+                data, rows, attribute_list, attribute_selection_method, attribute_lists
+            )
+            return
+
+        # Move the training data into shared memory, so the worker processes can access it without copies
+        data, rows, attribute_lists = self._start_worker_pool(data, rows, attribute_lists)
+        try:
+            if builder == "parallel":
+                self.tree = self._build_encoded_tree_in_parallel(
+                    len(rows), attribute_list, attribute_selection_method
+                )
+            else:
+                self.tree = self._build_encoded_tree(
+                    data, rows, attribute_list, attribute_selection_method, attribute_lists
+                )
+        finally:
+            del data, rows, attribute_lists
+            self._stop_worker_pool()
+
+    def _start_worker_pool(
+        self,
+        data: DecisionTreeEncodedDataset,
+        rows: np.ndarray,
+        attribute_lists: DecisionTreeAttributeLists = None,
+    ) -> Tuple[DecisionTreeEncodedDataset, np.ndarray, DecisionTreeAttributeLists]:
+        """
+        Copy the training data into shared memory and start n_jobs worker processes attached to it.
+
+        The main process continues with the shared copies, so the in-place partitions of the rows and attribute lists
+        are visible to the workers. A node is then fully described by the range of its rows in the shared rows.
+
+        Parameters:
+        data (DecisionTreeEncodedDataset): The encoded dataset
+        rows (np.ndarray): The positions of all rows of the dataset
+        attribute_lists (DecisionTreeAttributeLists), default None: The presorted attribute lists of the dataset
+
+        Returns:
+        DecisionTreeEncodedDataset: The encoded dataset in shared memory
+        np.ndarray: The positions of the rows in shared memory
+        DecisionTreeAttributeLists: The attribute lists in shared memory (None if attribute_lists is None)
+        """
+        arrays = {"rows": rows, **data.get_arrays()}
+        if attribute_lists is not None:
+            arrays.update(attribute_lists.get_arrays())
+        self._shared_arrays = DecisionTreeSharedArrays(arrays)
+        shared = self._shared_arrays.arrays
+
+        data = DecisionTreeEncodedDataset.from_arrays(
+            shared, data.categories, data.class_labels, data.bin_thresholds
+        )
+        if attribute_lists is not None:
+            attribute_lists = DecisionTreeAttributeLists.from_arrays(shared, data)
+
+        self._worker_pool = ProcessPoolExecutor(
+            max_workers=self.n_jobs,
+            initializer=_initialize_worker,
+            initargs=(
+                self._shared_arrays.get_descriptors(),
+                data.categories,
+                data.class_labels,
+                data.bin_thresholds,
+                self._get_worker_options(),
+                attribute_lists is not None,
+            ),
+        )
+
+        return data, shared["rows"], attribute_lists
+
+    def _stop_worker_pool(self):
+        """
+        Shut the worker processes down and release the shared memory
+        """
+        if self._worker_pool is not None:
+            self._worker_pool.shutdown()
+            self._worker_pool = None
+        if self._shared_arrays is not None:
+            self._shared_arrays.release()
+            self._shared_arrays = None
+
+    def _get_worker_options(self) -> Dict[str, object]:
+        """
+        Get the options the worker processes need to evaluate splits the same way as this decision tree
+
+        Returns:
+        Dict[str, object]: The options by attribute name
+        """
+        return {
+            "target_attribute": self.target_attribute,
+            "split_finder": self.split_finder,
+            "max_bins": self.max_bins,
+            "parallel_min_rows": self.parallel_min_rows,
+            "max_depth": self.max_depth,
+            "min_samples_split": self.min_samples_split,
+            "min_samples_leaf": self.min_samples_leaf,
+            "min_gain": self.min_gain,
+            "max_exhaustive_categories": self.max_exhaustive_categories,
+            "n_jobs": self.n_jobs,
+            "candidate_thresholds": self.candidate_thresholds,
+            "split_sample_threshold": self.split_sample_threshold,
+            "split_sample_delta": self.split_sample_delta,
+            "split_sample_tie_threshold": self.split_sample_tie_threshold,
+            "random_state": self.random_state,
+            "splitter": self.splitter,
+        }
+
+    def _build_encoded_tree_in_parallel(
+        self, n_rows: int, attribute_list: List[str], attribute_selection_method: str
+    ) -> DecisionTreeNode:
+        """
+        Build the decision tree on the shared training data with subtree tasks in the worker processes.
+
+        A task builds the subtree of a range of the shared rows, but leaves the subtrees of child partitions with
+        at least parallel_min_rows rows empty and returns them as pending subtrees. Every pending subtree is submitted
+        as a new task as soon as it is returned. Since the tasks only reorder their own range of the shared rows in
+        place, the tree is exactly the same as the recursively built one.
+
+        Parameters:
+        n_rows (int): The number of rows of the dataset
+        attribute_list (List[str]): The list of attributes to consider
+        attribute_selection_method (str): The attribute selection method to use
+
+        Returns:
+        DecisionTreeNode: The root node of the decision tree
+        """
+        tree = None
+
+        # The branch every running task builds the subtree for (None for the root)
+        running: Dict[Future, DecisionTreeBranch] = {
+            self._worker_pool.submit(
+                _build_subtree_in_worker, 0, n_rows, attribute_list, attribute_selection_method, 0
+            ): None
+        }
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                branch = running.pop(future)
+                subtree, pending_subtrees = future.result()
+                if branch is None:
+                    tree = subtree
+                else:
+                    branch.branch_node = subtree
+
+                for pending_branch, start, end, pending_attribute_list, depth in pending_subtrees:
+                    pending_future = self._worker_pool.submit(
+                        _build_subtree_in_worker,
+                        start,
+                        end,
+                        pending_attribute_list,
+                        attribute_selection_method,
+                        depth,
+                    )
+                    running[pending_future] = pending_branch
+
+        return tree
 
     def _build_tree(
         self,
@@ -78,6 +493,7 @@ class DecisionTree:
     ) -> DecisionTreeNode:
         """
         Recursively build the decision tree.
+        The dataset is encoded first and the tree is then built on the encoded dataset (see _build_encoded_tree).
 
         Parameters:
         data (pd.DataFrame): The (partial) dataset to build the decision tree with
@@ -91,250 +507,2110 @@ class DecisionTree:
         # Base Case 1: If the dataset is empty, this branch leads to an undefined outcome.
         if data.empty:
             raise ValueError("Empty dataset passed to _build_tree where it's not expected to be empty.")
+
+        encoded_data = self._encode(data, attribute_list)
+        self.class_labels = encoded_data.class_labels
+        self._n_leaves = 1
+
+        return self._build_encoded_tree(
+            encoded_data, np.arange(len(encoded_data)), attribute_list, attribute_selection_method
+        )
+
+    def _build_encoded_tree(
+        self,
+        data: DecisionTreeEncodedDataset,
+        rows: np.ndarray,
+        attribute_list: List[str],
+        attribute_selection_method: str,
+        attribute_lists: DecisionTreeAttributeLists = None,
+        depth: int = 0,
+        histograms: Dict[str, np.ndarray] = None,
+    ) -> DecisionTreeNode:
+        """
+        Recursively build the decision tree on an encoded dataset.
+
+        The rows of a node are a view of a contiguous part of the positions of its parent node's rows.
+        Splitting a node only reorders these positions in place, so no subset of the dataset is ever copied.
+        With the "histogram" split finder, the class counts per bin are handed down to the children as well,
+        so only the rows of the smaller children are counted (see _partition_histograms).
+
+        Parameters:
+        data (DecisionTreeEncodedDataset): The encoded dataset to build the decision tree with
+        rows (np.ndarray): The positions of the rows of the (partial) dataset in data (reordered in place)
+        attribute_list (List[str]): The list of attributes to consider
+        attribute_selection_method (str): The attribute selection method to use
+        attribute_lists (DecisionTreeAttributeLists), default None: The presorted attribute lists of the rows in data. If set to None, continuous attributes are sorted at every node.
+        depth (int), default 0: The depth of the node in the decision tree
+        histograms (Dict[str, np.ndarray]), default None: The class counts per bin of the binned continuous attributes of the rows (see _get_histograms). If set to None, they are counted from the rows.
+
+        Returns:
+        DecisionTreeNode: The root node of the decision tree
+        """
+        # Base Case 1: If the dataset is empty, this branch leads to an undefined outcome.
+        if len(rows) == 0:
+            raise ValueError("Empty dataset passed to _build_tree where it's not expected to be empty.")
         # Base Case 2: All instances in the current data subset belong to the same class
-        if data[self.target_attribute].nunique() == 1:
-            return DecisionTreeLeafNode(class_label=data[self.target_attribute].iloc[0])
+        class_counts = data.get_class_counts(rows)
+        majority_class_label = data.get_majority_class_label(class_counts)
+        if np.count_nonzero(class_counts) == 1:
+            return DecisionTreeLeafNode(majority_class_label, class_counts)
         # Base Case 3: No more attributes to split on
         if not attribute_list:
-            return DecisionTreeLeafNode(class_label=data[self.target_attribute].mode()[0])
+            return DecisionTreeLeafNode(majority_class_label, class_counts)
+        # Base Case 4: A pre-pruning limit prevents any split (the split is not even evaluated)
+        if not self._can_split(class_counts.sum(), depth):
+            return DecisionTreeLeafNode(majority_class_label, class_counts)
 
-        best_attribute, best_outcomes = self._find_best_split(data, attribute_list, attribute_selection_method)
+        # The worker processes count the bins of the nodes they evaluate themselves
+        if self.split_finder == "histogram" and self._worker_pool is None and histograms is None:
+            histograms = self._get_histograms(data, rows, attribute_list)
 
-        if best_attribute is None or not best_outcomes:
-            return DecisionTreeLeafNode(class_label=data[self.target_attribute].mode()[0])
+        best_split = self._find_best_encoded_split(
+            data, rows, attribute_list, attribute_selection_method, attribute_lists, histograms, depth
+        )
 
-        branches: List[DecisionTreeBranch] = []
-        for outcome in best_outcomes:
-            if isinstance(outcome, DecisionTreeDecisionOutcomeEquals):
-                subset_data = data[data[best_attribute] == outcome.value]
-            elif isinstance(outcome, DecisionTreeDecisionOutcomeInList):
-                subset_data = data[data[best_attribute].isin(list(outcome.value))]
-            elif isinstance(outcome, DecisionTreeDecisionOutcomeBelowEqual):
-                subset_data = data[data[best_attribute] <= outcome.value]
-            elif isinstance(outcome, DecisionTreeDecisionOutcomeAbove):
-                subset_data = data[data[best_attribute] > outcome.value]
-            else:
-                raise TypeError(f"Unknown DecisionTreeDecisionOutcome type: {type(outcome)}")
+        if best_split is None or not self._add_leaves(best_split.get_n_branches()):
+            return DecisionTreeLeafNode(majority_class_label, class_counts)
+
+        # Route every row into the branch of its value
+        best_attribute = best_split.attribute
+        branch_of_row = best_split.route(data.get_column(best_attribute)[rows])
+        n_branches = best_split.get_n_branches()
+        new_attribute_list = [attr for attr in attribute_list if attr != best_attribute]
 
-            if subset_data.empty:
-                leaf_node = DecisionTreeLeafNode(class_label=data[self.target_attribute].mode()[0])
+        # Hand the sorted rows down with a stable partition (no sorting needed)
+        subset_attribute_lists = [None] * n_branches
+        if attribute_lists is not None:
+            subset_attribute_lists = attribute_lists.partition(
+                rows, branch_of_row, n_branches, new_attribute_list
+            )
+
+        subset_rows = self._partition_rows(rows, branch_of_row, n_branches)
+
+        subset_histograms = [None] * n_branches
+        if histograms is not None:
+            # The rows with a missing value of a threshold split are behind the rows of all branches
+            unrouted_rows = rows[sum(len(branch_rows) for branch_rows in subset_rows) :]
+            subset_histograms = self._partition_histograms(
+                data, subset_rows, histograms, new_attribute_list, depth + 1, unrouted_rows
+            )
+
+        branches: List[DecisionTreeBranch] = []
+        for branch_index, outcome in enumerate(self._decode_split(data, best_split)):
+            if len(subset_rows[branch_index]) == 0:
+                leaf_node = DecisionTreeLeafNode(
+                    majority_class_label, np.zeros_like(class_counts)
+                )
                 branches.append(DecisionTreeBranch(outcome, leaf_node))
+            elif (
+                self._pending_subtrees is not None
+                and len(subset_rows[branch_index]) >= self.parallel_min_rows
+            ):
+                # Leave the subtree of the large partition to another task
+                branch = DecisionTreeBranch(outcome, None)
+                self._pending_subtrees.append(
+                    (branch, subset_rows[branch_index], new_attribute_list, depth + 1)
+                )
+                branches.append(branch)
             else:
-                new_attribute_list = [attr for attr in attribute_list if attr != best_attribute]
-                subtree = self._build_tree(subset_data.copy(), new_attribute_list, attribute_selection_method)
+                subtree = self._build_encoded_tree(
+                    data,
+                    subset_rows[branch_index],
+                    new_attribute_list,
+                    attribute_selection_method,
+                    subset_attribute_lists[branch_index],
+                    depth + 1,
+                    subset_histograms[branch_index],
+                )
                 branches.append(DecisionTreeBranch(outcome, subtree))
 
-        return DecisionTreeInternalNode(best_attribute, branches)
+        return DecisionTreeInternalNode(best_attribute, branches, class_counts)
 
-    def _find_best_split(
+    @staticmethod
+    def _get_histograms(
+        data: DecisionTreeEncodedDataset, rows: np.ndarray, attribute_list: List[str]
+    ) -> Dict[str, np.ndarray]:
+        """
+        Count the class labels of the given rows per bin of every continuous attribute (with the "histogram" split finder)
+
+        Parameters:
+        data (DecisionTreeEncodedDataset): The encoded dataset (with binned continuous attributes)
+        rows (np.ndarray): The positions of the rows in data to count
+        attribute_list (List[str]): The list of attributes to consider
+
+        Returns:
+        Dict[str, np.ndarray]: The class counts per bin (one row per bin) of every continuous attribute
+        """
+        return {
+            attribute: data.get_bin_class_counts(rows, attribute)
+            for attribute in attribute_list
+            if not data.is_categorical(attribute)
+        }
+
+    def _partition_histograms(
         self,
-        data: pd.DataFrame,
+        data: DecisionTreeEncodedDataset,
+        subset_rows: List[np.ndarray],
+        histograms: Dict[str, np.ndarray],
         attribute_list: List[str],
-        attribute_selection_method: str,
-    ) -> Tuple[str, List[DecisionTreeDecisionOutcome]]:
+        depth: int,
+        unrouted_rows: np.ndarray = None,
+    ) -> List[Dict[str, np.ndarray]]:
         """
-        Find the best split for a given dataset and attribute list. Finding the best split includes finding the best attribute to split on and also (depending on the attribute selection method) the best set of outcomes to split on this attribute.
+        Get the class counts per bin of the children of a node from the node's class counts per bin.
+
+        The class counts of a node are the sum of the class counts of its children (and of its rows that fall into no
+        child), so only the rows of all children except the largest one are counted and the class counts of the largest
+        child are the node's class counts minus the ones of its siblings. For a binary split, this only scans the rows of
+        the smaller child. With sample weights, the rounding errors of the subtraction are cleared, so the bins that are
+        empty in the largest child are exactly 0 like when counting its rows.
+        If the largest child will not be split anyway (it is pure or a pre-pruning limit applies), nothing is counted
+        and every child that is split counts its own rows.
 
         Parameters:
-        data (pd.DataFrame): The dataset to find the best splitting attribute for
-        attribute_list (List[str]): The list of attributes to consider
-        attribute_selection_method (str): The attribute selection method to use
+        data (DecisionTreeEncodedDataset): The encoded dataset (with binned continuous attributes)
+        subset_rows (List[np.ndarray]): The positions of the rows of every child
+        histograms (Dict[str, np.ndarray]): The class counts per bin of every continuous attribute of the node (see _get_histograms)
+        attribute_list (List[str]): The list of attributes the children consider
+        depth (int): The depth of the children in the decision tree
+        unrouted_rows (np.ndarray), default None: The positions of the rows of the node that fall into no child (e.g. missing values of a threshold split)
 
         Returns:
-        str: The attribute to split on
-        List[DecisionTreeDecisionOutcome]: The outcomes a split on this attribute should have
+        List[Dict[str, np.ndarray]]: The class counts per bin of every continuous attribute of every child (None if not counted)
         """
-        # TODO
-        best_metric_value = -float('inf')
-        best_attribute = None
-        best_outcomes = []
+        largest_branch = int(np.argmax([len(rows) for rows in subset_rows]))
+        largest_class_counts = data.get_class_counts(subset_rows[largest_branch])
+        if (
+            not attribute_list
+            or not self._can_split(largest_class_counts.sum(), depth)
+            or np.count_nonzero(largest_class_counts) == 1
+        ):
+            return [None] * len(subset_rows)
 
-        for attribute in attribute_list:
-            if attribute_selection_method == "information_gain":
-                current_metric_value, current_outcomes = self._calculate_information_gain(data, attribute)
-            elif attribute_selection_method == "gini_index":
-                current_metric_value, current_outcomes = self._calculate_gini_index(data, attribute)
-            else:
-                raise ValueError("Invalid attribute selection method.")
+        subset_histograms = [
+            self._get_histograms(data, rows, attribute_list) if branch != largest_branch else None
+            for branch, rows in enumerate(subset_rows)
+        ]
+        other_histograms = [
+            sibling_histograms for sibling_histograms in subset_histograms if sibling_histograms is not None
+        ]
+        if unrouted_rows is not None and len(unrouted_rows) > 0:
+            other_histograms.append(self._get_histograms(data, unrouted_rows, attribute_list))
 
-            if current_metric_value > best_metric_value:
-                best_metric_value = current_metric_value
-                best_attribute = attribute
-                best_outcomes = current_outcomes
+        largest_histograms = dict()
+        for attribute in attribute_list:
+            if data.is_categorical(attribute):
+                continue
+            histogram = histograms[attribute] - sum(other[attribute] for other in other_histograms)
+            if data.sample_weights is not None:
+                # Float weights are summed up in a different order than in the node, so an empty bin can be off by a few ulps
+                histogram[np.abs(histogram) <= 1e-9 * histograms[attribute]] = 0.0
+            largest_histograms[attribute] = histogram
+        subset_histograms[largest_branch] = largest_histograms
 
-        return best_attribute, best_outcomes
+        return subset_histograms
 
-    def _calculate_information_gain(
-        self, data: pd.DataFrame, attribute: str
-    ) -> Tuple[float, List[DecisionTreeDecisionOutcome]]:
+    def _can_split(self, n_rows: int, depth: int) -> bool:
         """
-        Calculate the (best) information gain for a given attribute in a dataset.
+        Check if the pre-pruning limits allow to split a node at all
 
         Parameters:
-        data (pd.DataFrame): The dataset to calculate the information gain for
-        attribute (str): The attribute to calculate the information gain for
+        n_rows (int): The number of rows (total weight of the rows) of the node
+        depth (int): The depth of the node
 
         Returns:
-        float: The calculated information gain
-        List[DecisionTreeDecisionOutcome]: The outcomes the best split of this attribute has
+        bool: True if the node may be split, False if it has to become a leaf
         """
-        # If self.target_attribute is not set, raise an error
-        if self.target_attribute is None:
-            raise ValueError("Target attribute not set.")
-
-        # If the attribute is not in the dataset, raise an error
-        if attribute not in data.columns:
-            raise ValueError(f"Attribute '{attribute}' not in dataset.")
+        if self.max_depth is not None and depth >= self.max_depth:
+            return False
+        if n_rows < max(self.min_samples_split, 2 * self.min_samples_leaf):
+            return False
+        # Every split adds at least one leaf
+        if self.max_leaf_nodes is not None and self._n_leaves + 1 > self.max_leaf_nodes:
+            return False
 
-        # TODO
-        best_gain = -float('inf')
-        best_outcomes: List[DecisionTreeDecisionOutcome] = []
+        return True
 
-        if data[attribute].dtype == "object":  # Categorical attribute
-            current_gain = information_gain.calculate_information_gain(
-                data, self.target_attribute, attribute, split_value=None
-            )
+    def _add_leaves(self, n_branches: int) -> bool:
+        """
+        Count the leaves a split of a node adds to the tree, if max_leaf_nodes allows it
 
-            best_gain = current_gain
-            unique_values = data[attribute].unique()
-            best_outcomes = [DecisionTreeDecisionOutcomeEquals(value=val) for val in unique_values]
+        Parameters:
+        n_branches (int): The number of branches of the split
 
-        else:  # Continuous attribute (int or float)
-            unique_values = sorted(data[attribute].unique())
-            split_candidates = [
-                (unique_values[i] + unique_values[i + 1]) / 2
-                for i in range(len(unique_values) - 1)
-            ]
+        Returns:
+        bool: True if the split was counted, False if it would exceed max_leaf_nodes
+        """
+        if self.max_leaf_nodes is not None and self._n_leaves + n_branches - 1 > self.max_leaf_nodes:
+            return False
 
-            for split_val in split_candidates:
-                current_gain = information_gain.calculate_information_gain(
-                    data, self.target_attribute, attribute, split_val
-                )
-                if current_gain > best_gain:
-                    best_gain = current_gain
-                    best_outcomes = [
-                        DecisionTreeDecisionOutcomeBelowEqual(split_val),
-                        DecisionTreeDecisionOutcomeAbove(split_val),
-                    ]
-        return best_gain, best_outcomes
+        self._n_leaves += n_branches - 1
+        return True
 
-    def _calculate_gini_index(
-        self, data: pd.DataFrame, attribute: str
-    ) -> Tuple[float, List[DecisionTreeDecisionOutcome]]:
+    def _build_encoded_tree_level_wise(
+        self,
+        data: DecisionTreeEncodedDataset,
+        attribute_list: List[str],
+        attribute_selection_method: str,
+    ) -> DecisionTreeNode:
         """
-        Calculate the (best) gini index for a given attribute in a dataset.
+        Build the decision tree on an encoded dataset breadth-first, one level at a time (without recursion).
+
+        Every row knows the node of the current level (the frontier) it belongs to. Per level, one pass over the rows
+        counts the class labels of all frontier nodes and one pass per attribute collects what is needed to choose the
+        splits of all frontier nodes at once (see _evaluate_attribute_level_wise). The number of passes over the data is
+        therefore proportional to the depth of the tree instead of the number of nodes.
+        The rows of every node stay in their original order, like in _build_encoded_tree, so the tree is exactly the same.
 
         Parameters:
-        data (pd.DataFrame): The dataset to calculate the gini index for
-        attribute (str): The attribute to calculate the gini index for
+        data (DecisionTreeEncodedDataset): The encoded dataset to build the decision tree with
+        attribute_list (List[str]): The list of attributes to consider
+        attribute_selection_method (str): The attribute selection method to use
 
         Returns:
-        float: The calculated gini index (reduction of impurity)
-        List[DecisionTreeDecisionOutcome]: The outcomes the best split of this attribute has
+        DecisionTreeNode: The root node of the decision tree
         """
-        # If self.target_attribute is not set, raise an error
-        if self.target_attribute is None:
-            raise ValueError("Target attribute not set.")
-
-        # If the attribute is not in the dataset, raise an error
-        if attribute not in data.columns:
-            raise ValueError(f"Attribute '{attribute}' not in dataset.")
+        n_classes = data.get_n_classes()
 
-        # TODO
-        best_gini = -float('inf')
-        best_outcomes: List[DecisionTreeDecisionOutcome] = []
+        # Sort every continuous attribute only once (not needed for the histogram split finder)
+        sorted_row_ids = dict()
+        if self.split_finder == "exact":
+            sorted_row_ids = {
+                attribute: np.argsort(data.get_column(attribute), kind="stable")
+                for attribute in attribute_list
+                if not data.is_categorical(attribute)
+            }
 
-        if data[attribute].dtype == "object":  # Categorical attribute
-            unique_values = list(data[attribute].unique())
+        # The frontier node every row belongs to (-1 if the row has already reached a leaf)
+        node_of_row = np.zeros(len(data), dtype=np.intp)
 
-            if len(unique_values) <= 1:
-                return 0.0, []
+        # The attribute list of every frontier node and the branch leading to it (None for the root node)
+        frontier: List[Tuple[List[str], DecisionTreeBranch]] = [(attribute_list, None)]
+        tree = None
+        depth = 0
+        self._n_leaves = 1
 
-            all_values_set = set(unique_values)
-            for i in range(1, len(unique_values) // 2 + 1):
-                for combo in itertools.combinations(unique_values, i):
-                    split_set_1 = set(combo)
-                    split_set_2 = all_values_set - split_set_1
+        while frontier:
+            n_nodes = len(frontier)
 
-                    if not split_set_1 or not split_set_2:
-                        continue
+            # The rows of every frontier node, in their original order
+            rows = np.flatnonzero(node_of_row >= 0)
+            nodes = node_of_row[rows]
+            rows_by_node = rows[np.argsort(nodes, kind="stable")]
+            node_ends = np.cumsum(np.bincount(nodes, minlength=n_nodes))
+            node_starts = node_ends - np.bincount(nodes, minlength=n_nodes)
 
-                    current_gini = gini_index.calculate_gini_index(
-                        data, self.target_attribute, attribute, split_set_1
-                    )
+            # The class counts of every frontier node
+            class_counts = np.bincount(
+                nodes * n_classes + data.class_codes[rows],
+                weights=data.get_sample_weights(rows),
+                minlength=n_nodes * n_classes,
+            ).reshape(n_nodes, n_classes)
 
-                    if current_gini > best_gini:
-                        best_gini = current_gini
-                        best_outcomes = [
-                            DecisionTreeDecisionOutcomeInList(list(split_set_1)),
-                            DecisionTreeDecisionOutcomeInList(list(split_set_2))
-                        ]
-
-        else:  # Continuous attribute (int or float)
-            unique_values = sorted(data[attribute].unique())
-            split_candidates = [
-                (unique_values[i] + unique_values[i + 1]) / 2
-                for i in range(len(unique_values) - 1)
+            # Pure nodes, nodes without attributes and nodes a pre-pruning limit prevents from splitting become leaves
+            needs_split = [
+                np.count_nonzero(class_counts[node]) > 1
+                and len(frontier[node][0]) > 0
+                and self._can_split(class_counts[node].sum(), depth)
+                for node in range(n_nodes)
             ]
 
-            for split_val in split_candidates:
-                current_gini = gini_index.calculate_gini_index(
-                    data, self.target_attribute, attribute, split_val
+            # Evaluate every attribute for all frontier nodes considering it (in the order of attribute_list, like _find_best_encoded_split)
+            best_metric_values = [-float('inf')] * n_nodes
+            best_splits: List[DecisionTreeSplit] = [None] * n_nodes
+            for attribute in attribute_list:
+                considering = np.array(
+                    [needs_split[node] and attribute in frontier[node][0] for node in range(n_nodes)]
                 )
-                if current_gini > best_gini:
-                    best_gini = current_gini
-                    best_outcomes = [
-                        DecisionTreeDecisionOutcomeBelowEqual(split_val),
-                        DecisionTreeDecisionOutcomeAbove(split_val),
+                if not considering.any():
+                    continue
+
+                results = self._evaluate_attribute_level_wise(
+                    data,
+                    attribute,
+                    attribute_selection_method,
+                    node_of_row,
+                    considering,
+                    sorted_row_ids.get(attribute),
+                )
+                for node, (current_metric_value, current_split) in results.items():
+                    if current_metric_value > best_metric_values[node]:
+                        best_metric_values[node] = current_metric_value
+                        best_splits[node] = current_split
+
+            # Split the frontier nodes and route their rows to the nodes of the next level
+            next_frontier: List[Tuple[List[str], DecisionTreeBranch]] = []
+            next_node_of_row = np.full(len(data), -1, dtype=np.intp)
+            for node, (node_attribute_list, parent_branch) in enumerate(frontier):
+                majority_class_label = data.get_majority_class_label(class_counts[node])
+                best_split = best_splits[node]
+                if self.min_gain is not None and best_metric_values[node] < self.min_gain:
+                    best_split = None
+
+                if (
+                    not needs_split[node]
+                    or best_split is None
+                    or not self._add_leaves(best_split.get_n_branches())
+                ):
+                    subtree = DecisionTreeLeafNode(majority_class_label, class_counts[node])
+                else:
+                    node_rows = rows_by_node[node_starts[node] : node_ends[node]]
+                    branch_of_row = best_split.route(data.get_column(best_split.attribute)[node_rows])
+                    new_attribute_list = [
+                        attr for attr in node_attribute_list if attr != best_split.attribute
                     ]
-        return best_gini, best_outcomes
 
-    def predict(self, dataset: pd.DataFrame) -> List[str | int | float]:
-        """
-        Predict the target attribute for a given dataset.
+                    branches: List[DecisionTreeBranch] = []
+                    for branch_index, outcome in enumerate(self._decode_split(data, best_split)):
+                        branch_rows = node_rows[branch_of_row == branch_index]
+                        if len(branch_rows) == 0:
+                            leaf_node = DecisionTreeLeafNode(
+                                majority_class_label, np.zeros_like(class_counts[node])
+                            )
+                            branches.append(DecisionTreeBranch(outcome, leaf_node))
+                        else:
+                            # The subtree is built with the next level
+                            branch = DecisionTreeBranch(outcome, None)
+                            next_node_of_row[branch_rows] = len(next_frontier)
+                            next_frontier.append((new_attribute_list, branch))
+                            branches.append(branch)
 
-        Parameters:
-        dataset (pd.DataFrame): The dataset to predict the target attribute for
+                    subtree = DecisionTreeInternalNode(
+                        best_split.attribute, branches, class_counts[node]
+                    )
 
-        Returns:
-        List[str | int | float]: A list of predicted class labels
-        """
+                if parent_branch is None:
+                    tree = subtree
+                else:
+                    parent_branch.branch_node = subtree
 
-        # If the tree is not fitted, raise an error
-        if self.tree is None:
-            raise ValueError("Tree not fitted. Call fit method first.")
+            frontier = next_frontier
+            node_of_row = next_node_of_row
+            depth += 1
 
-        # TODO
-        predictions = []
-        for index, row in dataset.iterrows():
-            predictions.append(self._predict_tuple(row, self.tree))
-        return predictions
+        return tree
 
-    def _predict_tuple(
-        self, tuple: pd.Series, node: DecisionTreeNode
-    ) -> str | int | float:
+    def _evaluate_attribute_level_wise(
+        self,
+        data: DecisionTreeEncodedDataset,
+        attribute: str,
+        attribute_selection_method: str,
+        node_of_row: np.ndarray,
+        considering: np.ndarray,
+        sorted_row_ids: np.ndarray = None,
+    ) -> Dict[int, Tuple[float, DecisionTreeSplit]]:
         """
-        Predict the target attribute for a given row in the dataset.
-        This is a recursive function that traverses the decision tree until a leaf node is reached.
+        Evaluate the best split on an attribute for all nodes of a level at once.
+
+        One pass over the rows collects the statistics of all nodes: the class counts per value (discrete-valued attribute),
+        the class counts per bin (histogram split finder) or the presorted rows grouped by node (exact split finder).
+        The splits are then chosen from these statistics with the same functions as in _find_best_encoded_split.
 
         Parameters:
-        tuple (pd.Series): The row to predict the target attribute for
-        node (DecisionTreeNode): The current node in the decision tree
+        data (DecisionTreeEncodedDataset): The encoded dataset
+        attribute (str): The attribute to evaluate
+        attribute_selection_method (str): The attribute selection method to use
+        node_of_row (np.ndarray): The node of the level every row belongs to (-1 if the row has already reached a leaf)
+        considering (np.ndarray): Whether every node of the level considers the attribute
+        sorted_row_ids (np.ndarray), default None: The ids of all rows sorted by the attribute (needed for a continuous attribute with the exact split finder)
 
         Returns:
-        str | int | float: The predicted class label
+        Dict[int, Tuple[float, DecisionTreeSplit]]: The score and best split of every node considering the attribute
         """
-        # TODO
-        if isinstance(node, DecisionTreeLeafNode):
-            return node.get_label()
-        elif isinstance(node, DecisionTreeInternalNode):
-            attribute_to_check = node.get_label()
-            value_in_tuple = tuple[attribute_to_check]
+        n_classes = data.get_n_classes()
+        n_nodes = len(considering)
+        considering_nodes = np.flatnonzero(considering)
 
-            for branch in node.get_branches():
-                if branch.value_matches(value_in_tuple):
-                    return self._predict_tuple(tuple, branch.get_branch_node())
-            raise ValueError(
-                f"No matching branch found for value '{value_in_tuple}' of attribute '{attribute_to_check}'")
-        else:
-            raise TypeError("Unknown node type encountered in prediction.")
\ No newline at end of file
+        # Whether the node of every row considers the attribute (rows in leaves, with node -1, never do)
+        considering_of_node = np.append(considering, False)
+
+        results = dict()
+        if data.is_categorical(attribute):
+            rows = np.flatnonzero(considering_of_node[node_of_row])
+            n_categories = len(data.get_categories(attribute))
+
+            # Class counts of every combination of node and category code that occurs
+            keys = node_of_row[rows] * n_categories + data.get_column(attribute)[rows]
+            present_keys, first_positions, key_index = np.unique(
+                keys, return_index=True, return_inverse=True
+            )
+            counts = np.bincount(
+                key_index * n_classes + data.class_codes[rows],
+                weights=data.get_sample_weights(rows),
+                minlength=len(present_keys) * n_classes,
+            ).reshape(len(present_keys), n_classes)
+
+            # The keys are sorted by node, the rows are in their original order
+            present_nodes = present_keys // n_categories
+            key_starts = np.searchsorted(present_nodes, considering_nodes, side="left")
+            key_ends = np.searchsorted(present_nodes, considering_nodes, side="right")
+            for node, key_start, key_end in zip(considering_nodes, key_starts, key_ends):
+                appearance_order = np.argsort(first_positions[key_start:key_end])
+                present_codes = (present_keys[key_start:key_end] % n_categories)[appearance_order]
+                node_counts = counts[key_start:key_end][appearance_order]
+                present_codes, node_counts, missing_counts = self._separate_missing_counts(
+                    data, attribute, present_codes, node_counts
+                )
+
+                if attribute_selection_method == "information_gain":
+                    results[node] = self._calculate_information_gain_of_counts(
+                        attribute, present_codes, node_counts, missing_counts
+                    )
+                else:
+                    results[node] = self._calculate_gini_index_of_counts(
+                        attribute, present_codes, node_counts, missing_counts
+                    )
+
+            return results
+
+        # Continuous attribute (int or float)
+        if self.split_finder == "histogram":
+            rows = np.flatnonzero(considering_of_node[node_of_row])
+            thresholds = data.get_bin_thresholds(attribute)
+            # One more bin for the missing values (see DecisionTreeEncodedDataset.bin_continuous_attributes)
+            n_bins = len(thresholds) + 2
+
+            # Class counts per bin of every node
+            histograms = np.bincount(
+                (node_of_row[rows] * n_bins + data.get_bins(attribute)[rows].astype(np.intp))
+                * n_classes
+                + data.class_codes[rows],
+                weights=data.get_sample_weights(rows),
+                minlength=n_nodes * n_bins * n_classes,
+            ).reshape(n_nodes, n_bins, n_classes)
+
+            thresholds_of_nodes = {
+                node: self._find_best_threshold_of_histogram(
+                    histograms[node], thresholds, attribute_selection_method
+                )
+                for node in considering_nodes
+            }
+        else:
+            # Group the presorted rows by node (stable, so the rows of every node stay sorted)
+            sorted_row_ids = sorted_row_ids[considering_of_node[node_of_row[sorted_row_ids]]]
+            node_of_sorted_row = node_of_row[sorted_row_ids]
+            sorted_row_ids = sorted_row_ids[np.argsort(node_of_sorted_row, kind="stable")]
+            node_ends = np.cumsum(np.bincount(node_of_sorted_row, minlength=n_nodes))
+            node_starts = node_ends - np.bincount(node_of_sorted_row, minlength=n_nodes)
+
+            sorted_values = data.get_column(attribute)[sorted_row_ids]
+            sorted_class_codes = data.class_codes[sorted_row_ids]
+            sorted_sample_weights = data.get_sample_weights(sorted_row_ids)
+            thresholds_of_nodes = {
+                node: self._find_best_sorted_threshold(
+                    sorted_values[node_starts[node] : node_ends[node]],
+                    sorted_class_codes[node_starts[node] : node_ends[node]],
+                    n_classes,
+                    attribute_selection_method,
+                    None
+                    if sorted_sample_weights is None
+                    else sorted_sample_weights[node_starts[node] : node_ends[node]],
+                )
+                for node in considering_nodes
+            }
+
+        for node, (best_metric_value, split_val) in thresholds_of_nodes.items():
+            if split_val is None:
+                results[node] = (best_metric_value, None)
+            else:
+                results[node] = (
+                    best_metric_value,
+                    DecisionTreeSplit(attribute, "threshold", threshold=split_val),
+                )
+
+        return results
+
+    def _find_best_split(
+        self,
+        data: pd.DataFrame,
+        attribute_list: List[str],
+        attribute_selection_method: str,
+    ) -> Tuple[str, List[DecisionTreeDecisionOutcome]]:
+        """
+        Find the best split for a given dataset and attribute list. Finding the best split includes finding the best attribute to split on and also (depending on the attribute selection method) the best set of outcomes to split on this attribute.
+
+        Parameters:
+        data (pd.DataFrame): The dataset to find the best splitting attribute for
+        attribute_list (List[str]): The list of attributes to consider
+        attribute_selection_method (str): The attribute selection method to use
+
+        Returns:
+        str: The attribute to split on
+        List[DecisionTreeDecisionOutcome]: The outcomes a split on this attribute should have
+        """
+        # TODO
+        encoded_data = self._encode(data, attribute_list)
+        best_split = self._find_best_encoded_split(
+            encoded_data, np.arange(len(encoded_data)), attribute_list, attribute_selection_method
+        )
+
+        if best_split is None:
+            return None, []
+
+        return best_split.attribute, self._decode_split(encoded_data, best_split)
+
+    def _find_best_encoded_split(
+        self,
+        data: DecisionTreeEncodedDataset,
+        rows: np.ndarray,
+        attribute_list: List[str],
+        attribute_selection_method: str,
+        attribute_lists: DecisionTreeAttributeLists = None,
+        histograms: Dict[str, np.ndarray] = None,
+        depth: int = 0,
+    ) -> DecisionTreeSplit:
+        """
+        Find the best split for a given encoded dataset and attribute list.
+
+        With n_jobs == 1, attributes that can not beat the best split found so far are skipped (see _find_best_encoded_split_with_bounds)
+        and counted in n_skipped_evaluations. The result is the same as evaluating every attribute.
+        Nodes with more than split_sample_threshold rows choose their split attribute on a sample of their rows (see _find_best_sampled_split).
+
+        Parameters:
+        data (DecisionTreeEncodedDataset): The encoded dataset to find the best split for
+        rows (np.ndarray): The positions of the rows in data to consider
+        attribute_list (List[str]): The list of attributes to consider
+        attribute_selection_method (str): The attribute selection method to use
+        attribute_lists (DecisionTreeAttributeLists), default None: The presorted attribute lists of the rows in data
+        histograms (Dict[str, np.ndarray]), default None: The class counts per bin of the binned continuous attributes of the rows (see _get_histograms). If set to None, they are counted from the rows.
+        depth (int), default 0: The depth of the node in the decision tree (seeds the random generator of the node, see _get_node_random_generator)
+
+        Returns:
+        DecisionTreeSplit: The best split (None if no attribute can be split)
+        """
+        if (
+            self.split_sample_threshold is not None
+            and len(rows) > self.split_sample_threshold
+            and len(attribute_list) > 1
+        ):
+            best_metric_value, best_split = self._find_best_sampled_split(
+                data, rows, attribute_list, attribute_selection_method, attribute_lists, histograms, depth
+            )
+            # If no sample separates the attributes (or the chosen one can not be split), all rows are evaluated
+            if best_split is not None:
+                if self.min_gain is not None and best_metric_value < self.min_gain:
+                    return None
+                return best_split
+
+        if (
+            self._worker_pool is not None
+            and len(rows) >= self.parallel_min_rows
+            and len(attribute_list) > 1
+        ):
+            results = self._evaluate_attributes_in_parallel(
+                rows, attribute_list, attribute_selection_method, depth
+            )
+        elif self.n_jobs > 1:
+            # No branch and bound, so the skipped evaluations of subtrees built in worker processes do not go uncounted
+            results = (
+                self._evaluate_encoded_attribute(
+                    data, rows, attribute, attribute_selection_method, attribute_lists, histograms, depth
+                )
+                for attribute in attribute_list
+            )
+        else:
+            results = None
+
+        if results is None:
+            best_metric_value, best_split = self._find_best_encoded_split_with_bounds(
+                data, rows, attribute_list, attribute_selection_method, attribute_lists, histograms, depth
+            )
+        else:
+            # The results are in the order of attribute_list, so ties are always broken the same way
+            best_metric_value = -float('inf')
+            best_split = None
+
+            for current_metric_value, current_split in results:
+                if current_metric_value > best_metric_value:
+                    best_metric_value = current_metric_value
+                    best_split = current_split
+
+        # The best split is not good enough to be worth a node
+        if self.min_gain is not None and best_metric_value < self.min_gain:
+            return None
+
+        return best_split
+
+    def _find_best_sampled_split(
+        self,
+        data: DecisionTreeEncodedDataset,
+        rows: np.ndarray,
+        attribute_list: List[str],
+        attribute_selection_method: str,
+        attribute_lists: DecisionTreeAttributeLists = None,
+        histograms: Dict[str, np.ndarray] = None,
+        depth: int = 0,
+    ) -> Tuple[float, DecisionTreeSplit]:
+        """
+        Choose the attribute to split a large node on with growing stratified samples of its rows (as in Hoeffding trees),
+        then find the best split of this attribute on all rows of the node.
+
+        Every attribute is evaluated on a sample of n rows that holds the same share of every class as the node. By the
+        Hoeffding bound, the score of an attribute on the sample differs from its score on all rows by more than
+        epsilon = R * sqrt(ln(1/split_sample_delta) / (2n)) only with probability split_sample_delta, where R is the range
+        of the score (log2(k) for the information gain, 1 - 1/k for the gini index with k classes). The sample starts with
+        split_sample_threshold rows and doubles until the best attribute beats the second best by more than epsilon
+        (or epsilon drops below split_sample_tie_threshold). Samples of more than a quarter of the rows cost about as much
+        as evaluating all rows, so then the attributes are evaluated on all rows instead.
+
+        Parameters:
+        data (DecisionTreeEncodedDataset): The encoded dataset
+        rows (np.ndarray): The positions of the rows in data to consider
+        attribute_list (List[str]): The list of attributes to consider
+        attribute_selection_method (str): The attribute selection method to use
+        attribute_lists (DecisionTreeAttributeLists), default None: The presorted attribute lists of the rows in data
+        histograms (Dict[str, np.ndarray]), default None: The class counts per bin of the binned continuous attributes of the rows (see _get_histograms). If set to None, they are counted from the rows.
+        depth (int), default 0: The depth of the node in the decision tree (seeds the random generator of the node, see _get_node_random_generator)
+
+        Returns:
+        float: The score of the best split of the chosen attribute on all rows (-inf if no sample separates the attributes)
+        DecisionTreeSplit: The best split of the chosen attribute on all rows (None if no sample separates the attributes)
+        """
+        random_generator = self._get_node_random_generator(rows, depth)
+
+        # The rows of every class in random order, every sample takes the first rows of every class
+        shuffled_rows = rows[random_generator.permutation(len(rows))]
+        shuffled_class_codes = data.class_codes[shuffled_rows]
+        rows_of_classes = [
+            shuffled_rows[shuffled_class_codes == class_code]
+            for class_code in np.unique(shuffled_class_codes)
+        ]
+
+        n_classes = max(data.get_n_classes(), 2)
+        if attribute_selection_method == "information_gain":
+            score_range = np.log2(n_classes)
+        else:
+            score_range = 1 - 1 / n_classes
+
+        n_sample = self.split_sample_threshold
+        while n_sample <= len(rows) / 4:
+            sample_rows = np.concatenate(
+                [
+                    class_rows[: int(np.ceil(n_sample * len(class_rows) / len(rows)))]
+                    for class_rows in rows_of_classes
+                ]
+            )
+            scores = np.array(
+                [
+                    self._evaluate_encoded_attribute(
+                        data, sample_rows, attribute, attribute_selection_method, None, None, depth
+                    )[0]
+                    for attribute in attribute_list
+                ]
+            )
+
+            # The first of equally good attributes is the best one, like when evaluating all rows
+            best_position, second_position = np.argsort(-scores, kind="stable")[:2]
+            epsilon = score_range * np.sqrt(
+                np.log(1 / self.split_sample_delta) / (2 * len(sample_rows))
+            )
+            is_tie = (
+                self.split_sample_tie_threshold is not None
+                and epsilon < self.split_sample_tie_threshold
+            )
+            if scores[best_position] > -float("inf") and (
+                scores[best_position] - scores[second_position] > epsilon or is_tie
+            ):
+                return self._evaluate_encoded_attribute(
+                    data,
+                    rows,
+                    attribute_list[best_position],
+                    attribute_selection_method,
+                    attribute_lists,
+                    histograms,
+                    depth,
+                )
+
+            n_sample *= 2
+
+        return -float("inf"), None
+
+    def _get_node_random_generator(self, rows: np.ndarray, depth: int, stream: int = 0) -> np.random.Generator:
+        """
+        Get the random generator of a node, derived from random_state, the depth and the rows of the node.
+        Every node (and stream) draws from its own generator, so the random numbers do not depend on the order
+        the nodes are built or evaluated in (e.g. in the worker processes). With the depth, a child node that keeps
+        all rows of its parent node does not repeat the draws of its parent node.
+
+        Parameters:
+        rows (np.ndarray): The positions of the rows of the node
+        depth (int): The depth of the node in the decision tree
+        stream (int), default 0: The number of the generator of the node (0 for the samples, 1 + the position of the attribute for random splits)
+
+        Returns:
+        np.random.Generator: The random generator (seeded from fresh entropy if random_state is None)
+        """
+        if self.random_state is None:
+            return np.random.default_rng()
+
+        return np.random.default_rng([self.random_state, stream, depth, len(rows), int(rows.min())])
+
+    def _find_best_encoded_split_with_bounds(
+        self,
+        data: DecisionTreeEncodedDataset,
+        rows: np.ndarray,
+        attribute_list: List[str],
+        attribute_selection_method: str,
+        attribute_lists: DecisionTreeAttributeLists = None,
+        histograms: Dict[str, np.ndarray] = None,
+        depth: int = 0,
+    ) -> Tuple[float, DecisionTreeSplit]:
+        """
+        Find the best split of a node with branch and bound: the attributes are evaluated in the order of an upper bound
+        of their score, and every attribute whose bound can not beat the best split found so far is skipped.
+
+        The score of every split is at most the entropy/impurity of the node (a perfect split), and for the information gain
+        a split into k branches gains at most log2(k) bits (unless the attribute has missing values, whose rows fall into no branch). Ties are broken in favor of the attribute that comes first in
+        attribute_list, like when evaluating the attributes in their order.
+
+        Parameters:
+        data (DecisionTreeEncodedDataset): The encoded dataset
+        rows (np.ndarray): The positions of the rows in data to consider
+        attribute_list (List[str]): The list of attributes to consider
+        attribute_selection_method (str): The attribute selection method to use
+        attribute_lists (DecisionTreeAttributeLists), default None: The presorted attribute lists of the rows in data
+        histograms (Dict[str, np.ndarray]), default None: The class counts per bin of the binned continuous attributes of the rows (see _get_histograms). If set to None, they are counted from the rows.
+        depth (int), default 0: The depth of the node in the decision tree (seeds the random generator of the node, see _get_node_random_generator)
+
+        Returns:
+        float: The score of the best split (-inf if no attribute can be split)
+        DecisionTreeSplit: The best split (None if no attribute can be split)
+        """
+        class_counts = data.get_class_counts(rows)
+        if attribute_selection_method == "information_gain":
+            node_bound = float(information_gain.calculate_entropy_from_counts(class_counts))
+            # A continuous attribute is split into two branches (with a margin for rounding errors)
+            n_branches = np.array(
+                [
+                    len(data.get_categories(attribute)) if data.is_categorical(attribute) else 2
+                    for attribute in attribute_list
+                ]
+            )
+            has_missing_values = np.array(
+                [data.has_missing_values(attribute) for attribute in attribute_list], dtype=bool
+            )
+            upper_bounds = np.where(
+                has_missing_values, node_bound, np.minimum(node_bound, np.log2(n_branches) + 1e-9)
+            )
+        else:
+            node_bound = float(gini_index.calculate_impurity_from_counts(class_counts))
+            upper_bounds = np.full(len(attribute_list), node_bound)
+
+        best_metric_value = -float('inf')
+        best_position = len(attribute_list)
+        best_split = None
+
+        # The most promising attributes first (and the earlier one of equally promising attributes)
+        for position in np.lexsort((np.arange(len(attribute_list)), -upper_bounds)):
+            if upper_bounds[position] < best_metric_value or (
+                upper_bounds[position] == best_metric_value and position > best_position
+            ):
+                # Also skips all remaining attributes once a perfect split is found
+                self.n_skipped_evaluations += 1
+                continue
+
+            current_metric_value, current_split = self._evaluate_encoded_attribute(
+                data,
+                rows,
+                attribute_list[position],
+                attribute_selection_method,
+                attribute_lists,
+                histograms,
+                depth,
+            )
+            if current_metric_value > best_metric_value or (
+                current_metric_value == best_metric_value > -float('inf')
+                and position < best_position
+            ):
+                best_metric_value = current_metric_value
+                best_position = position
+                best_split = current_split
+
+        return best_metric_value, best_split
+
+    def _evaluate_encoded_attribute(
+        self,
+        data: DecisionTreeEncodedDataset,
+        rows: np.ndarray,
+        attribute: str,
+        attribute_selection_method: str,
+        attribute_lists: DecisionTreeAttributeLists = None,
+        histograms: Dict[str, np.ndarray] = None,
+        depth: int = 0,
+    ) -> Tuple[float, DecisionTreeSplit]:
+        """
+        Evaluate the best split on a single attribute with the given attribute selection method
+
+        Parameters:
+        data (DecisionTreeEncodedDataset): The encoded dataset
+        rows (np.ndarray): The positions of the rows in data to consider
+        attribute (str): The attribute to evaluate
+        attribute_selection_method (str): The attribute selection method to use
+        attribute_lists (DecisionTreeAttributeLists), default None: The presorted attribute lists of the rows in data
+        histograms (Dict[str, np.ndarray]), default None: The class counts per bin of the binned continuous attributes of the rows (see _get_histograms). If set to None, they are counted from the rows.
+        depth (int), default 0: The depth of the node in the decision tree (seeds the random generator of the node, see _get_node_random_generator)
+
+        Returns:
+        float: The score of the best split on the attribute
+        DecisionTreeSplit: The best split on the attribute
+        """
+        if self.splitter == "random":
+            return self._evaluate_random_split(data, rows, attribute, attribute_selection_method, depth)
+
+        if attribute_selection_method == "information_gain":
+            return self._calculate_encoded_information_gain(
+                data, rows, attribute, attribute_lists, histograms
+            )
+        elif attribute_selection_method == "gini_index":
+            return self._calculate_encoded_gini_index(
+                data, rows, attribute, attribute_lists, histograms
+            )
+        else:
+            raise ValueError("Invalid attribute selection method.")
+
+    def _evaluate_random_split(
+        self,
+        data: DecisionTreeEncodedDataset,
+        rows: np.ndarray,
+        attribute: str,
+        attribute_selection_method: str,
+        depth: int = 0,
+    ) -> Tuple[float, DecisionTreeSplit]:
+        """
+        Evaluate a single random split of an attribute (splitter "random", as in extremely randomized trees).
+
+        A continuous attribute is split at a threshold drawn uniformly between its smallest and largest value in the node.
+        For the gini index, a discrete-valued attribute is split into a random group of its occurring values and all other
+        values. For the information gain it is split into one branch per value as usual, which does not search anyway.
+        Scoring the split only counts the class labels of the rows once, without sorting.
+
+        Parameters:
+        data (DecisionTreeEncodedDataset): The encoded dataset
+        rows (np.ndarray): The positions of the rows in data to consider
+        attribute (str): The attribute to split
+        attribute_selection_method (str): The attribute selection method to use
+        depth (int), default 0: The depth of the node in the decision tree
+
+        Returns:
+        float: The score of the random split (-inf if it leaves less than min_samples_leaf rows in a branch)
+        DecisionTreeSplit: The random split (None if the attribute cannot be split)
+        """
+        random_generator = self._get_node_random_generator(
+            rows, depth, 1 + list(data.columns).index(attribute)
+        )
+
+        if data.is_categorical(attribute):
+            if attribute_selection_method == "information_gain":
+                return self._calculate_encoded_information_gain(data, rows, attribute)
+
+            present_codes = self._get_present_codes(data, rows, attribute)
+            counts = data.get_class_counts(rows, attribute)[present_codes]
+            present_codes, counts, missing_counts = self._separate_missing_counts(
+                data, attribute, present_codes, counts
+            )
+            if len(present_codes) <= 1:
+                return 0.0, None
+
+            # A random group of values that is neither empty nor holds all values
+            in_group = random_generator.integers(0, 2, size=len(present_codes)).astype(bool)
+            if in_group.all() or not in_group.any():
+                in_group[random_generator.integers(len(present_codes))] ^= True
+
+            partition_counts = np.stack([counts[in_group].sum(axis=0), counts[~in_group].sum(axis=0)])
+            if partition_counts.sum(axis=1).min() < self.min_samples_leaf:
+                return -float("inf"), None
+
+            split = DecisionTreeSplit(
+                attribute, "in_list", groups=[present_codes[in_group], present_codes[~in_group]]
+            )
+            return gini_index.calculate_gini_index_from_counts(partition_counts, missing_counts), split
+
+        # Continuous attribute (int or float), missing values are neither below or equal to nor above a threshold
+        values = data.get_column(attribute)[rows]
+        is_missing = np.isnan(values)
+        present_values = values[~is_missing]
+        if len(present_values) == 0 or present_values.min() == present_values.max():
+            return -float("inf"), None
+
+        lowest_value, highest_value = present_values.min(), present_values.max()
+        threshold = random_generator.uniform(lowest_value, highest_value)
+        if threshold >= highest_value:
+            # Rounding can reach the upper end, which would leave the upper branch empty
+            threshold = lowest_value
+
+        below_equal_counts = data.get_class_counts(rows[values <= threshold])
+        total_counts = data.get_class_counts(rows[~is_missing])
+        n_below_equal = below_equal_counts.sum()
+        if min(n_below_equal, total_counts.sum() - n_below_equal) < self.min_samples_leaf:
+            return -float("inf"), None
+
+        score = self._score_thresholds(
+            below_equal_counts[np.newaxis],
+            total_counts,
+            attribute_selection_method,
+            data.get_class_counts(rows[is_missing]),
+        )[0]
+        return score, DecisionTreeSplit(attribute, "threshold", threshold=threshold)
+
+    def _evaluate_attributes_in_parallel(
+        self,
+        rows: np.ndarray,
+        attribute_list: List[str],
+        attribute_selection_method: str,
+        depth: int = 0,
+    ) -> List[Tuple[float, DecisionTreeSplit]]:
+        """
+        Evaluate the attributes of a node in the worker processes.
+        Every worker gets a contiguous chunk of the attributes and only the range of the node's rows in the shared rows.
+
+        Parameters:
+        rows (np.ndarray): The positions of the rows of the node (a view of the shared rows)
+        attribute_list (List[str]): The list of attributes to evaluate
+        attribute_selection_method (str): The attribute selection method to use
+        depth (int), default 0: The depth of the node in the decision tree
+
+        Returns:
+        List[Tuple[float, DecisionTreeSplit]]: The score and best split of every attribute, in the order of attribute_list
+        """
+        start, end = self._get_row_range(rows, self._shared_arrays.get_array("rows"))
+
+        chunk_size = -(-len(attribute_list) // self.n_jobs)
+        futures = [
+            self._worker_pool.submit(
+                _evaluate_attributes_in_worker,
+                attribute_list[chunk_start : chunk_start + chunk_size],
+                start,
+                end,
+                attribute_selection_method,
+                depth,
+            )
+            for chunk_start in range(0, len(attribute_list), chunk_size)
+        ]
+
+        return [result for future in futures for result in future.result()]
+
+    @staticmethod
+    def _get_row_range(rows: np.ndarray, shared_rows: np.ndarray) -> Tuple[int, int]:
+        """
+        Get the range of a node's rows in the shared rows (the rows of every node are a contiguous view of them)
+
+        Parameters:
+        rows (np.ndarray): The positions of the rows of the node
+        shared_rows (np.ndarray): The positions of all rows of the dataset in shared memory
+
+        Returns:
+        int: The first position of the range
+        int: The position after the last position of the range
+        """
+        start = (
+            rows.__array_interface__["data"][0] - shared_rows.__array_interface__["data"][0]
+        ) // shared_rows.itemsize
+
+        return start, start + len(rows)
+
+    def _calculate_information_gain(
+        self, data: pd.DataFrame, attribute: str
+    ) -> Tuple[float, List[DecisionTreeDecisionOutcome]]:
+        """
+        Calculate the (best) information gain for a given attribute in a dataset.
+
+        Parameters:
+        data (pd.DataFrame): The dataset to calculate the information gain for
+        attribute (str): The attribute to calculate the information gain for
+
+        Returns:
+        float: The calculated information gain
+        List[DecisionTreeDecisionOutcome]: The outcomes the best split of this attribute has
+        """
+        # If self.target_attribute is not set, raise an error
+        if self.target_attribute is None:
+            raise ValueError("Target attribute not set.")
+
+        # If the attribute is not in the dataset, raise an error
+        if attribute not in data.columns:
+            raise ValueError(f"Attribute '{attribute}' not in dataset.")
+
+        # TODO
+        encoded_data = self._encode(data, [attribute])
+        best_gain, best_split = self._calculate_encoded_information_gain(
+            encoded_data, np.arange(len(encoded_data)), attribute
+        )
+
+        if best_split is None:
+            return best_gain, []
+
+        return best_gain, self._decode_split(encoded_data, best_split)
+
+    def _calculate_encoded_information_gain(
+        self,
+        data: DecisionTreeEncodedDataset,
+        rows: np.ndarray,
+        attribute: str,
+        attribute_lists: DecisionTreeAttributeLists = None,
+        histograms: Dict[str, np.ndarray] = None,
+    ) -> Tuple[float, DecisionTreeSplit]:
+        """
+        Calculate the (best) information gain for a given attribute in an encoded dataset.
+
+        Parameters:
+        data (DecisionTreeEncodedDataset): The encoded dataset to calculate the information gain for
+        rows (np.ndarray): The positions of the rows in data to consider
+        attribute (str): The attribute to calculate the information gain for
+        attribute_lists (DecisionTreeAttributeLists), default None: The presorted attribute lists of the rows in data
+        histograms (Dict[str, np.ndarray]), default None: The class counts per bin of the binned continuous attributes of the rows (see _get_histograms). If set to None, they are counted from the rows.
+
+        Returns:
+        float: The calculated information gain
+        DecisionTreeSplit: The best split of this attribute (None if the attribute cannot be split)
+        """
+        if data.is_categorical(attribute):  # Categorical attribute
+            present_codes = self._get_present_codes(data, rows, attribute)
+            counts = data.get_class_counts(rows, attribute)[present_codes]
+
+            return self._calculate_information_gain_of_counts(
+                attribute, *self._separate_missing_counts(data, attribute, present_codes, counts)
+            )
+
+        # Continuous attribute (int or float)
+        best_gain, split_val = self._find_best_threshold(
+            data, rows, attribute, "information_gain", attribute_lists, histograms
+        )
+        if split_val is None:
+            return best_gain, None
+
+        return best_gain, DecisionTreeSplit(attribute, "threshold", threshold=split_val)
+
+    def _calculate_information_gain_of_counts(
+        self,
+        attribute: str,
+        present_codes: np.ndarray,
+        counts: np.ndarray,
+        missing_counts: np.ndarray = None,
+    ) -> Tuple[float, DecisionTreeSplit]:
+        """
+        Calculate the information gain of splitting a discrete-valued attribute into one branch per occurring value.
+
+        Parameters:
+        attribute (str): The discrete-valued attribute
+        present_codes (np.ndarray): The occurring category codes, in the order of their first appearance
+        counts (np.ndarray): The class counts of every occurring category code (one row per code in present_codes)
+        missing_counts (np.ndarray), default None: The class counts of the rows with a missing value, which fall into no branch (see _separate_missing_counts)
+
+        Returns:
+        float: The calculated information gain (-inf if a branch would have less than min_samples_leaf rows)
+        DecisionTreeSplit: The split into one branch per occurring value (None if there is no value or a branch would have less than min_samples_leaf rows)
+        """
+        if len(present_codes) == 0:
+            return 0.0, None
+        if counts.sum(axis=1).min() < self.min_samples_leaf:
+            return -float("inf"), None
+
+        # A single value does not separate any rows, not even from the rows with a missing value
+        best_gain = information_gain.calculate_information_gain_from_counts(
+            counts, missing_counts if len(present_codes) > 1 else None
+        )
+        best_split = DecisionTreeSplit(
+            attribute, "equals", groups=[np.array([code]) for code in present_codes]
+        )
+
+        return best_gain, best_split
+
+    def _calculate_gini_index(
+        self, data: pd.DataFrame, attribute: str
+    ) -> Tuple[float, List[DecisionTreeDecisionOutcome]]:
+        """
+        Calculate the (best) gini index for a given attribute in a dataset.
+
+        Parameters:
+        data (pd.DataFrame): The dataset to calculate the gini index for
+        attribute (str): The attribute to calculate the gini index for
+
+        Returns:
+        float: The calculated gini index (reduction of impurity)
+        List[DecisionTreeDecisionOutcome]: The outcomes the best split of this attribute has
+        """
+        # If self.target_attribute is not set, raise an error
+        if self.target_attribute is None:
+            raise ValueError("Target attribute not set.")
+
+        # If the attribute is not in the dataset, raise an error
+        if attribute not in data.columns:
+            raise ValueError(f"Attribute '{attribute}' not in dataset.")
+
+        # TODO
+        encoded_data = self._encode(data, [attribute])
+        best_gini, best_split = self._calculate_encoded_gini_index(
+            encoded_data, np.arange(len(encoded_data)), attribute
+        )
+
+        if best_split is None:
+            return best_gini, []
+
+        return best_gini, self._decode_split(encoded_data, best_split)
+
+    def _calculate_encoded_gini_index(
+        self,
+        data: DecisionTreeEncodedDataset,
+        rows: np.ndarray,
+        attribute: str,
+        attribute_lists: DecisionTreeAttributeLists = None,
+        histograms: Dict[str, np.ndarray] = None,
+    ) -> Tuple[float, DecisionTreeSplit]:
+        """
+        Calculate the (best) gini index for a given attribute in an encoded dataset.
+
+        Parameters:
+        data (DecisionTreeEncodedDataset): The encoded dataset to calculate the gini index for
+        rows (np.ndarray): The positions of the rows in data to consider
+        attribute (str): The attribute to calculate the gini index for
+        attribute_lists (DecisionTreeAttributeLists), default None: The presorted attribute lists of the rows in data
+        histograms (Dict[str, np.ndarray]), default None: The class counts per bin of the binned continuous attributes of the rows (see _get_histograms). If set to None, they are counted from the rows.
+
+        Returns:
+        float: The calculated gini index (reduction of impurity)
+        DecisionTreeSplit: The best split of this attribute (None if the attribute cannot be split)
+        """
+        if data.is_categorical(attribute):  # Categorical attribute
+            present_codes = self._get_present_codes(data, rows, attribute)
+            counts = data.get_class_counts(rows, attribute)[present_codes]
+
+            return self._calculate_gini_index_of_counts(
+                attribute, *self._separate_missing_counts(data, attribute, present_codes, counts)
+            )
+
+        # Continuous attribute (int or float)
+        best_gini, split_val = self._find_best_threshold(
+            data, rows, attribute, "gini_index", attribute_lists, histograms
+        )
+        if split_val is None:
+            return best_gini, None
+
+        return best_gini, DecisionTreeSplit(attribute, "threshold", threshold=split_val)
+
+    def _calculate_gini_index_of_counts(
+        self,
+        attribute: str,
+        present_codes: np.ndarray,
+        counts: np.ndarray,
+        missing_counts: np.ndarray = None,
+    ) -> Tuple[float, DecisionTreeSplit]:
+        """
+        Calculate the best gini index of splitting a discrete-valued attribute into two groups of values.
+        All splits are evaluated if the attribute has at most max_exhaustive_categories occurring values,
+        otherwise only the splits of an order of the values (see gini_index.find_best_split_of_values_from_counts).
+
+        Parameters:
+        attribute (str): The discrete-valued attribute
+        present_codes (np.ndarray): The occurring category codes, in the order of their first appearance
+        counts (np.ndarray): The class counts of every occurring category code (one row per code in present_codes)
+        missing_counts (np.ndarray), default None: The class counts of the rows with a missing value, which fall into neither group (see _separate_missing_counts)
+
+        Returns:
+        float: The calculated gini index (reduction of impurity)
+        DecisionTreeSplit: The best split into two groups of values (None if there is only one value or no split leaves min_samples_leaf rows in both groups)
+        """
+        if len(present_codes) <= 1:
+            return 0.0, None
+
+        best_gini, first_group = gini_index.find_best_split_of_values_from_counts(
+            counts, self.max_exhaustive_categories, self.min_samples_leaf, missing_counts
+        )
+        if first_group is None:
+            return -float("inf"), None
+
+        other_positions = np.setdiff1d(np.arange(len(present_codes)), first_group)
+        best_split = DecisionTreeSplit(
+            attribute,
+            "in_list",
+            groups=[present_codes[first_group], present_codes[other_positions]],
+        )
+
+        return best_gini, best_split
+
+    def _find_best_threshold(
+        self,
+        data: DecisionTreeEncodedDataset,
+        rows: np.ndarray,
+        attribute: str,
+        attribute_selection_method: str,
+        attribute_lists: DecisionTreeAttributeLists = None,
+        histograms: Dict[str, np.ndarray] = None,
+    ) -> Tuple[float, float]:
+        """
+        Find the best threshold to split a continuous attribute on.
+
+        The attribute is sorted once and the class counts on both sides of every candidate
+        threshold (the midpoints between adjacent distinct values) are read from cumulative
+        class counts. All candidates are then scored in one vectorized pass, so finding the
+        best threshold takes O(n log n) instead of O(n) per candidate.
+        If presorted attribute lists are given, the attribute is not sorted at all.
+        If the split finder is "histogram", only the bin boundaries are evaluated (see _find_best_histogram_threshold).
+
+        Parameters:
+        data (DecisionTreeEncodedDataset): The encoded dataset to find the best threshold for
+        rows (np.ndarray): The positions of the rows in data to consider
+        attribute (str): The continuous attribute to split
+        attribute_selection_method (str): The attribute selection method to use
+        attribute_lists (DecisionTreeAttributeLists), default None: The presorted attribute lists of the rows in data
+        histograms (Dict[str, np.ndarray]), default None: The class counts per bin of the binned continuous attributes of the rows (see _get_histograms). If set to None, they are counted from the rows.
+
+        Returns:
+        float: The information gain/gini index of the best threshold (-inf if there is no candidate threshold)
+        float: The best threshold (None if there is no candidate threshold)
+        """
+        if self.split_finder == "histogram":
+            return self._find_best_histogram_threshold(
+                data,
+                rows,
+                attribute,
+                attribute_selection_method,
+                histograms[attribute] if histograms is not None else None,
+            )
+
+        if attribute_lists is not None and attribute in attribute_lists.get_attributes():
+            # The rows of the node are already sorted by the attribute
+            sorted_values, sorted_class_codes = attribute_lists.get_sorted(attribute)
+            sorted_sample_weights = attribute_lists.get_sorted_sample_weights(attribute)
+        else:
+            # Sort the attribute values (and the class labels along with them) once
+            values = data.get_column(attribute)[rows]
+            order = np.argsort(values, kind="stable")
+            sorted_values = values[order]
+            sorted_class_codes = data.class_codes[rows[order]]
+            sorted_sample_weights = data.get_sample_weights(rows[order])
+
+        return self._find_best_sorted_threshold(
+            sorted_values,
+            sorted_class_codes,
+            data.get_n_classes(),
+            attribute_selection_method,
+            sorted_sample_weights,
+        )
+
+    def _find_best_sorted_threshold(
+        self,
+        sorted_values: np.ndarray,
+        sorted_class_codes: np.ndarray,
+        n_classes: int,
+        attribute_selection_method: str,
+        sorted_sample_weights: np.ndarray = None,
+    ) -> Tuple[float, float]:
+        """
+        Find the best threshold to split sorted values of a continuous attribute on (see _find_best_threshold).
+
+        Parameters:
+        sorted_values (np.ndarray): The sorted values of the attribute (missing values, NaN, at the end)
+        sorted_class_codes (np.ndarray): The integer encoded class labels in the same order
+        n_classes (int): The number of classes
+        attribute_selection_method (str): The attribute selection method to use
+        sorted_sample_weights (np.ndarray), default None: The weights of the rows in the same order. If set to None, every row has weight 1.
+
+        Returns:
+        float: The information gain/gini index of the best threshold (-inf if there is no candidate threshold)
+        float: The best threshold (None if there is no candidate threshold)
+        """
+        # Missing values (NaN) are sorted to the end. Like in the histogram split finder, they neither make candidate
+        # thresholds nor count on either side of a threshold, only in the score before splitting.
+        n_present = len(sorted_values) - np.count_nonzero(np.isnan(sorted_values))
+        missing_counts = None
+        if n_present < len(sorted_values):
+            missing_counts = np.bincount(
+                sorted_class_codes[n_present:],
+                weights=None if sorted_sample_weights is None else sorted_sample_weights[n_present:],
+                minlength=n_classes,
+            )
+            sorted_values = sorted_values[:n_present]
+            sorted_class_codes = sorted_class_codes[:n_present]
+            if sorted_sample_weights is not None:
+                sorted_sample_weights = sorted_sample_weights[:n_present]
+
+        # The last position of every run of equal values marks a candidate threshold
+        boundaries = np.flatnonzero(sorted_values[1:] != sorted_values[:-1])
+
+        # The number (total weight) of the rows below/equal to every candidate threshold and of all rows
+        if sorted_sample_weights is None:
+            n_below_equal = boundaries + 1
+            n_total = len(sorted_values)
+        else:
+            cumulative_weights = np.cumsum(sorted_sample_weights)
+            n_below_equal = cumulative_weights[boundaries]
+            n_total = cumulative_weights[-1] if len(cumulative_weights) > 0 else 0
+
+        # Both sides of a threshold need at least min_samples_leaf rows
+        candidates = (n_below_equal >= self.min_samples_leaf) & (
+            n_total - n_below_equal >= self.min_samples_leaf
+        )
+        if self.candidate_thresholds == "boundary" and len(boundaries) > 0:
+            # The class of every run of equal values (-1 if it holds several classes)
+            run_starts = np.concatenate([[0], boundaries + 1])
+            lowest_class_codes = np.minimum.reduceat(sorted_class_codes, run_starts)
+            highest_class_codes = np.maximum.reduceat(sorted_class_codes, run_starts)
+            candidates = self._select_class_boundaries(
+                np.where(lowest_class_codes == highest_class_codes, lowest_class_codes, -1),
+                candidates,
+            )
+        boundaries = boundaries[candidates]
+        if len(boundaries) == 0:
+            return -float("inf"), None
+
+        # Class counts below/equal to every candidate threshold (and of all rows)
+        total_counts = np.bincount(
+            sorted_class_codes, weights=sorted_sample_weights, minlength=n_classes
+        )
+        class_weights = [sorted_class_codes == class_code for class_code in range(n_classes)]
+        if sorted_sample_weights is not None:
+            class_weights = [is_class * sorted_sample_weights for is_class in class_weights]
+        below_equal_counts = np.stack(
+            [np.cumsum(weights)[boundaries] for weights in class_weights], axis=1
+        )
+
+        # Score all candidates at once
+        scores = self._score_thresholds(
+            below_equal_counts, total_counts, attribute_selection_method, missing_counts
+        )
+
+        # np.argmax returns the first maximum, i.e. the smallest of equally good thresholds
+        best_index = np.argmax(scores)
+        boundary = boundaries[best_index]
+        split_val = (sorted_values[boundary] + sorted_values[boundary + 1]) / 2
+
+        return scores[best_index], split_val
+
+    def _find_best_histogram_threshold(
+        self,
+        data: DecisionTreeEncodedDataset,
+        rows: np.ndarray,
+        attribute: str,
+        attribute_selection_method: str,
+        histogram: np.ndarray = None,
+    ) -> Tuple[float, float]:
+        """
+        Find the best threshold to split a continuous attribute on, only considering the boundaries of its bins.
+
+        The class counts per bin (a histogram) are counted in one pass over the rows without sorting (unless they are given).
+        Every boundary after a non-empty bin (except the last one) is a candidate threshold.
+
+        Parameters:
+        data (DecisionTreeEncodedDataset): The encoded dataset (with binned continuous attributes) to find the best threshold for
+        rows (np.ndarray): The positions of the rows in data to consider
+        attribute (str): The continuous attribute to split
+        attribute_selection_method (str): The attribute selection method to use
+        histogram (np.ndarray), default None: The class counts per bin of the rows (one row per bin). If set to None, they are counted from the rows.
+
+        Returns:
+        float: The information gain/gini index of the best threshold (-inf if there is no candidate threshold)
+        float: The best threshold (None if there is no candidate threshold)
+        """
+        if histogram is None:
+            histogram = data.get_bin_class_counts(rows, attribute)
+
+        return self._find_best_threshold_of_histogram(
+            histogram, data.get_bin_thresholds(attribute), attribute_selection_method
+        )
+
+    def _find_best_threshold_of_histogram(
+        self,
+        histogram: np.ndarray,
+        thresholds: np.ndarray,
+        attribute_selection_method: str,
+    ) -> Tuple[float, float]:
+        """
+        Find the best bin boundary to split a continuous attribute on, given the class counts per bin.
+
+        Parameters:
+        histogram (np.ndarray): The class counts of every bin (one row per bin, the last row counts the rows with a missing value, see DecisionTreeEncodedDataset.get_bin_class_counts)
+        thresholds (np.ndarray): The upper threshold of every bin (except the last one)
+        attribute_selection_method (str): The attribute selection method to use
+
+        Returns:
+        float: The information gain/gini index of the best threshold (-inf if there is no candidate threshold)
+        float: The best threshold (None if there is no candidate threshold)
+        """
+        # The rows with a missing value are on neither side of a threshold
+        missing_counts = histogram[-1]
+        histogram = histogram[:-1]
+
+        # Every non-empty bin (except the last one) ends with a candidate threshold
+        all_non_empty_bins = np.flatnonzero(histogram.sum(axis=1) > 0)
+        non_empty_bins = all_non_empty_bins[:-1]
+
+        # Both sides of a threshold need at least min_samples_leaf rows
+        total_counts = histogram.sum(axis=0)
+        n_below_equal = np.cumsum(histogram.sum(axis=1))[non_empty_bins]
+        candidates = (n_below_equal >= self.min_samples_leaf) & (
+            total_counts.sum() - n_below_equal >= self.min_samples_leaf
+        )
+        if self.candidate_thresholds == "boundary":
+            # The class of every non-empty bin (-1 if it holds several classes)
+            bin_counts = histogram[all_non_empty_bins]
+            candidates = self._select_class_boundaries(
+                np.where((bin_counts > 0).sum(axis=1) == 1, bin_counts.argmax(axis=1), -1),
+                candidates,
+            )
+        non_empty_bins = non_empty_bins[candidates]
+        if len(non_empty_bins) == 0:
+            return -float("inf"), None
+
+        below_equal_counts = np.cumsum(histogram, axis=0)[non_empty_bins]
+
+        # Score all candidates at once
+        scores = self._score_thresholds(
+            below_equal_counts, total_counts, attribute_selection_method, missing_counts
+        )
+
+        best_index = np.argmax(scores)
+
+        return scores[best_index], thresholds[non_empty_bins[best_index]]
+
+    @staticmethod
+    def _select_class_boundaries(run_class_codes: np.ndarray, candidates: np.ndarray) -> np.ndarray:
+        """
+        Select the candidate thresholds between consecutive runs of values (or bins) where the class changes.
+
+        A threshold between two runs that only hold rows of the same class can not score better than the closest
+        threshold where the class changes (Fayyad and Irani, 1992), so it does not have to be evaluated. Since the
+        candidates may be limited by min_samples_leaf, the first and the last candidate are always kept as well.
+
+        Parameters:
+        run_class_codes (np.ndarray): The class code of every run (-1 if the run holds rows of several classes)
+        candidates (np.ndarray): Whether the threshold after every run (except the last one) is a candidate
+
+        Returns:
+        np.ndarray: Whether the threshold after every run (except the last one) is a candidate and a class boundary
+        """
+        same_class = (run_class_codes[:-1] == run_class_codes[1:]) & (run_class_codes[:-1] >= 0)
+        selected = candidates & ~same_class
+
+        candidate_positions = np.flatnonzero(candidates)
+        if len(candidate_positions) > 0:
+            selected[candidate_positions[[0, -1]]] = True
+
+        return selected
+
+    def _score_thresholds(
+        self,
+        below_equal_counts: np.ndarray,
+        total_counts: np.ndarray,
+        attribute_selection_method: str,
+        missing_counts: np.ndarray = None,
+    ) -> np.ndarray:
+        """
+        Calculate the information gain/gini index of many candidate thresholds at once.
+
+        Parameters:
+        below_equal_counts (np.ndarray): A matrix with the class counts below or equal to every candidate threshold (one row per candidate)
+        total_counts (np.ndarray): The class counts of all rows with a value
+        attribute_selection_method (str): The attribute selection method to use
+        missing_counts (np.ndarray), default None: The class counts of the rows with a missing value (on neither side of a threshold). If set to None, there are no such rows.
+
+        Returns:
+        np.ndarray: The information gain/gini index of every candidate threshold
+        """
+        contingency_tables = split_search.get_threshold_contingency_tables(below_equal_counts, total_counts)
+
+        if attribute_selection_method == "information_gain":
+            return information_gain.calculate_information_gain_from_counts(
+                contingency_tables, missing_counts
+            )
+        return gini_index.calculate_gini_index_from_counts(contingency_tables, missing_counts)
+
+    def _encode(
+        self, data: pd.DataFrame, attribute_list: List[str]
+    ) -> DecisionTreeEncodedDataset:
+        """
+        Encode a dataset the way function fit does (including the bins if the split finder is "histogram").
+
+        Parameters:
+        data (pd.DataFrame): The dataset to encode
+        attribute_list (List[str]): The attributes to encode
+
+        Returns:
+        DecisionTreeEncodedDataset: The encoded dataset
+        """
+        encoded_data = DecisionTreeEncodedDataset.from_dataframe(
+            data, attribute_list, self.target_attribute, schema=self.schema
+        )
+        if self.split_finder == "histogram":
+            encoded_data.bin_continuous_attributes(self.max_bins)
+
+        return encoded_data
+
+    @staticmethod
+    def _get_present_codes(
+        data: DecisionTreeEncodedDataset, rows: np.ndarray, attribute: str
+    ) -> np.ndarray:
+        """
+        Get the category codes of a discrete-valued attribute that occur in the given rows of an encoded dataset.
+
+        Parameters:
+        data (DecisionTreeEncodedDataset): The encoded dataset
+        rows (np.ndarray): The positions of the rows in data to consider
+        attribute (str): The discrete-valued attribute
+
+        Returns:
+        np.ndarray: The occurring category codes, in the order of their first appearance
+        """
+        codes, first_positions = np.unique(data.get_column(attribute)[rows], return_index=True)
+        return codes[np.argsort(first_positions)]
+
+    @staticmethod
+    def _separate_missing_counts(
+        data: DecisionTreeEncodedDataset, attribute: str, present_codes: np.ndarray, counts: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Separate the class counts of the missing values (NaN or None) of a discrete-valued attribute from the ones of its values.
+        A missing value is no value to split on: its rows fall into no branch, but they count in the score before splitting
+        (like in information_gain.calculate_information_gain and gini_index.calculate_gini_index).
+
+        Parameters:
+        data (DecisionTreeEncodedDataset): The encoded dataset
+        attribute (str): The discrete-valued attribute
+        present_codes (np.ndarray): The occurring category codes
+        counts (np.ndarray): The class counts of every occurring category code (one row per code in present_codes)
+
+        Returns:
+        np.ndarray: The occurring category codes except the one of the missing values
+        np.ndarray: The class counts of these category codes
+        np.ndarray: The class counts of the missing values (None if no missing value occurs)
+        """
+        missing_code = data.get_missing_code(attribute)
+        if missing_code is None:
+            return present_codes, counts, None
+
+        is_missing = present_codes == missing_code
+        if not is_missing.any():
+            return present_codes, counts, None
+
+        return present_codes[~is_missing], counts[~is_missing], counts[is_missing][0]
+
+    @staticmethod
+    def _partition_rows(
+        rows: np.ndarray, branch_of_row: np.ndarray, n_branches: int
+    ) -> List[np.ndarray]:
+        """
+        Partition the rows of a node into the rows of its branches.
+        The rows are reordered in place (keeping their relative order), so the rows of every branch
+        are a view of a contiguous part of rows. Rows that fall into no branch (-1) are moved behind the rows of all branches.
+
+        Parameters:
+        rows (np.ndarray): The positions of the rows of the node
+        branch_of_row (np.ndarray): The branch every row falls into (-1 for no branch)
+        n_branches (int): The number of branches
+
+        Returns:
+        List[np.ndarray]: The positions of the rows of every branch (views of rows)
+        """
+        counts = np.bincount(branch_of_row[branch_of_row >= 0], minlength=n_branches)
+        ends = np.cumsum(counts)
+        starts = ends - counts
+
+        rows[:] = np.concatenate(
+            [rows[branch_of_row == branch] for branch in range(n_branches)] + [rows[branch_of_row < 0]]
+        )
+
+        return [rows[starts[branch] : ends[branch]] for branch in range(n_branches)]
+
+    @staticmethod
+    def _decode_split(
+        data: DecisionTreeEncodedDataset, split: DecisionTreeSplit
+    ) -> List[DecisionTreeDecisionOutcome]:
+        """
+        Decode a split on an encoded dataset into the decision outcomes of its branches.
+
+        Parameters:
+        data (DecisionTreeEncodedDataset): The encoded dataset the split was found on
+        split (DecisionTreeSplit): The split to decode
+
+        Returns:
+        List[DecisionTreeDecisionOutcome]: The decision outcome of every branch
+        """
+        if data.is_categorical(split.attribute):
+            return split.get_outcomes(data.get_categories(split.attribute))
+
+        return split.get_outcomes()
+
+    def cost_complexity_pruning_path(self) -> pd.DataFrame:
+        """
+        Compute the sequence of subtrees of minimal cost-complexity pruning (as in CART).
+
+        The cost-complexity of a subtree is its training error rate plus alpha times its number of leaves.
+        For every alpha, there is a smallest subtree with the minimal cost-complexity, and these subtrees are nested.
+        The whole sequence is computed in one bottom-up pass from the class counts stored in the nodes at fit time,
+        the training data is not needed (see _get_pruning_envelope).
+
+        Returns:
+        pd.DataFrame: One row per subtree of the sequence with the smallest alpha the subtree is optimal for ("alpha"), its number of leaves ("n_leaves") and its training error rate ("error_rate"), ordered by alpha
+        """
+        # If the tree is not fitted, raise an error
+        if self.tree is None:
+            raise ValueError("Tree not fitted. Call fit method first.")
+
+        n_training_rows = self._get_n_training_rows()
+        breakpoints, n_errors, n_leaves = self._get_pruning_envelope(self.tree, dict())
+
+        return pd.DataFrame(
+            {
+                "alpha": breakpoints / n_training_rows,
+                "n_leaves": n_leaves,
+                "error_rate": n_errors / n_training_rows,
+            }
+        )
+
+    def prune(self, alpha: float) -> "DecisionTree":
+        """
+        Get the smallest subtree with the minimal cost-complexity for a given alpha (see cost_complexity_pruning_path).
+        The decision tree itself is not changed.
+
+        Parameters:
+        alpha (float): The cost of every leaf (in units of the training error rate)
+
+        Returns:
+        DecisionTree: A copy of the decision tree with the pruned tree
+        """
+        # If the tree is not fitted, raise an error
+        if self.tree is None:
+            raise ValueError("Tree not fitted. Call fit method first.")
+
+        # Make sure that alpha is valid
+        if alpha < 0:
+            raise ValueError(f"alpha has to be at least 0 (got {alpha}).")
+
+        # The smallest alpha every internal node is pruned at (scaled like in cost_complexity_pruning_path)
+        n_training_rows = self._get_n_training_rows()
+        pruning_alphas = dict()
+        self._get_pruning_envelope(self.tree, pruning_alphas)
+        pruning_alphas = {
+            node_id: pruning_alpha / n_training_rows
+            for node_id, pruning_alpha in pruning_alphas.items()
+        }
+
+        pruned_decision_tree = copy.copy(self)
+        pruned_decision_tree.tree = self._prune_node(self.tree, alpha, pruning_alphas)
+
+        return pruned_decision_tree
+
+    def _get_n_training_rows(self) -> int | float:
+        """
+        Get the number of training rows (total weight of the training rows) from the class counts of the root node
+
+        Returns:
+        int|float: The number of training rows
+        """
+        if self.tree.get_class_counts() is None:
+            raise ValueError("The nodes have no class counts (only fitted trees can be pruned).")
+
+        return self.tree.get_class_counts().sum()
+
+    def _get_pruning_envelope(
+        self, node: DecisionTreeNode, pruning_alphas: Dict[int, float]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Recursively compute the minimal cost-complexity of the subtree of a node as a function of alpha.
+
+        The minimal cost-complexity is piecewise linear: from every breakpoint alpha on, the optimal subtree has a fixed
+        number of training errors and leaves. The function of an internal node is the minimum of turning the node into
+        a leaf and the sum of the functions of its children. Since the sum grows at least as fast in alpha as the leaf,
+        the node is pruned from exactly one alpha on.
+        The errors are counted in rows (not as a rate), so alpha is scaled by the number of training rows.
+
+        Parameters:
+        node (DecisionTreeNode): The root node of the subtree
+        pruning_alphas (Dict[int, float]): Filled with the smallest alpha every internal node (by id) is pruned at
+
+        Returns:
+        np.ndarray: The breakpoints (the first one is 0)
+        np.ndarray: The number of training errors of the optimal subtree from every breakpoint on
+        np.ndarray: The number of leaves of the optimal subtree from every breakpoint on
+        """
+        class_counts = node.get_class_counts()
+        if class_counts is None:
+            raise ValueError("The nodes have no class counts (only fitted trees can be pruned).")
+
+        # The training errors of the node as a leaf
+        leaf_n_errors = class_counts.sum() - class_counts.max(initial=0)
+
+        if isinstance(node, DecisionTreeLeafNode):
+            return np.array([0.0]), np.array([leaf_n_errors]), np.array([1])
+
+        # Sum the functions of the children on the union of their breakpoints
+        envelopes = [
+            self._get_pruning_envelope(branch.get_branch_node(), pruning_alphas)
+            for branch in node.get_branches()
+        ]
+        breakpoints = np.unique(np.concatenate([envelope[0] for envelope in envelopes]))
+        n_errors = np.zeros(len(breakpoints), dtype=class_counts.dtype)
+        n_leaves = np.zeros(len(breakpoints), dtype=np.intp)
+        for child_breakpoints, child_n_errors, child_n_leaves in envelopes:
+            segments = np.searchsorted(child_breakpoints, breakpoints, side="right") - 1
+            n_errors += child_n_errors[segments]
+            n_leaves += child_n_leaves[segments]
+
+        # The alpha from which on the node as a leaf is at least as good as the subtree in every segment
+        with np.errstate(divide="ignore", invalid="ignore"):
+            crossings = np.where(
+                n_leaves > 1,
+                (leaf_n_errors - n_errors) / (n_leaves - 1),
+                np.where(leaf_n_errors <= n_errors, 0.0, np.inf),
+            )
+        crossings = np.maximum(crossings, breakpoints)
+        segment_ends = np.append(breakpoints[1:], np.inf)
+        in_segment = crossings < segment_ends
+        if not in_segment.any():
+            # The subtree is always better than the node as a leaf
+            pruning_alphas[id(node)] = np.inf
+            return breakpoints, n_errors, n_leaves
+
+        pruning_alpha = crossings[np.argmax(in_segment)]
+        pruning_alphas[id(node)] = pruning_alpha
+
+        # The subtree is optimal below the pruning alpha, the node as a leaf from then on
+        kept = breakpoints < pruning_alpha
+
+        return (
+            np.append(breakpoints[kept], pruning_alpha),
+            np.append(n_errors[kept], leaf_n_errors),
+            np.append(n_leaves[kept], 1),
+        )
+
+    def _prune_node(
+        self, node: DecisionTreeNode, alpha: float, pruning_alphas: Dict[int, float]
+    ) -> DecisionTreeNode:
+        """
+        Recursively copy the subtree of a node, turning every internal node that is pruned at alpha into a leaf
+
+        Parameters:
+        node (DecisionTreeNode): The root node of the subtree
+        alpha (float): The cost of every leaf
+        pruning_alphas (Dict[int, float]): The smallest alpha every internal node (by id) is pruned at
+
+        Returns:
+        DecisionTreeNode: The root node of the pruned copy of the subtree
+        """
+        if isinstance(node, DecisionTreeLeafNode):
+            return DecisionTreeLeafNode(node.get_label(), node.get_class_counts())
+
+        if alpha >= pruning_alphas[id(node)]:
+            class_counts = node.get_class_counts()
+            return DecisionTreeLeafNode(self.class_labels[np.argmax(class_counts)], class_counts)
+
+        branches = [
+            DecisionTreeBranch(
+                branch.get_label(), self._prune_node(branch.get_branch_node(), alpha, pruning_alphas)
+            )
+            for branch in node.get_branches()
+        ]
+
+        return DecisionTreeInternalNode(node.get_label(), branches, node.get_class_counts())
+
+    def compile(self) -> DecisionTreeCompiledTree:
+        """
+        Flatten the tree into parallel NumPy arrays (see DecisionTreeCompiledTree).
+        Afterwards, predict advances all rows through the flattened tree level by level at once instead of
+        visiting the nodes row by row. The predicted labels are the same.
+
+        Returns:
+        DecisionTreeCompiledTree: The flattened tree
+        """
+        # If the tree is not fitted, raise an error
+        if self.tree is None:
+            raise ValueError("Tree not fitted. Call fit method first.")
+
+        self.compiled_tree = DecisionTreeCompiledTree(self.tree)
+        return self.compiled_tree
+
+    def generate_predictor(self, module_path: str = None, row_format: str = "dict") -> Callable:
+        """
+        Generate a Python function predicting a single row, with one if/elif statement per internal node
+        (see DecisionTreeCodeGenerator). The function neither visits node objects nor checks their types, which makes it
+        much faster than predict for scoring one row at a time. It predicts the same labels (as Python values).
+
+        Parameters:
+        module_path (str), default None: If set, the function is also written to a module at this path (e.g. "predictor.py"), so it can be imported again later. The bytecode of the module is cached with a hash of its source, so it is reused across processes but never for a different tree (see DecisionTreeCodeGenerator.write_module). If set to None, the function is only compiled in memory.
+        row_format (str), default "dict": How the function takes a row. "dict" takes a dictionary (or pd.Series) of the values of the attributes. "tuple" takes a tuple of the values in the order of the attributes of the training dataset (the module constant ATTRIBUTES).
+
+        Returns:
+        Callable: The function predict(row), returning the predicted class label
+        """
+        # If the tree is not fitted, raise an error
+        if self.tree is None:
+            raise ValueError("Tree not fitted. Call fit method first.")
+
+        # The attributes of the training dataset (or the attributes of the tree if it was not fitted by fit)
+        attributes = [] if self.schema is None else self.schema.get_attributes()
+        attributes += [
+            attribute for attribute in self._get_split_attributes(self.tree) if attribute not in attributes
+        ]
+
+        generator = DecisionTreeCodeGenerator(self.tree, attributes, row_format)
+        if module_path is None:
+            return generator.compile_function()
+
+        return generator.write_module(module_path)
+
+    def predict(self, dataset: pd.DataFrame | object, engine: str = "rows") -> List[str | int | float]:
+        """
+        Predict the target attribute for a given dataset.
+
+        Parameters:
+        dataset (pd.DataFrame | object): The dataset to predict the target attribute for, a pandas DataFrame, a pyarrow Table or RecordBatch or a Polars DataFrame. The columns of Arrow data are read directly from their buffers (see arrow_data.get_values).
+        engine (str), default "rows": How the rows are predicted. "rows" traverses the tree for every row on its own (or advances all rows through the flattened tree at once if compile was called). "partition" pushes the positions of all rows through the tree, splitting them at every internal node with one vectorized comparison per branch and labelling the rows of every leaf at once (see _predict_partition). All engines predict the same labels.
+
+        Returns:
+        List[str | int | float]: A list of predicted class labels
+        """
+
+        # If the tree is not fitted, raise an error
+        if self.tree is None:
+            raise ValueError("Tree not fitted. Call fit method first.")
+
+        # Make sure that the engine is valid
+        if engine not in ["rows", "partition"]:
+            raise ValueError(f"Engine '{engine}' not valid (select either 'rows' or 'partition').")
+
+        if engine == "partition":
+            columns, n_rows = self._get_columns(dataset, self._get_split_attributes(self.tree))
+            predictions = np.empty(n_rows, dtype=object)
+            self._predict_partition(self.tree, columns, np.arange(n_rows), predictions)
+            return list(predictions)
+
+        # Predict all rows at once with the flattened tree (as long as the tree was not replaced since compile)
+        if self.compiled_tree is not None and self.compiled_tree.tree is self.tree:
+            columns, n_rows = self._get_columns(dataset, self.compiled_tree.attributes)
+            return self.compiled_tree.predict(columns, n_rows)
+
+        # TODO
+        predictions = []
+        if arrow_data.is_arrow_data(dataset):
+            for row in arrow_data.iterate_rows(arrow_data.to_arrow_table(dataset)):
+                predictions.append(self._predict_tuple(row, self.tree))
+            return predictions
+
+        for index, row in dataset.iterrows():
+            predictions.append(self._predict_tuple(row, self.tree))
+        return predictions
+
+    @staticmethod
+    def _get_columns(
+        dataset: pd.DataFrame | object, attributes: List[str]
+    ) -> Tuple[Dict[str, np.ndarray], int]:
+        """
+        Get the values of the given attributes of a dataset as NumPy arrays (Arrow data is read without a pandas DataFrame).
+
+        Parameters:
+        dataset (pd.DataFrame | object): The dataset, a pandas DataFrame, a pyarrow Table or RecordBatch or a Polars DataFrame
+        attributes (List[str]): The attributes to get the values of
+
+        Returns:
+        Dict[str, np.ndarray]: The values of every attribute
+        int: The number of rows of the dataset
+        """
+        if arrow_data.is_arrow_data(dataset):
+            table = arrow_data.to_arrow_table(dataset)
+            return {attribute: arrow_data.get_values(table, attribute) for attribute in attributes}, table.num_rows
+
+        return {attribute: dataset[attribute].to_numpy() for attribute in attributes}, len(dataset)
+
+    def _get_split_attributes(self, node: DecisionTreeNode) -> List[str]:
+        """
+        Get the attributes the internal nodes of a (sub)tree split on.
+
+        Parameters:
+        node (DecisionTreeNode): The root node of the (sub)tree
+
+        Returns:
+        List[str]: The attributes, in the order they are first seen (depth-first)
+        """
+        if not isinstance(node, DecisionTreeInternalNode):
+            return []
+
+        attributes = [node.get_label()]
+        for branch in node.get_branches():
+            for attribute in self._get_split_attributes(branch.get_branch_node()):
+                if attribute not in attributes:
+                    attributes.append(attribute)
+
+        return attributes
+
+    def _predict_partition(
+        self,
+        node: DecisionTreeNode,
+        columns: Dict[str, np.ndarray],
+        rows: np.ndarray,
+        predictions: np.ndarray,
+    ):
+        """
+        Predict the target attribute for all rows that reach a node at once.
+        This is a recursive function that splits the positions of the rows at every internal node with one vectorized
+        comparison per branch (see DecisionTreeDecisionOutcome.values_match) until a leaf node is reached,
+        which labels all of its rows in bulk.
+
+        Parameters:
+        node (DecisionTreeNode): The current node in the decision tree
+        columns (Dict[str, np.ndarray]): The values of every attribute the tree splits on
+        rows (np.ndarray): The positions of the rows that reach the node
+        predictions (np.ndarray): The predicted class label of every row (filled in by the leaves)
+        """
+        if isinstance(node, DecisionTreeLeafNode):
+            predictions[rows] = node.get_label()
+        elif isinstance(node, DecisionTreeInternalNode):
+            attribute_to_check = node.get_label()
+            values = columns[attribute_to_check][rows]
+
+            # Like in _predict_tuple, every row takes the first branch its value matches
+            unmatched = np.ones(len(rows), dtype=bool)
+            for branch in node.get_branches():
+                matches = unmatched & branch.values_match(values)
+                if matches.any():
+                    self._predict_partition(branch.get_branch_node(), columns, rows[matches], predictions)
+                    unmatched &= ~matches
+
+            if unmatched.any():
+                raise ValueError(
+                    f"No matching branch found for value '{values[unmatched][0]}' of attribute '{attribute_to_check}'")
+        else:
+            raise TypeError("Unknown node type encountered in prediction.")
+
+    def _predict_tuple(
+        self, tuple: pd.Series, node: DecisionTreeNode
+    ) -> str | int | float:
+        """
+        Predict the target attribute for a given row in the dataset.
+        This is a recursive function that traverses the decision tree until a leaf node is reached.
+
+        Parameters:
+        tuple (pd.Series): The row to predict the target attribute for (or a dictionary of the values of the row)
+        node (DecisionTreeNode): The current node in the decision tree
+
+        Returns:
+        str | int | float: The predicted class label
+        """
+        # TODO
+        if isinstance(node, DecisionTreeLeafNode):
+            return node.get_label()
+        elif isinstance(node, DecisionTreeInternalNode):
+            attribute_to_check = node.get_label()
+            value_in_tuple = tuple[attribute_to_check]
+
+            for branch in node.get_branches():
+                if branch.value_matches(value_in_tuple):
+                    return self._predict_tuple(tuple, branch.get_branch_node())
+            raise ValueError(
+                f"No matching branch found for value '{value_in_tuple}' of attribute '{attribute_to_check}'")
+        else:
+            raise TypeError("Unknown node type encountered in prediction.")
+
+# The state of a worker process of DecisionTree.fit with n_jobs > 1 (see _initialize_worker)
+_worker_state = dict()
+
+
+def _initialize_worker(
+    descriptors: Dict[str, Tuple[str, Tuple[int, ...], str]],
+    categories: Dict[str, np.ndarray],
+    class_labels: np.ndarray,
+    bin_thresholds: Dict[str, np.ndarray],
+    options: Dict[str, object],
+    presort: bool,
+):
+    """
+    Attach a worker process to the training data in shared memory (called once per worker process)
+
+    Parameters:
+    descriptors (Dict[str, Tuple[str, Tuple[int, ...], str]]): The descriptors of the shared arrays
+    categories (Dict[str, np.ndarray]): The original values of the category codes of every discrete-valued attribute
+    class_labels (np.ndarray): The original class labels of the class codes
+    bin_thresholds (Dict[str, np.ndarray]): The bin thresholds of the continuous attributes
+    options (Dict[str, object]): The options of the decision tree (see DecisionTree._get_worker_options)
+    presort (bool): Whether the shared arrays contain presorted attribute lists
+    """
+    arrays, shared_memories = DecisionTreeSharedArrays.attach(descriptors)
+    data = DecisionTreeEncodedDataset.from_arrays(arrays, categories, class_labels, bin_thresholds)
+
+    decision_tree = DecisionTree()
+    vars(decision_tree).update(options)
+
+    _worker_state["shared_memories"] = shared_memories
+    _worker_state["data"] = data
+    _worker_state["rows"] = arrays["rows"]
+    _worker_state["attribute_lists"] = (
+        DecisionTreeAttributeLists.from_arrays(arrays, data) if presort else None
+    )
+    _worker_state["decision_tree"] = decision_tree
+
+
+def _evaluate_attributes_in_worker(
+    attribute_list: List[str], start: int, end: int, attribute_selection_method: str, depth: int
+) -> List[Tuple[float, DecisionTreeSplit]]:
+    """
+    Evaluate attributes of a node in a worker process
+
+    Parameters:
+    attribute_list (List[str]): The attributes to evaluate
+    start (int): The first position of the node's rows in the shared rows
+    end (int): The position after the last position of the node's rows in the shared rows
+    attribute_selection_method (str): The attribute selection method to use
+    depth (int): The depth of the node in the decision tree
+
+    Returns:
+    List[Tuple[float, DecisionTreeSplit]]: The score and best split of every attribute, in the order of attribute_list
+    """
+    attribute_lists = _worker_state["attribute_lists"]
+    if attribute_lists is not None:
+        attribute_lists = attribute_lists.get_range(start, end)
+
+    return [
+        _worker_state["decision_tree"]._evaluate_encoded_attribute(
+            _worker_state["data"],
+            _worker_state["rows"][start:end],
+            attribute,
+            attribute_selection_method,
+            attribute_lists,
+            None,
+            depth,
+        )
+        for attribute in attribute_list
+    ]
+
+
+def _build_subtree_in_worker(
+    start: int, end: int, attribute_list: List[str], attribute_selection_method: str, depth: int
+) -> Tuple[DecisionTreeNode, List[Tuple[DecisionTreeBranch, int, int, List[str], int]]]:
+    """
+    Build the subtree of a node in a worker process (builder "parallel").
+    The subtrees of large child partitions are left empty and returned as pending subtrees.
+
+    Parameters:
+    start (int): The first position of the node's rows in the shared rows
+    end (int): The position after the last position of the node's rows in the shared rows
+    attribute_list (List[str]): The list of attributes to consider
+    attribute_selection_method (str): The attribute selection method to use
+    depth (int): The depth of the node in the decision tree
+
+    Returns:
+    DecisionTreeNode: The root node of the subtree
+    List[Tuple[DecisionTreeBranch, int, int, List[str], int]]: The empty branch, the range of the rows, the attribute list and the depth of every pending subtree
+    """
+    decision_tree = _worker_state["decision_tree"]
+    shared_rows = _worker_state["rows"]
+    attribute_lists = _worker_state["attribute_lists"]
+    if attribute_lists is not None:
+        attribute_lists = attribute_lists.get_range(start, end)
+
+    decision_tree._pending_subtrees = []
+    try:
+        subtree = decision_tree._build_encoded_tree(
+            _worker_state["data"],
+            shared_rows[start:end],
+            attribute_list,
+            attribute_selection_method,
+            attribute_lists,
+            depth,
+        )
+        pending_subtrees = [
+            (branch, *DecisionTree._get_row_range(rows, shared_rows), pending_attribute_list, pending_depth)
+            for branch, rows, pending_attribute_list, pending_depth in decision_tree._pending_subtrees
+        ]
+    finally:
+        decision_tree._pending_subtrees = None
+
+    # The pending branches are pickled together with the subtree, so they stay part of it
+    return subtree, pending_subtrees
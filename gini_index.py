@@ -1,11 +1,352 @@
+import numpy as np
 import pandas as pd
-from math import log
-from typing import List, Set
+from fractions import Fraction
+from typing import List, Set, Tuple
+
+import split_search
 
 """
 Collection of functions to calculate the impurity and the gini index of attributes in a dataset.
+
+The functions ending in _from_counts work on class counts (contingency tables) instead of a dataset.
+They are vectorized, so the scores of many candidate splits can be calculated at once.
 """
 
+# The largest number of values of a discrete-valued attribute for which all 2^(k-1) - 1 splits into two groups of values
+# can be evaluated (the splits are evaluated at once, i.e. 2^19 rows of class counts)
+MAX_EXHAUSTIVE_CATEGORIES = 20
+
+
+def check_max_exhaustive_categories(max_exhaustive_categories: int):
+    """
+    Make sure that the maximum number of values to evaluate all splits into two groups of values for is valid.
+
+    Parameters:
+    max_exhaustive_categories (int): The maximum number of values (from 0 to MAX_EXHAUSTIVE_CATEGORIES)
+    """
+    if max_exhaustive_categories < 0:
+        raise ValueError(
+            f"max_exhaustive_categories has to be at least 0 (got {max_exhaustive_categories})."
+        )
+    if max_exhaustive_categories > MAX_EXHAUSTIVE_CATEGORIES:
+        raise ValueError(
+            f"max_exhaustive_categories has to be at most {MAX_EXHAUSTIVE_CATEGORIES} (got {max_exhaustive_categories})."
+        )
+
+
+def calculate_impurity_from_counts(class_counts: np.ndarray) -> np.ndarray | float:
+    """
+    Calculate the gini impurity of class counts.
+
+    Parameters:
+    class_counts (np.ndarray): The class counts, the last axis holds the count of every class. Any leading axes are kept, e.g. a matrix with one row of class counts per partition gives the impurity of every partition.
+
+    Returns:
+    np.ndarray|float: The calculated impurity of every vector of class counts (0 for vectors without any rows)
+    """
+    class_counts = np.asarray(class_counts)
+    n_rows = class_counts.sum(axis=-1, keepdims=True)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        probabilities = class_counts / n_rows
+
+    return np.where(n_rows[..., 0] > 0, 1 - (probabilities**2).sum(axis=-1), 0.0)
+
+
+def calculate_impurity_partitioned_from_counts(
+    contingency_tables: np.ndarray,
+) -> np.ndarray | float:
+    """
+    Calculate the impurity of partitioned class counts, i.e. the impurity of every partition weighted by its number of rows.
+
+    Parameters:
+    contingency_tables (np.ndarray): The class counts of every partition, the last two axes are partitions x classes. Any leading axes are kept, e.g. an array of shape (n_candidates, n_partitions, n_classes) gives the impurity of every candidate split.
+
+    Returns:
+    np.ndarray|float: The calculated impurity of every contingency table
+    """
+    contingency_tables = np.asarray(contingency_tables)
+    partition_sizes = contingency_tables.sum(axis=-1)
+    n_rows = partition_sizes.sum(axis=-1, keepdims=True)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        weights = np.where(n_rows > 0, partition_sizes / n_rows, 0.0)
+
+    return np.sum(weights * calculate_impurity_from_counts(contingency_tables), axis=-1)
+
+
+def calculate_gini_index_from_counts(
+    contingency_tables: np.ndarray, missing_counts: np.ndarray = None
+) -> np.ndarray | float:
+    """
+    Calculate the Gini index (= reduction of impurity) of partitioned class counts.
+
+    Rows with a missing value are in no partition, but like in calculate_gini_index they count in the impurity
+    before partitioning and the partitions are weighted by their share of all rows.
+
+    Parameters:
+    contingency_tables (np.ndarray): The class counts of every partition, the last two axes are partitions x classes. Any leading axes are kept, e.g. an array of shape (n_candidates, n_partitions, n_classes) gives the Gini index of every candidate split.
+    missing_counts (np.ndarray), default None: The class counts of the rows with a missing value (in no partition). If set to None, there are no such rows.
+
+    Returns:
+    np.ndarray|float: The calculated Gini index of every contingency table
+    """
+    contingency_tables = np.asarray(contingency_tables)
+    present_counts = contingency_tables.sum(axis=-2)
+    if missing_counts is None:
+        return calculate_impurity_from_counts(
+            present_counts
+        ) - calculate_impurity_partitioned_from_counts(contingency_tables)
+
+    all_counts = present_counts + missing_counts
+    n_present = present_counts.sum(axis=-1)
+    n_rows = all_counts.sum(axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        present_share = np.where(n_rows > 0, n_present / n_rows, 0.0)
+
+    return calculate_impurity_from_counts(
+        all_counts
+    ) - present_share * calculate_impurity_partitioned_from_counts(contingency_tables)
+
+
+def calculate_value_order_from_counts(class_counts: np.ndarray) -> np.ndarray:
+    """
+    Order the values of a discrete-valued attribute, so that a good split into two groups of values is a split
+    into a prefix of this order and the rest (only k-1 instead of 2^(k-1) - 1 splits have to be evaluated).
+    - If there are (at most) two classes, the values are ordered by the proportion of the second class.
+      The best split is always one of the prefix splits (Breiman et al., 1984).
+    - Otherwise the values are ordered by the projection of their class proportions on the first principal component
+      of the (count weighted) class proportions (Coppersmith, Hong and Hosking, 1999). This is a heuristic.
+
+    Parameters:
+    class_counts (np.ndarray): The class counts of every value (one row per value, every value has to occur)
+
+    Returns:
+    np.ndarray: The positions of the values in their order
+    """
+    n_rows_of_value = class_counts.sum(axis=1)
+    proportions = class_counts / n_rows_of_value[:, np.newaxis]
+
+    present_classes = np.flatnonzero(class_counts.sum(axis=0) > 0)
+    if len(present_classes) <= 2:
+        order_keys = proportions[:, present_classes[-1]]
+    else:
+        mean_proportions = n_rows_of_value @ proportions / n_rows_of_value.sum()
+        centered_proportions = proportions - mean_proportions
+        covariance = (
+            centered_proportions * n_rows_of_value[:, np.newaxis]
+        ).T @ centered_proportions
+        # np.linalg.eigh returns the eigenvalues in ascending order
+        first_component = np.linalg.eigh(covariance)[1][:, -1]
+        order_keys = centered_proportions @ first_component
+
+    return np.argsort(order_keys, kind="stable")
+
+
+def find_best_split_of_values_from_counts(
+    class_counts: np.ndarray,
+    max_exhaustive_categories: int = 10,
+    min_samples_leaf: int = 1,
+    missing_counts: np.ndarray = None,
+) -> Tuple[float, np.ndarray | None]:
+    """
+    Find the split of the values of a discrete-valued attribute into two groups of values with the best Gini index.
+    All 2^(k-1) - 1 splits are evaluated if there are at most max_exhaustive_categories values, otherwise only the k-1 splits
+    into a prefix of an order of the values and the rest (see calculate_value_order_from_counts).
+    Of the two groups of a split, the smaller one (of groups of the same size, the one with the first value) is returned.
+
+    Parameters:
+    class_counts (np.ndarray): The class counts of every value (one row per value, every value has to occur)
+    max_exhaustive_categories (int), default 10: The maximum number of values to evaluate all splits for
+    min_samples_leaf (int), default 1: The minimum number of rows of both groups
+    missing_counts (np.ndarray), default None: The class counts of the rows with a missing value, which are in neither group (see calculate_gini_index_from_counts). They do not change which split is the best one.
+
+    Returns:
+    float: The Gini index of the best split (-inf if no split leaves min_samples_leaf rows in both groups)
+    np.ndarray|None: The positions of the values in the smaller group of the best split in ascending order (None if no split leaves min_samples_leaf rows in both groups)
+    """
+    if len(class_counts) > max_exhaustive_categories:
+        return _find_best_ordered_split_of_values(class_counts, min_samples_leaf, missing_counts)
+
+    first_group = _find_best_gray_code_combination(class_counts, min_samples_leaf)
+    if first_group is None:
+        return -float("inf"), None
+
+    # Class counts of the values in the first group and of all other values
+    first_group_counts = class_counts[first_group].sum(axis=0)
+    partition_counts = np.stack([first_group_counts, class_counts.sum(axis=0) - first_group_counts])
+
+    return calculate_gini_index_from_counts(partition_counts, missing_counts), first_group
+
+
+def _find_best_gray_code_combination(class_counts: np.ndarray, min_samples_leaf: int) -> np.ndarray | None:
+    """
+    Find the split of the values of a discrete-valued attribute into two groups with the best Gini index,
+    evaluating all 2^(k-1) - 1 splits.
+
+    The splits are walked in Gray code order (the last value always stays in the second group): every step moves
+    the class counts of a single value from one group to the other, so the class counts of every split are a
+    cumulative sum of these moves and cost O(n_classes) instead of summing up the values of both groups.
+    Since the Gini index of a split is the impurity of the node minus 1 plus the sum of
+    sum(class_count^2) / n_rows over both groups, only this sum is compared (exactly, for splits that score about the same).
+    Of equally good splits, the one that comes first when enumerating the smaller group of every split by size and
+    then lexicographically is returned.
+
+    Parameters:
+    class_counts (np.ndarray): The class counts of every value (one row per value)
+    min_samples_leaf (int): The minimum number of rows of both groups
+
+    Returns:
+    np.ndarray|None: The positions of the values in the smaller group of the best split (None if no split leaves min_samples_leaf rows in both groups)
+    """
+    n_values = len(class_counts)
+
+    # The Gray code of every step and the value moved at every step (the lowest set bit of the step)
+    steps = np.arange(1, 2 ** (n_values - 1), dtype=np.int64)
+    gray_codes = steps ^ (steps >> 1)
+    moved_values = np.log2(steps & -steps).astype(np.intp)
+    directions = np.where((gray_codes >> moved_values) & 1, 1, -1)
+
+    # The class counts of the first group of every split
+    in_counts = np.cumsum(directions[:, np.newaxis] * class_counts[moved_values], axis=0)
+    out_counts = class_counts.sum(axis=0) - in_counts
+    n_in = in_counts.sum(axis=1)
+    n_out = out_counts.sum(axis=1)
+    sums_of_squares_in = (in_counts**2).sum(axis=1)
+    sums_of_squares_out = (out_counts**2).sum(axis=1)
+
+    # Both groups need at least min_samples_leaf rows
+    valid = (n_in >= min_samples_leaf) & (n_out >= min_samples_leaf)
+    if not valid.any():
+        return None
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values = np.where(
+            valid, sums_of_squares_in / n_in + sums_of_squares_out / n_out, -np.inf
+        )
+
+    # Compare the splits that score about the same as the best one exactly
+    best_value = values.max()
+    candidates = np.flatnonzero(values >= best_value - 1e-9 * abs(best_value))
+    exact_values = [
+        Fraction(sums_of_squares_in[candidate].item()) / Fraction(n_in[candidate].item())
+        + Fraction(sums_of_squares_out[candidate].item()) / Fraction(n_out[candidate].item())
+        for candidate in candidates
+    ]
+    best_exact_value = max(exact_values)
+
+    combos = []
+    for candidate, exact_value in zip(candidates, exact_values):
+        if exact_value != best_exact_value:
+            continue
+        in_positions = [
+            position for position in range(n_values - 1) if (gray_codes[candidate] >> position) & 1
+        ]
+        out_positions = [position for position in range(n_values) if position not in in_positions]
+        combos.append(min(in_positions, out_positions, key=lambda positions: (len(positions), positions)))
+
+    return np.array(min(combos, key=lambda positions: (len(positions), positions)), dtype=np.intp)
+
+
+def _find_best_ordered_split_of_values(
+    class_counts: np.ndarray, min_samples_leaf: int, missing_counts: np.ndarray = None
+) -> Tuple[float, np.ndarray | None]:
+    """
+    Find a split of the values of a discrete-valued attribute into two groups without evaluating all 2^(k-1) splits.
+
+    The values are ordered (see calculate_value_order_from_counts) and only the k-1 splits into a prefix
+    of this order and the rest are evaluated, like the thresholds of a continuous attribute.
+
+    Parameters:
+    class_counts (np.ndarray): The class counts of every value (one row per value, every value has to occur)
+    min_samples_leaf (int): The minimum number of rows of both groups
+    missing_counts (np.ndarray), default None: The class counts of the rows with a missing value (in neither group)
+
+    Returns:
+    float: The Gini index of the best split (-inf if no split leaves min_samples_leaf rows in both groups)
+    np.ndarray|None: The positions of the values in the smaller group of the best split in ascending order (None if no split leaves min_samples_leaf rows in both groups)
+    """
+    n_rows_of_value = class_counts.sum(axis=1)
+    order = calculate_value_order_from_counts(class_counts)
+
+    # Evaluate the split after every prefix of the order like thresholds
+    below_equal_counts = np.cumsum(class_counts[order], axis=0)[:-1]
+    scores = calculate_gini_index_from_counts(
+        split_search.get_threshold_contingency_tables(below_equal_counts, class_counts.sum(axis=0)),
+        missing_counts,
+    )
+
+    # Both groups need at least min_samples_leaf rows
+    n_below_equal = below_equal_counts.sum(axis=1)
+    scores[
+        (n_below_equal < min_samples_leaf)
+        | (n_rows_of_value.sum() - n_below_equal < min_samples_leaf)
+    ] = -float("inf")
+    best_index = np.argmax(scores)
+    if scores[best_index] == -float("inf"):
+        return -float("inf"), None
+
+    # Like the exhaustive search, the smaller group comes first
+    groups = [np.sort(order[: best_index + 1]), np.sort(order[best_index + 1 :])]
+    if len(groups[1]) < len(groups[0]) or (
+        len(groups[1]) == len(groups[0]) and groups[1][0] == 0
+    ):
+        groups.reverse()
+
+    return scores[best_index], groups[0]
+
+
+def score_all_attributes(
+    dataset: pd.DataFrame,
+    target_attribute: str,
+    attributes: List[str] = None,
+    split_finder: str = "exact",
+    max_bins: int = 255,
+    max_exhaustive_categories: int = 10,
+) -> pd.DataFrame:
+    """
+    Calculate the best Gini index and split of every attribute of a dataset in one call (e.g. to screen the attributes of a wide dataset).
+
+    The target attribute is encoded once and the class counts of every attribute are collected in a single pass over its values,
+    from which all candidate splits of the attribute are scored at once:
+    - A discrete-valued attribute is split into two groups of values (see find_best_split_of_values_from_counts).
+    - A continuous attribute is split at the best threshold.
+    Like in calculate_gini_index, rows with a missing value are in no partition, but count in the impurity before partitioning.
+
+    Parameters:
+    dataset (pd.DataFrame): The dataset to score the attributes of
+    target_attribute (str): The target attribute used as the class label
+    attributes (List[str]), default None: The attributes to score. If set to None, all attributes except the target attribute are scored.
+    split_finder (str), default "exact": How to find the thresholds of continuous attributes, either "exact" (all midpoints between distinct values) or "histogram" (the thresholds of at most max_bins bins)
+    max_bins (int), default 255: The maximum number of bins per continuous attribute (only used with the "histogram" split finder)
+    max_exhaustive_categories (int), default 10: The maximum number of values of a discrete-valued attribute to evaluate all splits for (at most MAX_EXHAUSTIVE_CATEGORIES)
+
+    Returns:
+    pd.DataFrame: The best Gini index ("gini_index") and split ("split") of every attribute (one row per attribute).
+    The split is the set of values of the first group (Set[str]) or the threshold (float) and can be passed to calculate_gini_index.
+    It is None if the attribute can not be split.
+    """
+    check_max_exhaustive_categories(max_exhaustive_categories)
+
+    def split_values(
+        counts: np.ndarray, categories: np.ndarray, missing_counts: np.ndarray
+    ) -> Tuple[float, Set[str]]:
+        gini_index_value, first_group = find_best_split_of_values_from_counts(
+            counts, max_exhaustive_categories, missing_counts=missing_counts
+        )
+        return gini_index_value, set(categories[first_group].tolist())
+
+    return split_search.score_all_attributes(
+        dataset,
+        target_attribute,
+        attributes,
+        split_finder,
+        max_bins,
+        "gini_index",
+        calculate_gini_index_from_counts,
+        split_values,
+    )
+
 
 def calculate_impurity(dataset: pd.DataFrame, target_attribute: str) -> float:
     """
@@ -18,20 +359,12 @@ def calculate_impurity(dataset: pd.DataFrame, target_attribute: str) -> float:
     Returns:
     float: The calculated impurity
     """
-    # TODO
     if len(dataset) == 0:
         return 0.0
 
     class_cnt = dataset[target_attribute].value_counts()
-    rows_cnt = len(dataset) # total number of instances
-
-    sum_of_squares = 0.0
-    for cnt in class_cnt:
-        probability = cnt / rows_cnt
-        sum_of_squares += probability ** 2
 
-    gini_impurity = 1 - sum_of_squares
-    return gini_impurity
+    return float(calculate_impurity_from_counts(class_cnt.to_numpy()))
 
 
 def calculate_impurity_partitioned(
@@ -49,40 +382,16 @@ def calculate_impurity_partitioned(
     partition_attribute (str): The attribute that is used to partition the dataset
     split (int|float|Set[str]): The split used to partition the partition attribute. If the partition attribute is discrete-valued, the split is a set of strings (Set[str]). If the partition attribute is continuous-valued, the split is a single value (int or float).
     """
-    # TODO
-    if len(dataset) == 0:
+    contingency_table = _get_contingency_table(dataset, target_attribute, partition_attribute, split)
+    if contingency_table is None:
         return 0.0
 
-    weighted_impurity = 0.0
-    rows_cnt = len(dataset)
-
-    if isinstance(split, (int, float)):
-        subset_le = dataset[dataset[partition_attribute] <= split]
-        subset_gt = dataset[dataset[partition_attribute] > split]
-
-        if len(subset_le) != 0:
-            probability_le = len(subset_le) / rows_cnt
-            impurity_le = calculate_impurity(subset_le, target_attribute)
-            weighted_impurity += probability_le * impurity_le
-        if len(subset_gt) != 0:
-            probability_gt = len(subset_gt) / rows_cnt
-            impurity_gt = calculate_impurity(subset_gt, target_attribute)
-            weighted_impurity += probability_gt * impurity_gt
-
-    if isinstance(split, Set):
-        subset_in_split = dataset[dataset[partition_attribute].isin(list(split))]
-        subset_not_in_split = dataset[~dataset[partition_attribute].isin(list(split))]
-
-        if len(subset_in_split) != 0:
-            probability_in = len(subset_in_split) / rows_cnt
-            impurity_in = calculate_impurity(subset_in_split, target_attribute)
-            weighted_impurity += probability_in * impurity_in
-        if len(subset_not_in_split) != 0:
-            probability_not_in = len(subset_not_in_split) / rows_cnt
-            impurity_not_in = calculate_impurity(subset_not_in_split, target_attribute)
-            weighted_impurity += probability_not_in * impurity_not_in
-
-    return weighted_impurity
+    # Rows with a missing value are in no partition, but the partitions are weighted by their share of all rows
+    return float(
+        contingency_table.sum()
+        / len(dataset)
+        * calculate_impurity_partitioned_from_counts(contingency_table)
+    )
 
 def calculate_gini_index(
     dataset: pd.DataFrame,
@@ -102,8 +411,41 @@ def calculate_gini_index(
     Returns:
     float: The calculated Gini index
     """
-    # TODO
-    initial_gini_impurity = calculate_impurity(dataset, target_attribute)
-    partitioned_impurity = calculate_impurity_partitioned(dataset, target_attribute, partition_attribute, split)
+    # The impurity before partitioning counts all rows, also the rows with a missing value
+    # (without a valid split, nothing is partitioned)
+    return calculate_impurity(dataset, target_attribute) - calculate_impurity_partitioned(
+        dataset, target_attribute, partition_attribute, split
+    )
+
+def _get_contingency_table(
+    dataset: pd.DataFrame,
+    target_attribute: str,
+    partition_attribute: str,
+    split: int | float | Set[str],
+) -> np.ndarray | None:
+    """
+    Count the class labels of both partitions of a dataset partitioned by a given attribute and split.
+
+    Parameters:
+    dataset (pd.DataFrame): The dataset to count the class labels of
+    target_attribute (str): The target attribute used as the class label
+    partition_attribute (str): The attribute that is used to partition the dataset
+    split (int|float|Set[str]): The split used to partition the partition attribute (see calculate_impurity_partitioned)
+
+    Returns:
+    np.ndarray|None: The class counts of every partition (one row per partition), None if the dataset is empty or the split is neither a value nor a set
+    """
+    if len(dataset) == 0:
+        return None
+
+    values = dataset[partition_attribute]
+    if isinstance(split, (int, float)):
+        # Rows with a missing value belong to neither partition
+        partitions = (values > split).where(values.notna())
+    elif isinstance(split, Set):
+        # Rows with a missing value belong to neither partition
+        partitions = values.isin(list(split)).where(values.notna())
+    else:
+        return None
 
-    return initial_gini_impurity - partitioned_impurity
\ No newline at end of file
+    return pd.crosstab(partitions, dataset[target_attribute]).to_numpy()
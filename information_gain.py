@@ -1,13 +1,137 @@
+import numpy as np
 import pandas as pd
-from math import log
 from typing import List
 
+import split_search
+
 """
 Collection of functions to calculate the entropy, information and 
 information gain of attributes in a dataset.
+
+The functions ending in _from_counts work on class counts (contingency tables) instead of a dataset.
+They are vectorized, so the scores of many candidate splits can be calculated at once.
 """
 
 
+def calculate_entropy_from_counts(class_counts: np.ndarray) -> np.ndarray | float:
+    """
+    Calculate the entropy of class counts.
+
+    Parameters:
+    class_counts (np.ndarray): The class counts, the last axis holds the count of every class. Any leading axes are kept, e.g. a matrix with one row of class counts per partition gives the entropy of every partition.
+
+    Returns:
+    np.ndarray|float: The calculated entropy of every vector of class counts (0 for vectors without any rows)
+    """
+    class_counts = np.asarray(class_counts)
+    n_rows = class_counts.sum(axis=-1, keepdims=True)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        probabilities = class_counts / n_rows
+        terms = np.where(probabilities > 0, probabilities * np.log2(probabilities), 0.0)
+
+    return -terms.sum(axis=-1)
+
+
+def calculate_information_partitioned_from_counts(
+    contingency_tables: np.ndarray,
+) -> np.ndarray | float:
+    """
+    Calculate the information of partitioned class counts, i.e. the entropy of every partition weighted by its number of rows.
+
+    Parameters:
+    contingency_tables (np.ndarray): The class counts of every partition, the last two axes are partitions x classes. Any leading axes are kept, e.g. an array of shape (n_candidates, n_partitions, n_classes) gives the information of every candidate split.
+
+    Returns:
+    np.ndarray|float: The calculated information of every contingency table
+    """
+    contingency_tables = np.asarray(contingency_tables)
+    partition_sizes = contingency_tables.sum(axis=-1)
+    n_rows = partition_sizes.sum(axis=-1, keepdims=True)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        weights = np.where(n_rows > 0, partition_sizes / n_rows, 0.0)
+
+    return np.sum(weights * calculate_entropy_from_counts(contingency_tables), axis=-1)
+
+
+def calculate_information_gain_from_counts(
+    contingency_tables: np.ndarray,
+    missing_counts: np.ndarray = None,
+) -> np.ndarray | float:
+    """
+    Calculate the information gain of partitioned class counts.
+
+    Rows with a missing value are in no partition, but like in calculate_information_gain they count in the entropy
+    before partitioning and the partitions are weighted by their share of all rows.
+
+    Parameters:
+    contingency_tables (np.ndarray): The class counts of every partition, the last two axes are partitions x classes. Any leading axes are kept, e.g. an array of shape (n_candidates, n_partitions, n_classes) gives the information gain of every candidate split.
+    missing_counts (np.ndarray), default None: The class counts of the rows with a missing value (in no partition). If set to None, there are no such rows.
+
+    Returns:
+    np.ndarray|float: The calculated information gain of every contingency table
+    """
+    contingency_tables = np.asarray(contingency_tables)
+    present_counts = contingency_tables.sum(axis=-2)
+    if missing_counts is None:
+        return calculate_entropy_from_counts(
+            present_counts
+        ) - calculate_information_partitioned_from_counts(contingency_tables)
+
+    all_counts = present_counts + missing_counts
+    n_present = present_counts.sum(axis=-1)
+    n_rows = all_counts.sum(axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        present_share = np.where(n_rows > 0, n_present / n_rows, 0.0)
+
+    return calculate_entropy_from_counts(
+        all_counts
+    ) - present_share * calculate_information_partitioned_from_counts(contingency_tables)
+
+
+def score_all_attributes(
+    dataset: pd.DataFrame,
+    target_attribute: str,
+    attributes: List[str] = None,
+    split_finder: str = "exact",
+    max_bins: int = 255,
+) -> pd.DataFrame:
+    """
+    Calculate the best information gain and split of every attribute of a dataset in one call (e.g. to screen the attributes of a wide dataset).
+
+    The target attribute is encoded once and the class counts of every attribute are collected in a single pass over its values,
+    from which all candidate splits of the attribute are scored at once:
+    - A discrete-valued attribute is split into one partition per value.
+    - A continuous attribute is split at the best threshold.
+    Like in calculate_information_gain, rows with a missing value are in no partition, but count in the entropy before partitioning.
+
+    Parameters:
+    dataset (pd.DataFrame): The dataset to score the attributes of
+    target_attribute (str): The target attribute used as the class label
+    attributes (List[str]), default None: The attributes to score. If set to None, all attributes except the target attribute are scored.
+    split_finder (str), default "exact": How to find the thresholds of continuous attributes, either "exact" (all midpoints between distinct values) or "histogram" (the thresholds of at most max_bins bins)
+    max_bins (int), default 255: The maximum number of bins per continuous attribute (only used with the "histogram" split finder)
+
+    Returns:
+    pd.DataFrame: The best information gain ("information_gain") and split ("split") of every attribute (one row per attribute).
+    The split is None for a discrete-valued attribute or the threshold (float) of a continuous attribute and can be passed to calculate_information_gain.
+    """
+    return split_search.score_all_attributes(
+        dataset,
+        target_attribute,
+        attributes,
+        split_finder,
+        max_bins,
+        "information_gain",
+        calculate_information_gain_from_counts,
+        lambda counts, categories, missing_counts: (
+            calculate_information_gain_from_counts(counts, missing_counts),
+            None,
+        ),
+    )
+
+
 def calculate_entropy(dataset: pd.DataFrame, target_attribute: str) -> float:
     """
     Calculate the entropy for a given target attribute in a dataset.
@@ -19,20 +143,12 @@ def calculate_entropy(dataset: pd.DataFrame, target_attribute: str) -> float:
     Returns:
     float: The calculated entropy (= expected information)
     """
-    # TODO
     if len(dataset) == 0.0:
         return 0.0
 
     class_cnt = dataset[target_attribute].value_counts() # gives the number of occurrence of each unique class
-    rows_cnt = len(dataset)
 
-    entropy = 0.0
-    for cnt in class_cnt:
-        probability = cnt / rows_cnt
-        if probability > 0.0:
-            entropy -= probability * log(probability, 2)
-
-    return entropy
+    return float(calculate_entropy_from_counts(class_cnt.to_numpy()))
 
 def calculate_information_partitioned(
     dataset: pd.DataFrame,
@@ -49,34 +165,17 @@ def calculate_information_partitioned(
     partition_attribute (str): The attribute that is used to partition the dataset
     split_value (int|float), default None: The value to split the partition attribute on. If set to None, the function will calculate the information for a discrete-valued partition attribute. If set to a value, the function will calculate the information for a continuous-valued partition attribute.
     """
-    # TODO
     if len(dataset) == 0.0:
         return 0.0
 
-    weighted_entropy = 0.0
-    rows_cnt = len(dataset) # total number of instances
-    if split_value is None:
-        unique_values = dataset[partition_attribute].unique()
-        for each_unique_value in unique_values:
-            subset = dataset[dataset[partition_attribute] == each_unique_value]
-            if len(subset) != 0:
-                probability = len(subset) / rows_cnt
-                entropy_of_subset = calculate_entropy(subset, target_attribute)
-                weighted_entropy += probability * entropy_of_subset
-    else:
-        subset_le = dataset[dataset[partition_attribute] <= split_value]
-        subset_gt = dataset[dataset[partition_attribute] > split_value]
-
-        if len(subset_le) != 0:
-            probability_le = len(subset_le) / len(dataset)
-            entropy_le = calculate_entropy(subset_le, target_attribute)
-            weighted_entropy += probability_le * entropy_le
-        if len(subset_gt) != 0:
-            probability_gt = len(subset_gt) / len(dataset)
-            entropy_gt = calculate_entropy(subset_gt, target_attribute)
-            weighted_entropy += probability_gt * entropy_gt
+    contingency_table = _get_contingency_table(dataset, target_attribute, partition_attribute, split_value)
 
-    return weighted_entropy
+    # Rows with a missing value are in no partition, but the partitions are weighted by their share of all rows
+    return float(
+        contingency_table.sum()
+        / len(dataset)
+        * calculate_information_partitioned_from_counts(contingency_table)
+    )
 
 def calculate_information_gain(
     dataset: pd.DataFrame,
@@ -96,8 +195,37 @@ def calculate_information_gain(
     Returns:
     float: The calculated information gain
     """
-    # TODO
-    initial_entropy = calculate_entropy(dataset, target_attribute)
-    partitioned_info = calculate_information_partitioned(dataset, target_attribute, partition_attribute, split_value)
+    if len(dataset) == 0.0:
+        return 0.0
+
+    # The entropy before partitioning counts all rows, also the rows with a missing value
+    return calculate_entropy(dataset, target_attribute) - calculate_information_partitioned(
+        dataset, target_attribute, partition_attribute, split_value
+    )
+
+def _get_contingency_table(
+    dataset: pd.DataFrame,
+    target_attribute: str,
+    partition_attribute: str,
+    split_value: int | float = None,
+) -> np.ndarray:
+    """
+    Count the class labels of every partition of a dataset partitioned by a given attribute.
+
+    Parameters:
+    dataset (pd.DataFrame): The dataset to count the class labels of
+    target_attribute (str): The target attribute used as the class label
+    partition_attribute (str): The attribute that is used to partition the dataset
+    split_value (int|float), default None: The value to split the partition attribute on (see calculate_information_partitioned)
+
+    Returns:
+    np.ndarray: The class counts of every partition (one row per partition)
+    """
+    values = dataset[partition_attribute]
+    if split_value is None:
+        partitions = values
+    else:
+        # Rows with a missing value belong to neither partition
+        partitions = (values > split_value).where(values.notna())
 
-    return initial_entropy - partitioned_info
+    return pd.crosstab(partitions, dataset[target_attribute]).to_numpy()
@@ -1,7 +1,11 @@
+import numpy as np
 import pandas as pd
-from typing import List, Set
+from typing import List, Set, Tuple
 import math
 
+import arrow_data
+import sample_weights
+
 from classes.naive_bayes_likelihoods import NaiveBayesLikelihoods
 from classes.naive_bayes_prior_probabilities import NaiveBayesPriorProbabilities
 
@@ -24,28 +28,53 @@ class NaiveBayes:
         # The prior probabilities of the classifier
         self.prior_probabilities: NaiveBayesPriorProbabilities = None
 
-    def fit(self, dataset: pd.DataFrame, target_attribute: str):
+    def fit(
+        self,
+        dataset: pd.DataFrame | object,
+        target_attribute: str,
+        sample_weight: np.ndarray = None,
+        compress_duplicates: bool = False,
+    ):
         """
         Fit the Naive Bayes classifier to the training dataset.
         Sets the target attribute and the class labels.
         Calculates the prior probabilities, and the likelihoods.
 
         Parameters:
-        dataset (pd.DataFrame): The training dataset
+        dataset (pd.DataFrame | object): The training dataset, a pandas DataFrame, a pyarrow Table or RecordBatch or a Polars DataFrame. Arrow data is read directly from its buffers without a pandas DataFrame (see _fit_arrow).
         target_attribute (str): The target attribute to predict
+        sample_weight (np.ndarray), default None: The non-negative weight of every row of the dataset. The prior probabilities and likelihoods count a row with its weight, so a row with integer weight k is the same as k copies of the row (and a row with weight 0 is left out). If set to None, every row has weight 1.
+        compress_duplicates (bool), default False: If set to True, identical rows are collapsed into one row weighted by the number (total weight) of its copies before fitting. The classifier is the same, but datasets with many duplicate rows are fitted much faster.
         """
+        # Read Arrow data (and Polars data frames) as a pyarrow Table, without converting it into a pandas DataFrame
+        is_arrow = arrow_data.is_arrow_data(dataset)
+        if is_arrow:
+            dataset = arrow_data.to_arrow_table(dataset)
+
         # Make sure that the target_attribute is in the dataset
-        if target_attribute not in dataset.columns:
+        if target_attribute not in (dataset.column_names if is_arrow else dataset.columns):
             raise ValueError(f"Target attribute '{target_attribute}' not in dataset.")
 
+        # Make sure that there is one valid weight per row
+        sample_weight = sample_weights.check_sample_weight(sample_weight, len(dataset))
+        dataset, sample_weight = sample_weights.remove_zero_weight_rows(dataset, sample_weight)
+
+        # Collapse the duplicate rows into weighted rows
+        if compress_duplicates:
+            dataset, sample_weight = sample_weights.compress_duplicate_rows(dataset, sample_weight)
+
         # TODO
         self.target_attribute = target_attribute
+        if is_arrow:
+            self._fit_arrow(dataset, sample_weight)
+            return
+
         self.class_labels = set(dataset[target_attribute].unique())
-        self.prior_probabilities = self._calculate_prior_probabilities(dataset)
-        self.likelihoods = self._calculate_likelihoods(dataset)
+        self.prior_probabilities = self._calculate_prior_probabilities(dataset, sample_weight)
+        self.likelihoods = self._calculate_likelihoods(dataset, sample_weight)
 
     def _calculate_prior_probabilities(
-        self, dataset: pd.DataFrame
+        self, dataset: pd.DataFrame, sample_weight: np.ndarray = None
     ) -> NaiveBayesPriorProbabilities:
         """
         Calculate the prior probability for each class.
@@ -53,6 +82,7 @@ class NaiveBayes:
 
         Parameters:
         dataset (pd.DataFrame): The training dataset
+        sample_weight (np.ndarray), default None: The weight of every row of the dataset. If set to None, every row has weight 1.
 
         Returns:
         NaiveBayesPriorProbabilities: The prior probabilities for each class
@@ -63,9 +93,15 @@ class NaiveBayes:
 
         # TODO
         prior_probs = NaiveBayesPriorProbabilities()
-        total_rows = len(dataset)
-
-        class_counts = dataset[self.target_attribute].value_counts()
+        if sample_weight is None:
+            total_rows = len(dataset)
+            class_counts = dataset[self.target_attribute].value_counts()
+        else:
+            # The total weight of the rows of every class
+            total_rows = sample_weight.sum()
+            class_counts = pd.Series(sample_weight).groupby(
+                dataset[self.target_attribute].to_numpy()
+            ).sum()
 
         for class_label, count in class_counts.items():
             probability = count / total_rows
@@ -73,13 +109,16 @@ class NaiveBayes:
 
         return prior_probs
 
-    def _calculate_likelihoods(self, dataset: pd.DataFrame) -> NaiveBayesLikelihoods:
+    def _calculate_likelihoods(
+        self, dataset: pd.DataFrame, sample_weight: np.ndarray = None
+    ) -> NaiveBayesLikelihoods:
         """
         Calculate the likelihoods for each attribute and class.
         (The target attribute has to be set before calling this method.)
 
         Parameters:
         dataset (pd.DataFrame): The training dataset
+        sample_weight (np.ndarray), default None: The weight of every row of the dataset. If set to None, every row has weight 1.
 
         Returns:
         NaiveBayesLikelihoods: The likelihoods for each attribute and class
@@ -101,7 +140,9 @@ class NaiveBayes:
 
         for attribute in feature_attributes:
             for class_label in class_labels_to_use:
-                subset_data = dataset[dataset[self.target_attribute] == class_label]
+                in_class = (dataset[self.target_attribute] == class_label).to_numpy()
+                subset_data = dataset[in_class]
+                subset_weights = None if sample_weight is None else sample_weight[in_class]
 
                 if subset_data.empty:
                     if pd.api.types.is_numeric_dtype(dataset[attribute]):
@@ -113,31 +154,127 @@ class NaiveBayes:
                         continue
 
                 if pd.api.types.is_numeric_dtype(dataset[attribute]):
-                    mean = subset_data[attribute].mean()
-                    std = subset_data[attribute].std()
+                    if subset_weights is None:
+                        mean = subset_data[attribute].mean()
+                        std = subset_data[attribute].std()
+                    else:
+                        mean, std = self._calculate_weighted_mean_and_std(
+                            subset_data[attribute].to_numpy(dtype=float), subset_weights
+                        )
 
                     if std == 0:
                         std = 1e-6
 
                     likelihoods.add_continuous_likelihood(attribute, class_label, mean, std)
                 else:
-                    total_class_instances = len(subset_data)
+                    total_class_instances = (
+                        len(subset_data) if subset_weights is None else subset_weights.sum()
+                    )
                     all_unique_values_for_attribute_in_dataset = dataset[attribute].unique()
 
                     for value_candidate in all_unique_values_for_attribute_in_dataset:
-                        count = subset_data[attribute].eq(value_candidate).sum()
+                        is_value = subset_data[attribute].eq(value_candidate)
+                        if subset_weights is None:
+                            count = is_value.sum()
+                        else:
+                            count = subset_weights[is_value.to_numpy()].sum()
                         likelihood = count / total_class_instances
 
                         likelihoods.add_categorical_likelihood(attribute, value_candidate, class_label, likelihood)
 
         return likelihoods
 
-    def predict(self, dataset: pd.DataFrame) -> List[str | int | float]:
+    def _fit_arrow(self, table: "pyarrow.Table", sample_weight: np.ndarray = None):
+        """
+        Calculate the class labels, the prior probabilities and the likelihoods of a pyarrow Table.
+        The class counts are bincounts of the class codes and category codes of the columns, instead of filtering the dataset for every class.
+        As in a pandas DataFrame, numeric and boolean attributes are continuous and all other attributes categorical.
+        (The target attribute has to be set before calling this method.)
+
+        Parameters:
+        table (pyarrow.Table): The training dataset
+        sample_weight (np.ndarray), default None: The weight of every row of the dataset. If set to None, every row has weight 1.
+        """
+        class_codes, class_labels = arrow_data.get_class_codes(table, self.target_attribute)
+        n_classes = len(class_labels)
+        weights = np.ones(len(class_codes)) if sample_weight is None else sample_weight
+        class_weights = np.bincount(class_codes, weights=weights, minlength=n_classes)
+
+        self.class_labels = set(class_labels)
+        self.prior_probabilities = NaiveBayesPriorProbabilities()
+        for class_code, class_label in enumerate(class_labels):
+            self.prior_probabilities.add_prior_probability(
+                class_label, class_weights[class_code] / class_weights.sum()
+            )
+
+        self.likelihoods = NaiveBayesLikelihoods()
+        for attribute in table.column_names:
+            if attribute == self.target_attribute:
+                continue
+
+            if arrow_data.get_attribute_type(table, attribute) == "categorical":
+                codes, categories = arrow_data.get_category_codes(table, attribute)
+                n_categories = len(categories)
+                counts = np.bincount(
+                    class_codes * n_categories + codes,
+                    weights=weights,
+                    minlength=n_classes * n_categories,
+                ).reshape(n_classes, n_categories)
+
+                # Only the values that occur get likelihoods (a dictionary can hold unused values)
+                for category in np.flatnonzero(counts.any(axis=0)):
+                    for class_code, class_label in enumerate(class_labels):
+                        likelihood = counts[class_code, category] / class_weights[class_code]
+                        self.likelihoods.add_categorical_likelihood(
+                            attribute, categories[category], class_label, likelihood
+                        )
+            else:
+                values = arrow_data.get_numeric_column(table, attribute)
+                for class_code, class_label in enumerate(class_labels):
+                    in_class = class_codes == class_code
+                    mean, std = self._calculate_weighted_mean_and_std(values[in_class], weights[in_class])
+
+                    if std == 0:
+                        std = 1e-6
+
+                    self.likelihoods.add_continuous_likelihood(attribute, class_label, mean, std)
+
+    @staticmethod
+    def _calculate_weighted_mean_and_std(values: np.ndarray, weights: np.ndarray) -> Tuple[float, float]:
+        """
+        Calculate the mean and the (sample) standard deviation of weighted values, ignoring missing values.
+        The weights are frequencies, so a value with integer weight k counts like k copies of the value
+        (the same as pandas' mean and std of the repeated values).
+
+        Parameters:
+        values (np.ndarray): The values
+        weights (np.ndarray): The weight of every value
+
+        Returns:
+        float: The weighted mean (NaN if there is no value)
+        float: The weighted standard deviation (NaN if the total weight is at most 1)
+        """
+        present = ~np.isnan(values)
+        values = values[present]
+        weights = weights[present]
+
+        total_weight = weights.sum()
+        if total_weight == 0:
+            return float("nan"), float("nan")
+
+        mean = (weights * values).sum() / total_weight
+        if total_weight <= 1:
+            return mean, float("nan")
+
+        std = math.sqrt((weights * (values - mean) ** 2).sum() / (total_weight - 1))
+        return mean, std
+
+    def predict(self, dataset: pd.DataFrame | object) -> List[str | int | float]:
         """
         Predict the target attribute for a given dataset.
 
         Parameters:
-        dataset (pd.DataFrame): The dataset to predict the target attribute for
+        dataset (pd.DataFrame | object): The dataset to predict the target attribute for, a pandas DataFrame, a pyarrow Table or RecordBatch or a Polars DataFrame. The columns of Arrow data are read directly from their buffers (see arrow_data.get_values).
 
         Returns:
         List[str | int | float]: A list of predicted class labels
@@ -152,6 +289,11 @@ class NaiveBayes:
             raise ValueError("Class labels not set. Model not trained correctly.")
 
         predictions = []
+        if arrow_data.is_arrow_data(dataset):
+            for row in arrow_data.iterate_rows(arrow_data.to_arrow_table(dataset)):
+                predictions.append(self._predict_tuple(row))
+            return predictions
+
         for index, row in dataset.iterrows():
             predictions.append(self._predict_tuple(row))
         return predictions
@@ -161,7 +303,7 @@ class NaiveBayes:
         Predict the target attribute for a given row in the dataset.
 
         Parameters:
-        tuple (pd.Series): The row in the dataset to predict the target attribute for
+        tuple (pd.Series): The row in the dataset to predict the target attribute for (or a dictionary of the values of the row)
 
         Returns:
         str | int | float: The predicted class label
@@ -170,7 +312,7 @@ class NaiveBayes:
         max_log_posterior_prob = -float('inf')
         predicted_class = None
 
-        feature_attributes = [col for col in tuple.index if col != self.target_attribute]
+        feature_attributes = [col for col in tuple.keys() if col != self.target_attribute]
 
         for class_label in self.class_labels:
             try:
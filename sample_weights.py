@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+from typing import Tuple
+
+import arrow_data
+
+"""
+Collection of functions to check sample weights and to compress the duplicate rows of a dataset into weighted rows.
+"""
+
+
+def check_sample_weight(sample_weight: np.ndarray, n_rows: int) -> np.ndarray:
+    """
+    Check the sample weights of a dataset and convert them into a NumPy array.
+
+    Parameters:
+    sample_weight (np.ndarray): The weight of every row (any array-like), or None if every row has weight 1
+    n_rows (int): The number of rows of the dataset
+
+    Returns:
+    np.ndarray: The weight of every row as a float array (None if sample_weight is None)
+    """
+    if sample_weight is None:
+        return None
+
+    sample_weight = np.asarray(sample_weight, dtype=np.float64)
+    if sample_weight.shape != (n_rows,):
+        raise ValueError(
+            f"sample_weight has to hold one weight per row ({n_rows}), got shape {sample_weight.shape}."
+        )
+    if not np.all(np.isfinite(sample_weight)) or np.any(sample_weight < 0):
+        raise ValueError("sample_weight has to be finite and non-negative.")
+    if n_rows > 0 and not sample_weight.any():
+        raise ValueError("sample_weight has to contain at least one positive weight.")
+
+    return sample_weight
+
+
+def remove_zero_weight_rows(
+    dataset: pd.DataFrame | object, sample_weight: np.ndarray = None
+) -> Tuple[pd.DataFrame | object, np.ndarray]:
+    """
+    Remove the rows with weight 0, so that a row with weight 0 is the same as a row that is not in the dataset at all
+    (it neither adds a value to split on nor a candidate threshold).
+
+    Parameters:
+    dataset (pd.DataFrame | object): The dataset (a pandas DataFrame or a pyarrow Table)
+    sample_weight (np.ndarray), default None: The weight of every row (see check_sample_weight). If set to None, every row has weight 1.
+
+    Returns:
+    pd.DataFrame | object: The rows with a positive weight
+    np.ndarray: The weights of these rows (None if sample_weight is None)
+    """
+    if sample_weight is None or sample_weight.all():
+        return dataset, sample_weight
+
+    positive = sample_weight > 0
+    if arrow_data.is_arrow_data(dataset):
+        return arrow_data.remove_rows(dataset, positive), sample_weight[positive]
+    return dataset[positive], sample_weight[positive]
+
+
+def compress_duplicate_rows(
+    dataset: pd.DataFrame | object, sample_weight: np.ndarray = None
+) -> Tuple[pd.DataFrame | object, np.ndarray]:
+    """
+    Collapse identical rows of a dataset into one row weighted by the number (or the total weight) of its copies.
+    Missing values are compared like any other value. The rows keep the order of their first appearance.
+
+    Parameters:
+    dataset (pd.DataFrame | object): The dataset to compress (a pandas DataFrame or a pyarrow Table, see arrow_data.compress_duplicate_rows)
+    sample_weight (np.ndarray), default None: The weight of every row (see check_sample_weight). If set to None, every row has weight 1.
+
+    Returns:
+    pd.DataFrame | object: The distinct rows of the dataset (with a new index)
+    np.ndarray: The weight of every distinct row (integer counts if sample_weight is None)
+    """
+    if arrow_data.is_arrow_data(dataset):
+        return arrow_data.compress_duplicate_rows(dataset, sample_weight)
+
+    # The number of the distinct row every row is a copy of, in the order of first appearance
+    row_ids = dataset.groupby(
+        list(dataset.columns), sort=False, dropna=False, observed=True
+    ).ngroup().to_numpy()
+
+    # The first copy of every distinct row
+    _, first_rows = np.unique(row_ids, return_index=True)
+    distinct_rows = dataset.iloc[first_rows]
+    weights = np.bincount(row_ids, weights=sample_weight, minlength=len(distinct_rows))
+
+    return distinct_rows.reset_index(drop=True), weights
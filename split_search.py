@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+from typing import Callable, List, Tuple
+
+from classes.decision_tree_encoded_dataset import DecisionTreeEncodedDataset
+
+"""
+Collection of functions to generate the candidate splits of attributes, shared by the attribute selection methods
+(see information_gain and gini_index). The candidate splits are contingency tables, which the functions ending in
+_from_counts of the attribute selection methods score all at once.
+"""
+
+
+def get_threshold_contingency_tables(below_equal_counts: np.ndarray, total_counts: np.ndarray) -> np.ndarray:
+    """
+    Get the contingency tables of candidate thresholds of a continuous attribute.
+
+    Parameters:
+    below_equal_counts (np.ndarray): A matrix with the class counts below or equal to every candidate threshold (one row per candidate)
+    total_counts (np.ndarray): The class counts of all rows
+
+    Returns:
+    np.ndarray: One contingency table (below or equal, above) x classes per candidate threshold
+    """
+    return np.stack([below_equal_counts, total_counts - below_equal_counts], axis=1)
+
+
+def score_all_attributes(
+    dataset: pd.DataFrame,
+    target_attribute: str,
+    attributes: List[str],
+    split_finder: str,
+    max_bins: int,
+    score_name: str,
+    score_from_counts: Callable[[np.ndarray, np.ndarray], np.ndarray],
+    split_values: Callable[[np.ndarray, np.ndarray, np.ndarray], Tuple[float, object]],
+) -> pd.DataFrame:
+    """
+    Calculate the best score and split of every attribute of a dataset in one call.
+
+    The target attribute is encoded once and the class counts of every attribute are collected in a single pass over its values:
+    - A discrete-valued attribute is split by split_values, from the class counts of the values that occur.
+    - A continuous attribute is split at the best threshold, all candidate thresholds are scored at once with score_from_counts.
+    Rows with a missing value are in no partition. Their class counts are passed on as well, since they count in the score before partitioning.
+
+    Parameters:
+    dataset (pd.DataFrame): The dataset to score the attributes of
+    target_attribute (str): The target attribute used as the class label
+    attributes (List[str]): The attributes to score. If set to None, all attributes except the target attribute are scored.
+    split_finder (str): How to find the thresholds of continuous attributes, either "exact" (all midpoints between distinct values) or "histogram" (the thresholds of at most max_bins bins)
+    max_bins (int): The maximum number of bins per continuous attribute (only used with the "histogram" split finder)
+    score_name (str): The name of the score column (e.g. "gini_index")
+    score_from_counts (Callable[[np.ndarray, np.ndarray], np.ndarray]): The score of every contingency table, given the contingency tables and the class counts of the rows with a missing value (e.g. gini_index.calculate_gini_index_from_counts)
+    split_values (Callable[[np.ndarray, np.ndarray, np.ndarray], Tuple[float, object]]): The best score and split of a discrete-valued attribute, given the class counts of its (at least two) occurring values, these values and the class counts of the rows with a missing value
+
+    Returns:
+    pd.DataFrame: The best score (score_name) and split ("split") of every attribute (one row per attribute).
+    The split is the split of split_values or the threshold (float) of a continuous attribute. It is None if the attribute can not be split.
+    """
+    if attributes is None:
+        attributes = [attribute for attribute in dataset.columns if attribute != target_attribute]
+    if split_finder not in ["exact", "histogram"]:
+        raise ValueError(
+            f"Split finder '{split_finder}' not valid (select either 'exact' or 'histogram')."
+        )
+
+    # Encode the target attribute (and every attribute) only once
+    data = DecisionTreeEncodedDataset.from_dataframe(dataset, attributes, target_attribute)
+    if split_finder == "histogram":
+        data.bin_continuous_attributes(max_bins)
+    rows = np.arange(len(data))
+
+    scores = []
+    splits = []
+    for attribute in attributes:
+        if data.is_categorical(attribute):
+            # Only the values that occur (a pandas Categorical can have unused categories), missing values are no value
+            counts = data.get_class_counts(rows, attribute)
+            occurring = counts.any(axis=1)
+            missing_code = data.get_missing_code(attribute)
+            missing_counts = np.zeros(data.get_n_classes(), dtype=counts.dtype)
+            if missing_code is not None:
+                missing_counts = counts[missing_code]
+                occurring[missing_code] = False
+            if np.count_nonzero(occurring) <= 1:
+                scores.append(0.0)
+                splits.append(None)
+                continue
+
+            score, split = split_values(
+                counts[occurring], data.get_categories(attribute)[occurring], missing_counts
+            )
+            scores.append(float(score))
+            splits.append(split)
+        else:
+            thresholds, below_equal_counts, total_counts = data.get_threshold_class_counts(
+                attribute, binned=split_finder == "histogram"
+            )
+            if len(thresholds) == 0:
+                scores.append(0.0)
+                splits.append(None)
+                continue
+
+            missing_counts = data.get_class_counts(rows[np.isnan(data.get_column(attribute))])
+            threshold_scores = score_from_counts(
+                get_threshold_contingency_tables(below_equal_counts, total_counts), missing_counts
+            )
+            best_index = np.argmax(threshold_scores)
+            scores.append(float(threshold_scores[best_index]))
+            splits.append(float(thresholds[best_index]))
+
+    # The splits are kept as objects (a float column would turn None into NaN)
+    index = pd.Index(attributes, name="attribute")
+    return pd.DataFrame(
+        {score_name: scores, "split": pd.Series(splits, index=index, dtype=object)}, index=index
+    )
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+import arrow_data
+
+pa = pytest.importorskip("pyarrow")
+
+
+#####
+# Tests with dictionary-encoded and plain columns
+#####
+
+
+def test_dictionary_encoded_column():
+    """
+    Test that a dictionary-encoded column keeps its indices as category codes without a copy.
+    """
+    table = pa.table({"Topic": pa.array(["Clustering", "Classification", "Clustering"]).dictionary_encode()})
+
+    # Get the category codes
+    codes, categories = arrow_data.get_category_codes(table, "Topic")
+
+    # Check that the codes are the indices of the column
+    assert np.array_equal(codes, [0, 1, 0])
+    assert list(categories) == ["Clustering", "Classification"]
+    assert np.shares_memory(codes, table.column("Topic").chunk(0).indices.to_numpy())
+
+
+def test_chunked_column_with_missing_values():
+    """
+    Test that the chunks of a column share the same categories (in the order of appearance)
+    and that missing values get their own code after the categories.
+    """
+    table = pa.Table.from_batches(
+        [
+            pa.record_batch({"Topic": ["Clustering", None]}),
+            pa.record_batch({"Topic": ["Classification", "Clustering"]}),
+        ]
+    )
+
+    # Get the category codes
+    codes, categories = arrow_data.get_category_codes(table, "Topic")
+
+    # Check the codes and categories
+    assert np.array_equal(codes, [0, 2, 1, 0])
+    assert list(categories[:2]) == ["Clustering", "Classification"]
+    assert np.isnan(categories[2])
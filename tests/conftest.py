@@ -1,7 +1,23 @@
 import pytest
 
+import numpy as np
 import pandas as pd
 
+from decision_tree import DecisionTree
+
+from classes.decision_tree_leaf_node import DecisionTreeLeafNode
+from classes.decision_tree_internal_node import DecisionTreeInternalNode
+from classes.decision_tree_branch import DecisionTreeBranch
+from classes.decision_tree_decision_outcome_above import (
+    DecisionTreeDecisionOutcomeAbove,
+)
+from classes.decision_tree_decision_outcome_below_equal import (
+    DecisionTreeDecisionOutcomeBelowEqual,
+)
+from classes.decision_tree_decision_outcome_equals import (
+    DecisionTreeDecisionOutcomeEquals,
+)
+
 
 @pytest.fixture
 def small_student_dataset():
@@ -76,3 +92,58 @@ def small_submission_dataset():
     )
 
     return dataset
+
+
+@pytest.fixture
+def pruning_decision_tree():
+    """
+    Create a DecisionTree object with a decision tree inspired by the small student dataset,
+    including the class counts of 10 training rows (to test pruning).
+
+    Tree structure (class counts [No, Yes]):
+    Participation [4, 6]
+    ├── High: Yes [0, 5]
+    ├── Medium: Age [1, 1]
+    │   ├── <= 25: Yes [0, 1]
+    │   └── > 25: No [1, 0]
+    └── Low: No [3, 0]
+    """
+    decision_tree = DecisionTree()
+    decision_tree.class_labels = np.array(["No", "Yes"])
+    decision_tree.tree = DecisionTreeInternalNode(
+        attribute_label="Participation",
+        branches=[
+            DecisionTreeBranch(
+                label=DecisionTreeDecisionOutcomeEquals(value="High"),
+                branch_node=DecisionTreeLeafNode(class_label="Yes", class_counts=np.array([0, 5])),
+            ),
+            DecisionTreeBranch(
+                label=DecisionTreeDecisionOutcomeEquals(value="Medium"),
+                branch_node=DecisionTreeInternalNode(
+                    attribute_label="Age",
+                    branches=[
+                        DecisionTreeBranch(
+                            label=DecisionTreeDecisionOutcomeBelowEqual(value=25),
+                            branch_node=DecisionTreeLeafNode(
+                                class_label="Yes", class_counts=np.array([0, 1])
+                            ),
+                        ),
+                        DecisionTreeBranch(
+                            label=DecisionTreeDecisionOutcomeAbove(value=25),
+                            branch_node=DecisionTreeLeafNode(
+                                class_label="No", class_counts=np.array([1, 0])
+                            ),
+                        ),
+                    ],
+                    class_counts=np.array([1, 1]),
+                ),
+            ),
+            DecisionTreeBranch(
+                label=DecisionTreeDecisionOutcomeEquals(value="Low"),
+                branch_node=DecisionTreeLeafNode(class_label="No", class_counts=np.array([3, 0])),
+            ),
+        ],
+        class_counts=np.array([4, 6]),
+    )
+
+    return decision_tree
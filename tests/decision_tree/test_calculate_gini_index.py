@@ -1,5 +1,10 @@
+import itertools
+
+import numpy as np
+import pandas as pd
 import pytest
 
+import gini_index
 from decision_tree import DecisionTree
 
 from classes.decision_tree_decision_outcome_above import (
@@ -101,4 +106,144 @@ def test_with_small_student_dataset_attribute_participation(small_student_datase
     )
 
 
+#####
+# Test with a random dataset (evaluating all splits)
+#####
+
+
+def test_with_random_dataset_and_all_splits():
+    """
+    Test a discrete-valued attribute with 8 distinct values and three classes. The best split has to be as good as
+    the best of all splits evaluated one after another with gini_index.calculate_gini_index.
+    """
+    # Create the dataset
+    rng = np.random.default_rng(11)
+    courses = [f"Course {index}" for index in range(8)]
+    dataset = pd.DataFrame(
+        {
+            "Course": rng.choice(courses, size=200),
+            "Grade": rng.choice(["A", "B", "C"], size=200),
+        }
+    )
+
+    # Create a DecisionTree object
+    decision_tree = DecisionTree()
+
+    # Set the target attribute
+    decision_tree.target_attribute = "Grade"
+
+    # Calculate the gini index
+    gini_index_value, outcomes = decision_tree._calculate_gini_index(
+        data=dataset, attribute="Course"
+    )
+
+    # Evaluate all splits one after another
+    gini_index_values = [
+        gini_index.calculate_gini_index(dataset, "Grade", "Course", set(combination))
+        for size in range(1, 5)
+        for combination in itertools.combinations(courses, size)
+    ]
+
+    # Check if the best split was found
+    assert gini_index_value == pytest.approx(max(gini_index_values))
+    assert gini_index.calculate_gini_index(
+        dataset, "Grade", "Course", set(outcomes[0].value)
+    ) == pytest.approx(max(gini_index_values))
+
+
+#####
+# Tests with many distinct values (ordering search instead of evaluating all splits)
+#####
+
+
+def test_ordering_search_with_binary_target_attribute():
+    """
+    Test a discrete-valued attribute with 12 distinct values (more than max_exhaustive_categories) and a binary
+    target attribute. Ordering the values by their class proportion has to find the same best split as
+    evaluating all 2^11 splits.
+    """
+    # Create the dataset
+    rng = np.random.default_rng(9)
+    dataset = pd.DataFrame(
+        {
+            "Course": rng.choice([f"Course {index}" for index in range(12)], size=300),
+            "Passed": rng.choice(["Yes", "No"], size=300),
+        }
+    )
+
+    # Create a DecisionTree object that orders the values
+    decision_tree = DecisionTree()
+    decision_tree.target_attribute = "Passed"
+    decision_tree.max_exhaustive_categories = 10
+
+    # Create a DecisionTree object that evaluates all splits
+    exhaustive_decision_tree = DecisionTree()
+    exhaustive_decision_tree.target_attribute = "Passed"
+    exhaustive_decision_tree.max_exhaustive_categories = 12
+
+    # Calculate the gini index with both DecisionTree objects
+    gini_index_value, outcomes = decision_tree._calculate_gini_index(
+        data=dataset, attribute="Course"
+    )
+    exhaustive_gini_index_value, exhaustive_outcomes = (
+        exhaustive_decision_tree._calculate_gini_index(data=dataset, attribute="Course")
+    )
+
+    # Check if both found the same split
+    assert gini_index_value == pytest.approx(exhaustive_gini_index_value)
+    assert {frozenset(outcome.value) for outcome in outcomes} == {
+        frozenset(outcome.value) for outcome in exhaustive_outcomes
+    }
+
+
+def test_ordering_search_with_many_values_and_three_classes():
+    """
+    Test a discrete-valued attribute with 25 distinct values and three classes (2^24 splits could not be evaluated
+    in a reasonable time). The ordering search has to split the values into two groups that cover all values.
+    """
+    # Create the dataset
+    rng = np.random.default_rng(10)
+    courses = [f"Course {index}" for index in range(25)]
+    dataset = pd.DataFrame(
+        {
+            "Course": rng.choice(courses, size=500),
+            "Grade": rng.choice(["A", "B", "C"], size=500),
+        }
+    )
+
+    # Create a DecisionTree object
+    decision_tree = DecisionTree()
+
+    # Set the target attribute
+    decision_tree.target_attribute = "Grade"
+
+    # Calculate the gini index
+    gini_index_value, outcomes = decision_tree._calculate_gini_index(
+        data=dataset, attribute="Course"
+    )
+
+    # Check if the values are split into two groups
+    assert gini_index_value > 0
+    assert len(outcomes) == 2
+    assert sorted(outcomes[0].value + outcomes[1].value) == sorted(courses)
+
+
 # There is no full recursive test for gini_index, as the tree can be built in too many different ways (since the gini index is often exactly the same for multiple attributes/splits)
+
+
+@pytest.mark.parametrize("max_exhaustive_categories", [-1, 21])
+def test_invalid_max_exhaustive_categories(small_student_dataset, max_exhaustive_categories):
+    """
+    Test that a max_exhaustive_categories below 0 or above gini_index.MAX_EXHAUSTIVE_CATEGORIES (20) raises a ValueError.
+    """
+    # Create a DecisionTree object
+    decision_tree = DecisionTree()
+
+    # Check that fitting with the invalid number of values raises a ValueError
+    with pytest.raises(ValueError):
+        decision_tree.fit(
+            dataset=small_student_dataset,
+            target_attribute="Passed",
+            attribute_selection_method="gini_index",
+            max_exhaustive_categories=max_exhaustive_categories,
+        )
@@ -0,0 +1,174 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from decision_tree import DecisionTree
+
+from classes.decision_tree_compiled_tree import DecisionTreeCompiledTree
+from classes.decision_tree_leaf_node import DecisionTreeLeafNode
+from classes.decision_tree_internal_node import DecisionTreeInternalNode
+from classes.decision_tree_branch import DecisionTreeBranch
+from classes.decision_tree_decision_outcome_above import (
+    DecisionTreeDecisionOutcomeAbove,
+)
+from classes.decision_tree_decision_outcome_below_equal import (
+    DecisionTreeDecisionOutcomeBelowEqual,
+)
+from classes.decision_tree_decision_outcome_equals import (
+    DecisionTreeDecisionOutcomeEquals,
+)
+from classes.decision_tree_decision_outcome_in_list import (
+    DecisionTreeDecisionOutcomeInList,
+)
+
+#####
+# Tests with a decision tree inspired by the small student dataset
+# Tree structure:
+# Participation
+# ├── High: Yes
+# ├── {Medium, Unknown}: Age
+# │   ├── <= 25: Yes
+# │   └── > 25: No
+# └── Low: No
+#####
+
+
+@pytest.fixture
+def decision_tree():
+    """
+    Create a DecisionTree object with a decision tree inspired by the small student dataset.
+    """
+    decision_tree = DecisionTree()
+    decision_tree.tree = DecisionTreeInternalNode(
+        attribute_label="Participation",
+        branches=[
+            DecisionTreeBranch(
+                label=DecisionTreeDecisionOutcomeEquals(value="High"),
+                branch_node=DecisionTreeLeafNode(class_label="Yes"),
+            ),
+            DecisionTreeBranch(
+                label=DecisionTreeDecisionOutcomeInList(values=["Medium", "Unknown"]),
+                branch_node=DecisionTreeInternalNode(
+                    attribute_label="Age",
+                    branches=[
+                        DecisionTreeBranch(
+                            label=DecisionTreeDecisionOutcomeAbove(value=25),
+                            branch_node=DecisionTreeLeafNode(class_label="No"),
+                        ),
+                        DecisionTreeBranch(
+                            label=DecisionTreeDecisionOutcomeBelowEqual(value=25),
+                            branch_node=DecisionTreeLeafNode(class_label="Yes"),
+                        ),
+                    ],
+                ),
+            ),
+            DecisionTreeBranch(
+                label=DecisionTreeDecisionOutcomeEquals(value="Low"),
+                branch_node=DecisionTreeLeafNode(class_label="No"),
+            ),
+        ],
+    )
+
+    return decision_tree
+
+
+def test_flattened_arrays(decision_tree):
+    """
+    Test that compile() flattens the tree into arrays in breadth-first order.
+    """
+    # Compile the tree
+    compiled_tree = decision_tree.compile()
+
+    # Check the nodes: the root, its three children and the two children of "Age"
+    assert compiled_tree.get_n_nodes() == 6
+    assert compiled_tree.attributes == ["Participation", "Age"]
+    assert list(compiled_tree.kinds) == [
+        DecisionTreeCompiledTree.CATEGORICAL,
+        DecisionTreeCompiledTree.LEAF,
+        DecisionTreeCompiledTree.THRESHOLD,
+        DecisionTreeCompiledTree.LEAF,
+        DecisionTreeCompiledTree.LEAF,
+        DecisionTreeCompiledTree.LEAF,
+    ]
+
+    # Check that the children of "Age" are in the order below or equal / above, whatever the order of the branches
+    assert compiled_tree.thresholds[2] == 25
+    assert list(compiled_tree.children[2]) == [5, 4]
+
+    # Check that both values of the list lead to the same child
+    assert compiled_tree.vocabularies["Participation"] == {"High": 0, "Medium": 1, "Unknown": 2, "Low": 3}
+    assert list(compiled_tree.category_children[0]) == [1, 2, 2, 3, -1]
+
+
+def test_predict(decision_tree):
+    """
+    Test that predict() with the compiled tree gives the same labels as without.
+    """
+    # Create the tuples to predict (pandas DataFrame)
+    tuples_to_predict = pd.DataFrame(
+        {
+            "Age": [20, 30, 40, 25],
+            "Major": ["CS", "DS", "DS", "CS"],
+            "Participation": ["High", "Medium", "Low", "Unknown"],
+        }
+    )
+
+    # Predict the tuples without and with the compiled tree
+    predictions = decision_tree.predict(dataset=tuples_to_predict)
+    decision_tree.compile()
+    compiled_predictions = decision_tree.predict(dataset=tuples_to_predict)
+
+    # Check if the predictions are correct
+    assert predictions == ["Yes", "No", "No", "Yes"]
+    assert compiled_predictions == predictions
+
+
+def test_predict_without_matching_branch(decision_tree):
+    """
+    Test that a value without a matching branch raises a ValueError, like without the compiled tree.
+    """
+    decision_tree.compile()
+
+    # Check that the unknown participation raises a ValueError
+    with pytest.raises(ValueError, match="'None' of attribute 'Participation'"):
+        decision_tree.predict(
+            pd.DataFrame({"Age": [20, 30], "Participation": ["High", "None"]})
+        )
+
+
+#####
+# Tests with fitted decision trees
+#####
+
+
+@pytest.mark.parametrize("attribute_selection_method", ["information_gain", "gini_index"])
+def test_with_fitted_tree(attribute_selection_method):
+    """
+    Test that the compiled tree predicts the same labels as the tree on a random dataset with continuous,
+    discrete-valued and boolean attributes, and that replacing the tree stops using the compiled tree.
+    """
+    rng = np.random.default_rng(0)
+    dataset = pd.DataFrame(
+        {
+            "Hours": rng.integers(0, 30, 500).astype(float),
+            "Topic": rng.choice(["Classification", "Clustering", "Regression", "Rules"], 500),
+            "Late": rng.random(500) < 0.3,
+            "Passed": rng.choice(["Yes", "No"], 500),
+        }
+    )
+
+    # Fit the decision tree
+    decision_tree = DecisionTree()
+    decision_tree.fit(dataset, "Passed", attribute_selection_method)
+    predictions = decision_tree.predict(dataset)
+
+    # Check that the compiled tree predicts the same labels
+    decision_tree.compile()
+    assert decision_tree.predict(dataset) == predictions
+
+    # Check that a pruned tree is not predicted with the compiled tree of the unpruned tree
+    pruned_decision_tree = decision_tree.prune(alpha=0.01)
+    assert pruned_decision_tree.predict(dataset) == [
+        pruned_decision_tree._predict_tuple(row, pruned_decision_tree.tree)
+        for _, row in dataset.iterrows()
+    ]
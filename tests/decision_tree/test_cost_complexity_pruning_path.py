@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from decision_tree import DecisionTree
+
+#####
+# Tests with a decision tree inspired by the small student dataset (see the pruning_decision_tree fixture)
+#####
+
+
+def test_with_decision_tree_inspired_by_small_student_dataset(pruning_decision_tree):
+    """
+    Test cost_complexity_pruning_path() with a decision tree inspired by the small student dataset.
+    Pruning the "Age" node costs one error for one leaf less (alpha 0.1), pruning the root node then costs
+    three more errors for two leaves less (alpha 0.15).
+    """
+    # Compute the pruning path
+    path = pruning_decision_tree.cost_complexity_pruning_path()
+
+    # Check if the pruning path is correct
+    assert path["alpha"].tolist() == pytest.approx([0.0, 0.1, 0.15])
+    assert path["n_leaves"].tolist() == [4, 3, 1]
+    assert path["error_rate"].tolist() == pytest.approx([0.0, 0.1, 0.4])
+
+
+def test_with_unfitted_decision_tree():
+    """
+    Test that an error is raised if the decision tree is not fitted.
+    """
+    # Create a DecisionTree object
+    decision_tree = DecisionTree()
+
+    # Check that computing the pruning path raises an error
+    with pytest.raises(ValueError):
+        decision_tree.cost_complexity_pruning_path()
+
+
+#####
+# Test with a random dataset
+#####
+
+
+def test_with_random_dataset():
+    """
+    Test cost_complexity_pruning_path() with a fitted decision tree on a random dataset. The sequence has to
+    start with the (unpruned) tree at alpha 0 and end with the root node as a single leaf, with increasing alphas
+    and decreasing numbers of leaves.
+    """
+    # Create the dataset
+    rng = np.random.default_rng(7)
+    dataset = pd.DataFrame(
+        {
+            "Hours": rng.normal(20, 5, size=200).round(1),
+            "Topic": rng.choice(["Classification", "Clustering", "Regression"], size=200),
+            "Passed": rng.choice(["Yes", "No"], size=200),
+        }
+    )
+
+    # Fit the decision tree
+    decision_tree = DecisionTree()
+    decision_tree.fit(
+        dataset=dataset, target_attribute="Passed", attribute_selection_method="gini_index"
+    )
+
+    # Compute the pruning path
+    path = decision_tree.cost_complexity_pruning_path()
+
+    # Check the training error rates of the first and the last subtree
+    predictions = decision_tree.predict(dataset)
+    assert path["alpha"].iloc[0] == 0.0
+    assert path["error_rate"].iloc[0] == pytest.approx(np.mean(predictions != dataset["Passed"]))
+    assert path["n_leaves"].iloc[-1] == 1
+    assert path["error_rate"].iloc[-1] == pytest.approx(
+        1 - dataset["Passed"].value_counts().max() / len(dataset)
+    )
+
+    # Check that the alphas increase and the numbers of leaves decrease
+    assert np.all(np.diff(path["alpha"]) > 0)
+    assert np.all(np.diff(path["n_leaves"]) < 0)
@@ -1,3 +1,6 @@
+import pandas as pd
+import pytest
+
 from decision_tree import DecisionTree
 
 from classes.decision_tree_decision_outcome_above import (
@@ -117,3 +120,59 @@ def test_with_small_student_dataset_participation_medium_and_information_gain(
     assert len(outcomes) == 2
     assert DecisionTreeDecisionOutcomeAbove(value=25.0) in outcomes
     assert DecisionTreeDecisionOutcomeBelowEqual(value=25.0) in outcomes
+
+
+#####
+# Tests of skipping attributes that can not beat the best split (branch and bound)
+#####
+
+
+@pytest.mark.parametrize("attribute_selection_method", ["information_gain", "gini_index"])
+def test_skipping_after_perfect_split(attribute_selection_method):
+    """
+    Test with a dataset where the second attribute splits the classes perfectly. Once it is evaluated, no other attribute can
+    beat it, so the remaining attributes are skipped. Of two perfect attributes, the first one in the attribute list wins.
+    """
+    # Create the dataset
+    dataset = pd.DataFrame(
+        {
+            "Noise": ["a", "b", "a", "b", "a", "b"],
+            "Perfect": ["x", "x", "x", "y", "y", "y"],
+            "Also Perfect": ["u", "u", "u", "v", "v", "v"],
+            "Constant": ["c", "c", "c", "c", "c", "c"],
+            "Class": ["A", "A", "A", "B", "B", "B"],
+        }
+    )
+
+    # Create a DecisionTree object
+    decision_tree = DecisionTree()
+
+    # Set the target attribute
+    decision_tree.target_attribute = "Class"
+
+    # Find the best split
+    split_attribute, _ = decision_tree._find_best_split(
+        data=dataset,
+        attribute_list=["Noise", "Perfect", "Also Perfect", "Constant"],
+        attribute_selection_method=attribute_selection_method,
+    )
+
+    # Check if the first perfect attribute is chosen and evaluations were skipped
+    assert split_attribute == "Perfect"
+    assert decision_tree.n_skipped_evaluations >= 2
+
+
+def test_skipping_does_not_change_the_tree(small_submission_dataset):
+    """
+    Test that the tree built with skipping (n_jobs=1) is the same as the one built without (n_jobs=2, every attribute is evaluated).
+    """
+    # Fit a DecisionTree object with and without skipping
+    decision_tree = DecisionTree()
+    decision_tree.fit(small_submission_dataset, "Passed", "information_gain")
+    parallel_decision_tree = DecisionTree()
+    parallel_decision_tree.parallel_min_rows = 0
+    parallel_decision_tree.fit(small_submission_dataset, "Passed", "information_gain", n_jobs=2)
+
+    # Check if both trees are the same and only the first one skipped evaluations
+    assert str(decision_tree.tree) == str(parallel_decision_tree.tree)
+    assert parallel_decision_tree.n_skipped_evaluations == 0
@@ -0,0 +1,277 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import gini_index
+import information_gain
+from decision_tree import DecisionTree
+
+from classes.decision_tree_encoded_dataset import DecisionTreeEncodedDataset
+
+#####
+# Test with the small submission dataset
+#####
+
+
+def test_with_small_submission_dataset_and_information_gain(small_submission_dataset):
+    """
+    Test with the small submission dataset (using the "Passed" attribute as the target attribute as
+    intended) and the continuous-valued "Hours" attribute. The result has to be the same as evaluating
+    every midpoint with information_gain.calculate_information_gain.
+    """
+    # Create a DecisionTree object
+    decision_tree = DecisionTree()
+
+    # Set the target attribute
+    decision_tree.target_attribute = "Passed"
+
+    # Find the best threshold
+    best_gain, best_threshold = decision_tree._find_best_threshold(
+        data=DecisionTreeEncodedDataset.from_dataframe(
+            small_submission_dataset, ["Hours"], "Passed"
+        ),
+        rows=np.arange(len(small_submission_dataset)),
+        attribute="Hours",
+        attribute_selection_method="information_gain",
+    )
+
+    # Evaluate every midpoint one after another
+    unique_values = sorted(small_submission_dataset["Hours"].unique())
+    candidates = [(low + high) / 2 for low, high in zip(unique_values[:-1], unique_values[1:])]
+    gains = [
+        information_gain.calculate_information_gain(
+            small_submission_dataset, "Passed", "Hours", candidate
+        )
+        for candidate in candidates
+    ]
+
+    # Check if the best threshold is the same
+    assert best_gain == pytest.approx(max(gains))
+    assert best_threshold == pytest.approx(candidates[int(np.argmax(gains))])
+
+
+#####
+# Test with a random dataset
+#####
+
+
+@pytest.mark.parametrize("attribute_selection_method", ["information_gain", "gini_index"])
+def test_with_random_dataset(attribute_selection_method):
+    """
+    Test with a random dataset with many distinct values and three classes. The result has to be
+    the same as evaluating every midpoint one after another.
+    """
+    # Create the dataset
+    rng = np.random.default_rng(0)
+    dataset = pd.DataFrame(
+        {
+            "Value": rng.integers(0, 40, size=200),
+            "Class": rng.choice(["A", "B", "C"], size=200),
+        }
+    )
+
+    # Create a DecisionTree object
+    decision_tree = DecisionTree()
+
+    # Set the target attribute
+    decision_tree.target_attribute = "Class"
+
+    # Find the best threshold
+    best_score, best_threshold = decision_tree._find_best_threshold(
+        data=DecisionTreeEncodedDataset.from_dataframe(dataset, ["Value"], "Class"),
+        rows=np.arange(len(dataset)),
+        attribute="Value",
+        attribute_selection_method=attribute_selection_method,
+    )
+
+    # Evaluate every midpoint one after another
+    if attribute_selection_method == "information_gain":
+        score_function = information_gain.calculate_information_gain
+    else:
+        score_function = gini_index.calculate_gini_index
+    unique_values = sorted(dataset["Value"].unique())
+    candidates = [(low + high) / 2 for low, high in zip(unique_values[:-1], unique_values[1:])]
+    scores = [score_function(dataset, "Class", "Value", candidate) for candidate in candidates]
+
+    # Check if the best threshold is the same
+    assert best_score == pytest.approx(max(scores))
+    assert best_threshold == pytest.approx(candidates[int(np.argmax(scores))])
+
+
+def test_with_constant_attribute():
+    """
+    Test with an attribute that only has a single value (there is no threshold to split on).
+    """
+    # Create a DecisionTree object
+    decision_tree = DecisionTree()
+
+    # Set the target attribute
+    decision_tree.target_attribute = "Class"
+
+    # Find the best threshold
+    best_score, best_threshold = decision_tree._find_best_threshold(
+        data=DecisionTreeEncodedDataset.from_dataframe(
+            pd.DataFrame({"Value": [3, 3, 3], "Class": ["A", "B", "A"]}), ["Value"], "Class"
+        ),
+        rows=np.arange(3),
+        attribute="Value",
+        attribute_selection_method="gini_index",
+    )
+
+    # Check that no threshold was found
+    assert best_score == -float("inf")
+    assert best_threshold is None
+
+
+#####
+# Tests with the histogram split finder
+#####
+
+
+@pytest.mark.parametrize("attribute_selection_method", ["information_gain", "gini_index"])
+def test_histogram_with_less_distinct_values_than_bins(
+    small_submission_dataset, attribute_selection_method
+):
+    """
+    Test the histogram split finder with the small submission dataset. "Hours" has less distinct values
+    than bins, so every distinct value gets its own bin and the result has to be the same as with the exact split finder.
+    """
+    # Encode the dataset (with bins)
+    encoded_dataset = DecisionTreeEncodedDataset.from_dataframe(
+        small_submission_dataset, ["Hours"], "Passed"
+    )
+    encoded_dataset.bin_continuous_attributes(max_bins=255)
+    rows = np.arange(len(small_submission_dataset))
+
+    # Create a DecisionTree object with the exact split finder
+    decision_tree = DecisionTree()
+    decision_tree.target_attribute = "Passed"
+
+    # Create a DecisionTree object with the histogram split finder
+    histogram_decision_tree = DecisionTree()
+    histogram_decision_tree.target_attribute = "Passed"
+    histogram_decision_tree.split_finder = "histogram"
+
+    # Find the best thresholds
+    exact_result = decision_tree._find_best_threshold(
+        encoded_dataset, rows, "Hours", attribute_selection_method
+    )
+    histogram_result = histogram_decision_tree._find_best_threshold(
+        encoded_dataset, rows, "Hours", attribute_selection_method
+    )
+
+    # Check if both results are the same
+    assert histogram_result[0] == pytest.approx(exact_result[0])
+    assert histogram_result[1] == pytest.approx(exact_result[1])
+
+
+def test_histogram_with_more_distinct_values_than_bins():
+    """
+    Test the histogram split finder with an attribute that has more distinct values than bins.
+    The best threshold has to be a bin boundary and can not be better than the best exact threshold.
+    """
+    # Create the dataset
+    rng = np.random.default_rng(2)
+    dataset = pd.DataFrame(
+        {
+            "Value": rng.normal(size=500),
+            "Class": rng.choice(["A", "B"], size=500),
+        }
+    )
+
+    # Encode the dataset (with at most 16 bins)
+    encoded_dataset = DecisionTreeEncodedDataset.from_dataframe(dataset, ["Value"], "Class")
+    encoded_dataset.bin_continuous_attributes(max_bins=16)
+    rows = np.arange(len(dataset))
+
+    # Check if the values are quantized into at most 16 bins
+    assert encoded_dataset.get_bins("Value").dtype == np.uint8
+    assert len(np.unique(encoded_dataset.get_bins("Value"))) <= 16
+
+    # Create the DecisionTree objects
+    decision_tree = DecisionTree()
+    decision_tree.target_attribute = "Class"
+    histogram_decision_tree = DecisionTree()
+    histogram_decision_tree.target_attribute = "Class"
+    histogram_decision_tree.split_finder = "histogram"
+
+    # Find the best thresholds
+    exact_gain, _ = decision_tree._find_best_threshold(
+        encoded_dataset, rows, "Value", "information_gain"
+    )
+    histogram_gain, histogram_threshold = histogram_decision_tree._find_best_threshold(
+        encoded_dataset, rows, "Value", "information_gain"
+    )
+
+    # Check if the threshold is a bin boundary that is not better than the exact threshold
+    assert histogram_threshold in encoded_dataset.get_bin_thresholds("Value")
+    assert histogram_gain <= exact_gain + 1e-12
+
+
+#####
+# Tests with only the class boundaries as candidate thresholds
+#####
+
+
+@pytest.mark.parametrize("split_finder", ["exact", "histogram"])
+@pytest.mark.parametrize("attribute_selection_method", ["information_gain", "gini_index"])
+@pytest.mark.parametrize("min_samples_leaf", [1, 30])
+def test_boundary_candidates_with_random_dataset(
+    split_finder, attribute_selection_method, min_samples_leaf
+):
+    """
+    Test the "boundary" candidate thresholds with a random dataset whose class mostly increases with the value.
+    The best threshold has to be the same as when evaluating all thresholds.
+    """
+    # Create the dataset
+    rng = np.random.default_rng(5)
+    values = rng.normal(size=300).round(2)
+    dataset = pd.DataFrame(
+        {
+            "Value": values,
+            "Class": np.where(values + rng.normal(scale=0.3, size=300) > 0.5, "A", "B"),
+        }
+    )
+
+    # Encode the dataset (with bins)
+    encoded_dataset = DecisionTreeEncodedDataset.from_dataframe(dataset, ["Value"], "Class")
+    encoded_dataset.bin_continuous_attributes(max_bins=32)
+    rows = np.arange(len(dataset))
+
+    # Create the DecisionTree objects
+    decision_tree = DecisionTree()
+    boundary_decision_tree = DecisionTree()
+    for tree in [decision_tree, boundary_decision_tree]:
+        tree.target_attribute = "Class"
+        tree.split_finder = split_finder
+        tree.min_samples_leaf = min_samples_leaf
+    boundary_decision_tree.candidate_thresholds = "boundary"
+
+    # Find the best thresholds
+    result = decision_tree._find_best_threshold(
+        encoded_dataset, rows, "Value", attribute_selection_method
+    )
+    boundary_result = boundary_decision_tree._find_best_threshold(
+        encoded_dataset, rows, "Value", attribute_selection_method
+    )
+
+    # Check if both results are the same
+    assert boundary_result == result
+
+
+def test_select_class_boundaries():
+    """
+    Test that only the thresholds between runs of the same class are dropped, except for the first and the last candidate.
+    """
+    # The class of every run of values (-1 for a run with several classes)
+    run_class_codes = np.array([0, 0, 0, 1, 1, -1, -1, 1, 1])
+
+    # Select the class boundaries of all and of a limited range of candidates
+    all_selected = DecisionTree._select_class_boundaries(run_class_codes, np.ones(8, dtype=bool))
+    limited_selected = DecisionTree._select_class_boundaries(
+        run_class_codes, np.array([False, True, True, True, True, True, True, False])
+    )
+
+    # Check if the selected thresholds are correct
+    assert list(np.flatnonzero(all_selected)) == [0, 2, 4, 5, 6, 7]
+    assert list(np.flatnonzero(limited_selected)) == [1, 2, 4, 5, 6]
@@ -1,7 +1,11 @@
+import numpy as np
+import pandas as pd
 import pytest
 
 from decision_tree import DecisionTree
 
+from classes.decision_tree_encoded_dataset import DecisionTreeEncodedDataset
+from classes.decision_tree_schema import DecisionTreeSchema
 from classes.decision_tree_internal_node import DecisionTreeInternalNode
 from classes.decision_tree_leaf_node import DecisionTreeLeafNode
 from classes.decision_tree_decision_outcome_above import (
@@ -134,3 +138,931 @@ def test_with_small_student_dataset_and_information_gain(small_student_dataset):
 
 
 # There is no test for the gini index as the splitting criterion because with the small student dataset, the gini index can lead to many different decision trees. We might add a test for the gini index as the splitting criterion in the future with an other dataset but for now the test of the private helper functions shall be enough.
+
+
+#####
+# Tests with presorted attribute lists
+#####
+
+
+@pytest.mark.parametrize("attribute_selection_method", ["information_gain", "gini_index"])
+def test_presort_builds_the_same_tree(attribute_selection_method):
+    """
+    Test that sorting the continuous attributes only once (presort=True) builds exactly the same
+    decision tree as sorting them at every node.
+    """
+    # Create a random dataset with two continuous and one discrete-valued attribute
+    rng = np.random.default_rng(1)
+    dataset = pd.DataFrame(
+        {
+            "Hours": rng.integers(0, 20, size=120),
+            "Score": rng.normal(50, 10, size=120).round(1),
+            "Topic": rng.choice(["Classification", "Clustering"], size=120),
+            "Passed": rng.choice(["Yes", "No"], size=120),
+        }
+    )
+
+    # Fit one decision tree with and one without presorting
+    decision_tree = DecisionTree()
+    decision_tree.fit(
+        dataset=dataset,
+        target_attribute="Passed",
+        attribute_selection_method=attribute_selection_method,
+    )
+    presorted_decision_tree = DecisionTree()
+    presorted_decision_tree.fit(
+        dataset=dataset,
+        target_attribute="Passed",
+        attribute_selection_method=attribute_selection_method,
+        presort=True,
+    )
+
+    # Check if both decision trees are the same
+    assert str(presorted_decision_tree.tree) == str(decision_tree.tree)
+
+
+#####
+# Tests with the histogram split finder
+#####
+
+
+@pytest.mark.parametrize("attribute_selection_method", ["information_gain", "gini_index"])
+def test_histogram_split_finder_with_less_distinct_values_than_bins(
+    small_submission_dataset, attribute_selection_method
+):
+    """
+    Test the histogram split finder with the small submission dataset. Every distinct value gets its own bin,
+    so the decision tree has to partition the training data exactly like the exact split finder does.
+    """
+    # Fit one decision tree with each split finder
+    decision_tree = DecisionTree()
+    decision_tree.fit(
+        dataset=small_submission_dataset,
+        target_attribute="Passed",
+        attribute_selection_method=attribute_selection_method,
+    )
+    histogram_decision_tree = DecisionTree()
+    histogram_decision_tree.fit(
+        dataset=small_submission_dataset,
+        target_attribute="Passed",
+        attribute_selection_method=attribute_selection_method,
+        split_finder="histogram",
+    )
+
+    # Check if both decision trees predict the training data the same way
+    assert histogram_decision_tree.predict(small_submission_dataset) == decision_tree.predict(
+        small_submission_dataset
+    )
+
+
+def test_histogram_split_finder_with_invalid_number_of_bins(small_submission_dataset):
+    """
+    Test that the number of bins has to fit into uint8 bin codes.
+    """
+    # Create a DecisionTree object
+    decision_tree = DecisionTree()
+
+    # Check that fitting with too many bins raises an error
+    with pytest.raises(ValueError):
+        decision_tree.fit(
+            dataset=small_submission_dataset,
+            target_attribute="Passed",
+            attribute_selection_method="gini_index",
+            split_finder="histogram",
+            max_bins=1000,
+        )
+
+
+@pytest.mark.parametrize("attribute_selection_method", ["information_gain", "gini_index"])
+def test_histogram_split_finder_only_counts_the_smaller_children(
+    monkeypatch, attribute_selection_method
+):
+    """
+    Test that the class counts per bin are only counted for the whole dataset and then handed down to the children,
+    where the largest child gets its class counts by subtracting the ones of its siblings from its parent's.
+    No rows but the ones of the whole dataset and of non-largest children may be counted, and the tree has to be the same
+    as the level-wise built one (which counts every node).
+    """
+    # Create a random dataset with two continuous attributes
+    rng = np.random.default_rng(6)
+    dataset = pd.DataFrame(
+        {
+            "Hours": rng.integers(0, 20, size=300),
+            "Score": rng.normal(50, 10, size=300),
+            "Topic": rng.choice(["Classification", "Clustering", "Regression"], size=300),
+            "Grade": rng.choice(["A", "B", "C"], size=300),
+        }
+    )
+
+    # Record the number of rows of every count of class labels per bin
+    n_counted_rows = []
+    get_bin_class_counts = DecisionTreeEncodedDataset.get_bin_class_counts
+
+    def record_bin_class_counts(self, rows, attribute):
+        n_counted_rows.append(len(rows))
+        return get_bin_class_counts(self, rows, attribute)
+
+    monkeypatch.setattr(DecisionTreeEncodedDataset, "get_bin_class_counts", record_bin_class_counts)
+
+    # Fit a decision tree with the histogram split finder
+    decision_tree = DecisionTree()
+    decision_tree.fit(
+        dataset=dataset,
+        target_attribute="Grade",
+        attribute_selection_method=attribute_selection_method,
+        split_finder="histogram",
+        max_bins=8,
+    )
+
+    # Check if only the whole dataset (once per continuous attribute) and at most half of a node's rows are counted
+    assert n_counted_rows.count(len(dataset)) == 2
+    assert max(n for n in n_counted_rows if n != len(dataset)) <= len(dataset) // 2
+
+    # Check if the decision tree is the same as the level-wise built one
+    monkeypatch.undo()
+    level_wise_decision_tree = DecisionTree()
+    level_wise_decision_tree.fit(
+        dataset=dataset,
+        target_attribute="Grade",
+        attribute_selection_method=attribute_selection_method,
+        split_finder="histogram",
+        max_bins=8,
+        builder="level_wise",
+    )
+    assert str(decision_tree.tree) == str(level_wise_decision_tree.tree)
+
+
+def test_histogram_split_finder_subtracts_float_sample_weights_exactly():
+    """
+    Test that the class counts per bin of the largest child, which are its parent's minus the ones of its siblings,
+    are the same as counting its rows with float sample weights. The sums of the weights of a bin that is empty in
+    the largest child may differ by a rounding error, which must not make the bin non-empty.
+    """
+    # Create a random dataset where the values of "Hours" depend on the "Topic" (so some bins are empty in every child)
+    rng = np.random.default_rng(8)
+    topic = rng.choice(["Classification", "Clustering", "Regression"], size=300, p=[0.25, 0.25, 0.5])
+    dataset = pd.DataFrame(
+        {
+            "Topic": topic,
+            "Hours": np.where(
+                topic == "Regression", rng.integers(10, 20, size=300), rng.integers(0, 10, size=300)
+            ),
+            "Grade": rng.choice(["A", "B", "C"], size=300),
+        }
+    )
+    sample_weight = rng.choice([0.1, 0.2, 0.7, 1 / 3], size=300)
+
+    # Encode and bin the dataset
+    data = DecisionTreeEncodedDataset.from_dataframe(dataset, ["Topic", "Hours"], "Grade", sample_weight)
+    data.bin_continuous_attributes(max_bins=20)
+
+    # Hand the class counts per bin of all rows down to the children of a split on "Topic"
+    decision_tree = DecisionTree()
+    rows = np.arange(len(dataset))
+    subset_rows = [rows[topic == value] for value in ["Classification", "Clustering", "Regression"]]
+    subset_histograms = decision_tree._partition_histograms(
+        data, subset_rows, decision_tree._get_histograms(data, rows, ["Hours"]), ["Hours"], 1
+    )
+
+    # Check if the class counts per bin of the largest child are the same as counting its rows
+    counted_histogram = data.get_bin_class_counts(subset_rows[2], "Hours")
+    assert np.array_equal(subset_histograms[2]["Hours"] == 0, counted_histogram == 0)
+    assert subset_histograms[2]["Hours"] == pytest.approx(counted_histogram)
+
+
+#####
+# Tests with parallel attribute evaluation
+#####
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"attribute_selection_method": "information_gain"},
+        {"attribute_selection_method": "gini_index"},
+        {"attribute_selection_method": "gini_index", "presort": True},
+        {"attribute_selection_method": "information_gain", "split_finder": "histogram"},
+    ],
+)
+def test_parallel_attribute_evaluation_builds_the_same_tree(options):
+    """
+    Test that evaluating the attributes in two worker processes builds exactly the same decision tree
+    as evaluating them in the main process.
+    """
+    # Create a random dataset with two continuous and two discrete-valued attributes
+    rng = np.random.default_rng(3)
+    dataset = pd.DataFrame(
+        {
+            "Hours": rng.integers(0, 20, size=150),
+            "Score": rng.normal(50, 10, size=150).round(1),
+            "Topic": rng.choice(["Classification", "Clustering", "Regression"], size=150),
+            "Exercise": rng.choice(["Yes", "No"], size=150),
+            "Passed": rng.choice(["Yes", "No"], size=150),
+        }
+    )
+
+    # Fit one decision tree in the main process
+    decision_tree = DecisionTree()
+    decision_tree.fit(dataset=dataset, target_attribute="Passed", **options)
+
+    # Fit one decision tree with two worker processes (evaluating every node in the workers)
+    parallel_decision_tree = DecisionTree()
+    parallel_decision_tree.parallel_min_rows = 0
+    parallel_decision_tree.fit(dataset=dataset, target_attribute="Passed", n_jobs=2, **options)
+
+    # Check if both decision trees are the same
+    assert str(parallel_decision_tree.tree) == str(decision_tree.tree)
+
+
+@pytest.mark.parametrize("parallel_min_rows", [0, 40])
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"attribute_selection_method": "information_gain"},
+        {"attribute_selection_method": "gini_index", "presort": True},
+        {"attribute_selection_method": "gini_index", "split_finder": "histogram"},
+    ],
+)
+def test_parallel_builder_builds_the_same_tree(options, parallel_min_rows):
+    """
+    Test that building the subtrees as tasks in two worker processes builds exactly the same decision tree
+    as the recursive builder, both if every subtree is a separate task and if small subtrees are built inline.
+    """
+    # Create a random dataset with two continuous and two discrete-valued attributes
+    rng = np.random.default_rng(4)
+    dataset = pd.DataFrame(
+        {
+            "Hours": rng.integers(0, 20, size=200),
+            "Score": rng.normal(50, 10, size=200).round(1),
+            "Topic": rng.choice(["Classification", "Clustering", "Regression"], size=200),
+            "Exercise": rng.choice(["Yes", "No"], size=200),
+            "Passed": rng.choice(["Yes", "No"], size=200),
+        }
+    )
+
+    # Fit one decision tree with the recursive builder
+    decision_tree = DecisionTree()
+    decision_tree.fit(dataset=dataset, target_attribute="Passed", **options)
+
+    # Fit one decision tree with the parallel builder
+    parallel_decision_tree = DecisionTree()
+    parallel_decision_tree.parallel_min_rows = parallel_min_rows
+    parallel_decision_tree.fit(
+        dataset=dataset, target_attribute="Passed", n_jobs=2, builder="parallel", **options
+    )
+
+    # Check if both decision trees are the same
+    assert str(parallel_decision_tree.tree) == str(decision_tree.tree)
+
+
+def test_parallel_attribute_evaluation_with_invalid_number_of_jobs(small_submission_dataset):
+    """
+    Test that the number of worker processes has to be positive (or -1).
+    """
+    # Create a DecisionTree object
+    decision_tree = DecisionTree()
+
+    # Check that fitting with zero worker processes raises an error
+    with pytest.raises(ValueError):
+        decision_tree.fit(
+            dataset=small_submission_dataset,
+            target_attribute="Passed",
+            attribute_selection_method="gini_index",
+            n_jobs=0,
+        )
+
+
+#####
+# Tests with the level-wise builder
+#####
+
+
+@pytest.mark.parametrize("split_finder", ["exact", "histogram"])
+@pytest.mark.parametrize("attribute_selection_method", ["information_gain", "gini_index"])
+def test_level_wise_builder_builds_the_same_tree(attribute_selection_method, split_finder):
+    """
+    Test that building the decision tree level by level builds exactly the same decision tree
+    as the recursive builder.
+    """
+    # Create a random dataset with two continuous and two discrete-valued attributes and three classes
+    rng = np.random.default_rng(5)
+    dataset = pd.DataFrame(
+        {
+            "Hours": rng.integers(0, 20, size=200),
+            "Score": rng.normal(50, 10, size=200).round(1),
+            "Topic": rng.choice(["Classification", "Clustering", "Regression"], size=200),
+            "Exercise": rng.choice(["Yes", "No"], size=200),
+            "Grade": rng.choice(["A", "B", "C"], size=200),
+        }
+    )
+
+    # Fit one decision tree with each builder
+    decision_tree = DecisionTree()
+    decision_tree.fit(
+        dataset=dataset,
+        target_attribute="Grade",
+        attribute_selection_method=attribute_selection_method,
+        split_finder=split_finder,
+        max_bins=8,
+    )
+    level_wise_decision_tree = DecisionTree()
+    level_wise_decision_tree.fit(
+        dataset=dataset,
+        target_attribute="Grade",
+        attribute_selection_method=attribute_selection_method,
+        split_finder=split_finder,
+        max_bins=8,
+        builder="level_wise",
+    )
+
+    # Check if both decision trees are the same
+    assert str(level_wise_decision_tree.tree) == str(decision_tree.tree)
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        dict(),
+        dict(presort=True),
+        dict(builder="level_wise"),
+        dict(split_finder="histogram"),
+        dict(builder="parallel", n_jobs=2),
+    ],
+)
+def test_missing_values_are_not_thresholds(options):
+    """
+    Test that missing values (NaN) of a continuous attribute neither become a threshold nor count on either side
+    of a threshold, and that their rows go to neither branch of the threshold, with every builder.
+    """
+    # Create a dataset whose class "z" only occurs together with missing values
+    dataset = pd.DataFrame(
+        {
+            "A": [1, 2, 3, 4, np.nan, np.nan, np.nan],
+            "Class": ["x", "x", "y", "y", "z", "z", "z"],
+        }
+    )
+
+    # Create a DecisionTree object
+    decision_tree = DecisionTree()
+    decision_tree.fit(
+        dataset=dataset, target_attribute="Class", attribute_selection_method="information_gain", **options
+    )
+
+    # Check that the threshold is between two present values
+    thresholds = [branch.get_label().value for branch in decision_tree.tree.get_branches()]
+    assert thresholds == [pytest.approx(2.5), pytest.approx(2.5)]
+
+    # Check that the rows with present values are predicted with their own classes (the rows with missing values
+    # did not decide the class of any branch)
+    assert decision_tree.predict(dataset.iloc[:4]) == ["x", "x", "y", "y"]
+
+    # Check that a missing value matches no branch
+    with pytest.raises(ValueError):
+        decision_tree.predict(dataset.iloc[4:5])
+
+
+#####
+# Tests with pre-pruning limits
+#####
+
+
+def get_depth_and_n_leaves(node) -> tuple:
+    """
+    Get the depth and the number of leaves of a (sub)tree.
+    """
+    if isinstance(node, DecisionTreeLeafNode):
+        return 0, 1
+
+    results = [get_depth_and_n_leaves(branch.get_branch_node()) for branch in node.get_branches()]
+    return 1 + max(depth for depth, _ in results), sum(n_leaves for _, n_leaves in results)
+
+
+@pytest.fixture
+def noisy_dataset() -> pd.DataFrame:
+    """
+    A random dataset without any relation between the attributes and the target attribute (grows a large tree).
+    """
+    rng = np.random.default_rng(6)
+    return pd.DataFrame(
+        {
+            "Hours": rng.normal(20, 5, size=300).round(2),
+            "Topic": rng.choice(["Classification", "Clustering", "Regression"], size=300),
+            "Exercise": rng.integers(0, 10, size=300),
+            "Passed": rng.choice(["Yes", "No"], size=300),
+        }
+    )
+
+
+@pytest.mark.parametrize("builder", ["recursive", "level_wise"])
+def test_max_depth_and_max_leaf_nodes(noisy_dataset, builder):
+    """
+    Test that the tree does not get deeper than max_depth and does not get more leaves than max_leaf_nodes.
+    """
+    # Fit a decision tree without limits
+    decision_tree = DecisionTree()
+    decision_tree.fit(
+        dataset=noisy_dataset, target_attribute="Passed", attribute_selection_method="gini_index"
+    )
+    depth, n_leaves = get_depth_and_n_leaves(decision_tree.tree)
+    assert depth == 3 and n_leaves > 4
+
+    # Fit a decision tree with a maximum depth
+    decision_tree.fit(
+        dataset=noisy_dataset,
+        target_attribute="Passed",
+        attribute_selection_method="gini_index",
+        builder=builder,
+        max_depth=2,
+    )
+    assert get_depth_and_n_leaves(decision_tree.tree)[0] == 2
+
+    # Fit a decision tree with a maximum number of leaves
+    decision_tree.fit(
+        dataset=noisy_dataset,
+        target_attribute="Passed",
+        attribute_selection_method="gini_index",
+        builder=builder,
+        max_leaf_nodes=4,
+    )
+    assert get_depth_and_n_leaves(decision_tree.tree)[1] <= 4
+
+
+@pytest.mark.parametrize("split_finder", ["exact", "histogram"])
+def test_min_samples_leaf(noisy_dataset, split_finder):
+    """
+    Test that every leaf gets at least min_samples_leaf training rows (the noisy dataset has no duplicate values
+    in "Hours", so every leaf is reached by at least one row).
+    """
+    # Fit a decision tree with at least 20 rows per leaf on the continuous attribute only
+    dataset = noisy_dataset[["Hours", "Passed"]]
+    decision_tree = DecisionTree()
+    decision_tree.fit(
+        dataset=dataset,
+        target_attribute="Passed",
+        attribute_selection_method="information_gain",
+        split_finder=split_finder,
+        min_samples_leaf=20,
+    )
+
+    # Count the training rows that reach every leaf
+    leaf_sizes = dict()
+    for _, row in dataset.iterrows():
+        node = decision_tree.tree
+        while isinstance(node, DecisionTreeInternalNode):
+            node = next(
+                branch.get_branch_node()
+                for branch in node.get_branches()
+                if branch.value_matches(row[node.get_label()])
+            )
+        leaf_sizes[id(node)] = leaf_sizes.get(id(node), 0) + 1
+
+    # Check that the root was split and every leaf has at least 20 rows
+    assert isinstance(decision_tree.tree, DecisionTreeInternalNode)
+    assert min(leaf_sizes.values()) >= 20
+
+
+def test_min_gain(noisy_dataset):
+    """
+    Test that no split is made if no split reaches min_gain (there is no relation in the noisy dataset).
+    """
+    # Create a DecisionTree object
+    decision_tree = DecisionTree()
+
+    # Fit the decision tree with a minimum information gain no split on noise reaches
+    decision_tree.fit(
+        dataset=noisy_dataset,
+        target_attribute="Passed",
+        attribute_selection_method="information_gain",
+        min_gain=0.5,
+    )
+
+    # Check that the tree is a single leaf
+    assert isinstance(decision_tree.tree, DecisionTreeLeafNode)
+
+
+#####
+# Tests with sample weights
+#####
+
+
+@pytest.mark.parametrize(
+    "attribute_selection_method, split_finder, builder",
+    [
+        ("information_gain", "exact", "recursive"),
+        ("gini_index", "exact", "recursive"),
+        ("information_gain", "histogram", "recursive"),
+        ("gini_index", "exact", "level_wise"),
+    ],
+)
+def test_sample_weight_is_the_same_as_repeated_rows(
+    noisy_dataset, attribute_selection_method, split_finder, builder
+):
+    """
+    Test that a row with integer weight k gives the same tree as k copies of the row (and weight 0 as no row).
+    """
+    # Give every row a weight between 0 and 3
+    sample_weight = np.random.default_rng(7).integers(0, 4, size=len(noisy_dataset))
+    repeated_dataset = noisy_dataset.loc[noisy_dataset.index.repeat(sample_weight)]
+
+    # Fit one decision tree on the repeated rows and one on the weighted rows
+    repeated_decision_tree = DecisionTree()
+    repeated_decision_tree.fit(
+        dataset=repeated_dataset,
+        target_attribute="Passed",
+        attribute_selection_method=attribute_selection_method,
+        split_finder=split_finder,
+        builder=builder,
+        max_bins=16,
+        min_samples_leaf=3,
+    )
+    weighted_decision_tree = DecisionTree()
+    weighted_decision_tree.fit(
+        dataset=noisy_dataset,
+        target_attribute="Passed",
+        attribute_selection_method=attribute_selection_method,
+        split_finder=split_finder,
+        builder=builder,
+        max_bins=16,
+        min_samples_leaf=3,
+        sample_weight=sample_weight,
+    )
+
+    # Check that both trees are the same
+    assert str(weighted_decision_tree.tree) == str(repeated_decision_tree.tree)
+    assert np.array_equal(
+        weighted_decision_tree.tree.get_class_counts(),
+        repeated_decision_tree.tree.get_class_counts(),
+    )
+
+
+@pytest.mark.parametrize("attribute_selection_method", ["information_gain", "gini_index"])
+def test_compress_duplicates(noisy_dataset, attribute_selection_method):
+    """
+    Test that compressing the duplicate rows does not change the tree.
+    """
+    # Only keep discrete-valued attributes, so most rows are duplicates
+    dataset = noisy_dataset[["Topic", "Exercise", "Passed"]]
+
+    # Fit one decision tree on all rows and one on the compressed rows
+    decision_tree = DecisionTree()
+    decision_tree.fit(
+        dataset=dataset,
+        target_attribute="Passed",
+        attribute_selection_method=attribute_selection_method,
+    )
+    compressed_decision_tree = DecisionTree()
+    compressed_decision_tree.fit(
+        dataset=dataset,
+        target_attribute="Passed",
+        attribute_selection_method=attribute_selection_method,
+        compress_duplicates=True,
+    )
+
+    # Check that both trees are the same
+    assert str(compressed_decision_tree.tree) == str(decision_tree.tree)
+    assert compressed_decision_tree.predict(dataset) == decision_tree.predict(dataset)
+
+
+@pytest.mark.parametrize("sample_weight", [[1, 2], [1, 1, 1, 1, 1, -1], [1, 1, 1, np.nan, 1, 1], [0] * 6])
+def test_invalid_sample_weight(small_student_dataset, sample_weight):
+    """
+    Test that invalid sample weights (wrong length, negative, missing or all zero) raise a ValueError.
+    """
+    # Create a DecisionTree object
+    decision_tree = DecisionTree()
+
+    # Check that fitting with the invalid weights raises a ValueError
+    with pytest.raises(ValueError):
+        decision_tree.fit(
+            dataset=small_student_dataset,
+            target_attribute="Passed",
+            attribute_selection_method="information_gain",
+            sample_weight=sample_weight,
+        )
+
+
+#####
+# Tests with sampled split estimation
+#####
+
+
+@pytest.fixture
+def large_dataset() -> pd.DataFrame:
+    """
+    A large random dataset where "Hours" decides the target attribute (with some noise) and the other attributes are noise.
+    """
+    rng = np.random.default_rng(8)
+    hours = rng.normal(20, 5, size=20000).round(2)
+    return pd.DataFrame(
+        {
+            "Hours": hours,
+            "Topic": rng.choice(["Classification", "Clustering", "Regression"], size=20000),
+            "Exercise": rng.integers(0, 10, size=20000),
+            "Passed": np.where(hours + rng.normal(0, 2, size=20000) > 20, "Yes", "No"),
+        }
+    )
+
+
+def test_split_sample_threshold(large_dataset, monkeypatch):
+    """
+    Test that the root chooses its split attribute on a sample and only evaluates the chosen attribute on all rows,
+    with the same split as evaluating all rows.
+    """
+    # Fit a decision tree on all rows
+    decision_tree = DecisionTree()
+    decision_tree.fit(
+        dataset=large_dataset,
+        target_attribute="Passed",
+        attribute_selection_method="information_gain",
+        max_depth=1,
+    )
+
+    # Record the attributes evaluated on all rows
+    evaluated_on_all_rows = []
+    evaluate_encoded_attribute = DecisionTree._evaluate_encoded_attribute
+
+    def record_evaluate_encoded_attribute(self, data, rows, attribute, *args):
+        if len(rows) == len(large_dataset):
+            evaluated_on_all_rows.append(attribute)
+        return evaluate_encoded_attribute(self, data, rows, attribute, *args)
+
+    monkeypatch.setattr(DecisionTree, "_evaluate_encoded_attribute", record_evaluate_encoded_attribute)
+
+    # Fit a decision tree choosing the split attribute of nodes with more than 1000 rows on a sample
+    sampled_decision_tree = DecisionTree()
+    sampled_decision_tree.fit(
+        dataset=large_dataset,
+        target_attribute="Passed",
+        attribute_selection_method="information_gain",
+        max_depth=1,
+        split_sample_threshold=1000,
+        random_state=0,
+    )
+
+    # Check that only the chosen attribute was evaluated on all rows and that the split is the same
+    assert evaluated_on_all_rows == ["Hours"]
+    assert str(sampled_decision_tree.tree) == str(decision_tree.tree)
+
+
+def test_split_sample_threshold_random_state(large_dataset):
+    """
+    Test that the samples only depend on random_state (the tree is the same for every builder).
+    """
+    trees = []
+    for builder in ["recursive", "parallel"]:
+        decision_tree = DecisionTree()
+        decision_tree.parallel_min_rows = 2000
+        decision_tree.fit(
+            dataset=large_dataset,
+            target_attribute="Passed",
+            attribute_selection_method="gini_index",
+            builder=builder,
+            n_jobs=2,
+            max_depth=4,
+            split_sample_threshold=500,
+            split_sample_tie_threshold=0.05,
+            random_state=3,
+        )
+        trees.append(str(decision_tree.tree))
+
+    # Check that both trees are the same
+    assert trees[0] == trees[1]
+
+
+def test_split_sample_threshold_with_level_wise_builder(small_student_dataset):
+    """
+    Test that sampled split estimation cannot be combined with the level-wise builder.
+    """
+    # Create a DecisionTree object
+    decision_tree = DecisionTree()
+
+    # Check that fitting level-wise with a sample threshold raises a ValueError
+    with pytest.raises(ValueError):
+        decision_tree.fit(
+            dataset=small_student_dataset,
+            target_attribute="Passed",
+            attribute_selection_method="information_gain",
+            builder="level_wise",
+            split_sample_threshold=2,
+        )
+
+
+#####
+# Tests with random splits
+#####
+
+
+@pytest.mark.parametrize("attribute_selection_method", ["information_gain", "gini_index"])
+def test_random_splitter(noisy_dataset, attribute_selection_method):
+    """
+    Test that the random splitter grows a tree that is the same for the same random_state (also with worker processes)
+    and whose thresholds lie within the values of the attribute.
+    """
+    trees = []
+    for n_jobs in [1, 2]:
+        decision_tree = DecisionTree()
+        decision_tree.parallel_min_rows = 50
+        decision_tree.fit(
+            dataset=noisy_dataset,
+            target_attribute="Passed",
+            attribute_selection_method=attribute_selection_method,
+            builder="parallel",
+            n_jobs=n_jobs,
+            splitter="random",
+            random_state=5,
+        )
+        trees.append(decision_tree)
+
+    # Check that both trees are the same
+    assert str(trees[0].tree) == str(trees[1].tree)
+
+    # Check that the root is split and that a threshold lies within the values of its attribute
+    decision_tree = trees[0]
+    assert isinstance(decision_tree.tree, DecisionTreeInternalNode)
+    for branch in decision_tree.tree.get_branches():
+        outcome = branch.get_label()
+        if isinstance(outcome, (DecisionTreeDecisionOutcomeAbove, DecisionTreeDecisionOutcomeBelowEqual)):
+            values = noisy_dataset[decision_tree.tree.get_label()]
+            assert values.min() <= outcome.value < values.max()
+
+
+def test_random_splitter_with_presort(small_student_dataset):
+    """
+    Test that the random splitter cannot be combined with presorted attribute lists.
+    """
+    # Create a DecisionTree object
+    decision_tree = DecisionTree()
+
+    # Check that fitting with presorted attribute lists raises a ValueError
+    with pytest.raises(ValueError):
+        decision_tree.fit(
+            dataset=small_student_dataset,
+            target_attribute="Passed",
+            attribute_selection_method="information_gain",
+            presort=True,
+            splitter="random",
+        )
+
+
+def test_random_generator_of_a_child_with_all_rows_of_its_parent():
+    """
+    Test that a child node that keeps all rows of its parent node does not repeat the random draws of its parent node,
+    while every node draws the same numbers for the same random_state.
+    """
+    # Create a DecisionTree object
+    decision_tree = DecisionTree()
+    decision_tree.random_state = 0
+
+    # Draw random numbers for the same rows at the depth of the parent node and of the child node
+    rows = np.arange(100)
+    parent_draws = decision_tree._get_node_random_generator(rows, 0).random(5)
+    child_draws = decision_tree._get_node_random_generator(rows, 1).random(5)
+
+    # Check that the draws differ between the nodes, but are reproducible
+    assert not np.array_equal(parent_draws, child_draws)
+    assert np.array_equal(decision_tree._get_node_random_generator(rows, 1).random(5), child_draws)
+
+
+#####
+# Tests with a schema
+#####
+
+
+@pytest.mark.parametrize("attribute_selection_method", ["information_gain", "gini_index"])
+def test_pandas_categorical(noisy_dataset, attribute_selection_method):
+    """
+    Test that pandas Categorical columns are split on their values (like string columns) without copying their codes.
+    """
+    # The same dataset with "Topic" as a Categorical with an unused category
+    categorical_dataset = noisy_dataset.astype({"Topic": "category"})
+    categorical_dataset["Topic"] = categorical_dataset["Topic"].cat.add_categories(["Statistics"])
+
+    # Fit one decision tree on each dataset
+    decision_tree = DecisionTree()
+    decision_tree.fit(
+        dataset=noisy_dataset,
+        target_attribute="Passed",
+        attribute_selection_method=attribute_selection_method,
+        max_depth=3,
+    )
+    categorical_decision_tree = DecisionTree()
+    categorical_decision_tree.fit(
+        dataset=categorical_dataset,
+        target_attribute="Passed",
+        attribute_selection_method=attribute_selection_method,
+        max_depth=3,
+    )
+
+    # Check that both trees are the same
+    assert categorical_decision_tree.schema.get_type("Topic") == "categorical"
+    assert str(categorical_decision_tree.tree) == str(decision_tree.tree)
+
+    # Check that the encoded dataset uses the codes of the column
+    encoded_dataset = DecisionTreeEncodedDataset.from_dataframe(
+        categorical_dataset, ["Topic"], "Passed"
+    )
+    assert np.shares_memory(
+        encoded_dataset.get_column("Topic"), categorical_dataset["Topic"].cat.codes.to_numpy()
+    )
+
+
+def test_schema(noisy_dataset):
+    """
+    Test that the schema overrides the inferred types: a numeric attribute marked categorical is split on its values,
+    and a boolean attribute is split into False and True.
+    """
+    dataset = noisy_dataset[["Exercise", "Passed"]].assign(Late=noisy_dataset["Hours"] > 20)
+
+    # Fit a decision tree with "Exercise" as a categorical attribute
+    decision_tree = DecisionTree()
+    decision_tree.fit(
+        dataset=dataset,
+        target_attribute="Passed",
+        attribute_selection_method="information_gain",
+        max_depth=1,
+        schema=DecisionTreeSchema({"Exercise": "categorical"}),
+    )
+
+    # Check that the types are fixed and the root is split into one branch per exercise
+    assert decision_tree.schema.attribute_types == {"Exercise": "categorical", "Late": "boolean"}
+    assert decision_tree.tree.get_label() == "Exercise"
+    assert len(decision_tree.tree.get_branches()) == 10
+    assert all(
+        isinstance(branch.get_label(), DecisionTreeDecisionOutcomeEquals)
+        for branch in decision_tree.tree.get_branches()
+    )
+
+
+@pytest.mark.parametrize(
+    "attribute_types",
+    [{"Major": "numeric"}, {"Major": "boolean"}, {"Major": "text"}, {"Unknown": "numeric"}],
+)
+def test_invalid_schema(small_student_dataset, attribute_types):
+    """
+    Test that a schema with an invalid type or an attribute that is not in the dataset raises a ValueError.
+    """
+    # Create a DecisionTree object
+    decision_tree = DecisionTree()
+
+    # Check that fitting with the invalid schema raises a ValueError
+    with pytest.raises(ValueError):
+        decision_tree.fit(
+            dataset=small_student_dataset,
+            target_attribute="Passed",
+            attribute_selection_method="information_gain",
+            schema=DecisionTreeSchema(attribute_types),
+        )
+
+
+#####
+# Tests with Arrow data
+#####
+
+
+@pytest.mark.parametrize("attribute_selection_method", ["information_gain", "gini_index"])
+def test_arrow_table(noisy_dataset, attribute_selection_method):
+    """
+    Test that fitting on a pyarrow Table (with a dictionary-encoded attribute) or a RecordBatch builds the same tree
+    and predictions as fitting on the pandas DataFrame.
+    """
+    pa = pytest.importorskip("pyarrow")
+    table = pa.Table.from_pandas(noisy_dataset, preserve_index=False)
+    table = table.set_column(
+        table.schema.get_field_index("Topic"), "Topic", table.column("Topic").dictionary_encode()
+    )
+
+    # Fit one decision tree on the DataFrame, one on the Table and one on a RecordBatch
+    decision_tree = DecisionTree()
+    decision_tree.fit(noisy_dataset, "Passed", attribute_selection_method, max_depth=4)
+    arrow_decision_tree = DecisionTree()
+    arrow_decision_tree.fit(table, "Passed", attribute_selection_method, max_depth=4)
+    batch_decision_tree = DecisionTree()
+    batch_decision_tree.fit(table.to_batches()[0], "Passed", attribute_selection_method, max_depth=4)
+
+    # Check that the trees and the predictions are the same
+    assert str(arrow_decision_tree.tree) == str(decision_tree.tree)
+    assert str(batch_decision_tree.tree) == str(decision_tree.tree)
+    assert arrow_decision_tree.predict(table) == decision_tree.predict(noisy_dataset)
+
+
+def test_arrow_table_with_weights(noisy_dataset):
+    """
+    Test that sample weights and compress_duplicates work on a pyarrow Table like on the pandas DataFrame.
+    """
+    pa = pytest.importorskip("pyarrow")
+    dataset = noisy_dataset[["Topic", "Exercise", "Passed"]]
+    table = pa.Table.from_pandas(dataset, preserve_index=False)
+    sample_weight = np.arange(len(dataset)) % 3
+
+    # Fit one decision tree on the DataFrame and one on the Table, with weights and compressed duplicates
+    decision_tree = DecisionTree()
+    decision_tree.fit(
+        dataset, "Passed", "gini_index", sample_weight=sample_weight, compress_duplicates=True
+    )
+    arrow_decision_tree = DecisionTree()
+    arrow_decision_tree.fit(
+        table, "Passed", "gini_index", sample_weight=sample_weight, compress_duplicates=True
+    )
+
+    # Check that both trees are the same
+    assert str(arrow_decision_tree.tree) == str(decision_tree.tree)
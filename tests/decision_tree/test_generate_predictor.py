@@ -0,0 +1,238 @@
+import importlib
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from decision_tree import DecisionTree
+
+from classes.decision_tree_leaf_node import DecisionTreeLeafNode
+from classes.decision_tree_internal_node import DecisionTreeInternalNode
+from classes.decision_tree_branch import DecisionTreeBranch
+from classes.decision_tree_decision_outcome_above import (
+    DecisionTreeDecisionOutcomeAbove,
+)
+from classes.decision_tree_decision_outcome_below_equal import (
+    DecisionTreeDecisionOutcomeBelowEqual,
+)
+from classes.decision_tree_decision_outcome_equals import (
+    DecisionTreeDecisionOutcomeEquals,
+)
+from classes.decision_tree_decision_outcome_in_list import (
+    DecisionTreeDecisionOutcomeInList,
+)
+
+#####
+# Tests with a decision tree inspired by the small student dataset
+# Tree structure:
+# Participation
+# ├── High: Yes
+# ├── {Medium, Unknown}: Age
+# │   ├── <= 25: Yes
+# │   └── > 25: No
+# └── Low: No
+#####
+
+
+@pytest.fixture
+def decision_tree():
+    """
+    Create a DecisionTree object with a decision tree inspired by the small student dataset.
+    """
+    decision_tree = DecisionTree()
+    decision_tree.tree = DecisionTreeInternalNode(
+        attribute_label="Participation",
+        branches=[
+            DecisionTreeBranch(
+                label=DecisionTreeDecisionOutcomeEquals(value="High"),
+                branch_node=DecisionTreeLeafNode(class_label="Yes"),
+            ),
+            DecisionTreeBranch(
+                label=DecisionTreeDecisionOutcomeInList(values=["Medium", "Unknown"]),
+                branch_node=DecisionTreeInternalNode(
+                    attribute_label="Age",
+                    branches=[
+                        DecisionTreeBranch(
+                            label=DecisionTreeDecisionOutcomeBelowEqual(value=25),
+                            branch_node=DecisionTreeLeafNode(class_label="Yes"),
+                        ),
+                        DecisionTreeBranch(
+                            label=DecisionTreeDecisionOutcomeAbove(value=25),
+                            branch_node=DecisionTreeLeafNode(class_label="No"),
+                        ),
+                    ],
+                ),
+            ),
+            DecisionTreeBranch(
+                label=DecisionTreeDecisionOutcomeEquals(value="Low"),
+                branch_node=DecisionTreeLeafNode(class_label="No"),
+            ),
+        ],
+    )
+
+    return decision_tree
+
+
+def test_with_dict_rows(decision_tree):
+    """
+    Test the generated function with rows passed as dictionaries.
+    """
+    # Generate the function
+    predict = decision_tree.generate_predictor()
+
+    # Check if the predictions are correct
+    assert predict({"Age": 20, "Participation": "High"}) == "Yes"
+    assert predict({"Age": 20, "Participation": "Unknown"}) == "Yes"
+    assert predict({"Age": 30, "Participation": "Medium"}) == "No"
+    assert predict({"Age": 30, "Participation": "Low"}) == "No"
+
+    # Check that a value without a matching branch raises a ValueError
+    with pytest.raises(ValueError, match="'None' of attribute 'Participation'"):
+        predict({"Age": 30, "Participation": "None"})
+
+
+def test_with_tuple_rows(decision_tree):
+    """
+    Test the generated function with rows passed as tuples (in the order of the attributes of the tree).
+    """
+    # Generate the function
+    predict = decision_tree.generate_predictor(row_format="tuple")
+
+    # Check if the predictions are correct
+    assert predict(("Medium", 20)) == "Yes"
+    assert predict(("Medium", 26)) == "No"
+
+
+def test_with_module(decision_tree, tmp_path):
+    """
+    Test that the generated function is written to a module that can be imported again.
+    """
+    module_path = tmp_path / "student_predictor.py"
+
+    # Generate the module
+    predict = decision_tree.generate_predictor(module_path=str(module_path))
+
+    # Check that the module holds the function and the attributes
+    sys.path.insert(0, str(tmp_path))
+    try:
+        module = importlib.import_module("student_predictor")
+    finally:
+        sys.path.remove(str(tmp_path))
+        sys.modules.pop("student_predictor", None)
+    assert module.ATTRIBUTES == ("Participation", "Age")
+    assert module.predict({"Age": 30, "Participation": "Medium"}) == "No"
+    assert predict({"Age": 30, "Participation": "Medium"}) == "No"
+
+
+def test_with_module_regenerated_to_the_same_path(tmp_path):
+    """
+    Test that a tree written to the path of the module of another tree right after it (within the same second and with
+    a source of the same size) predicts with its own branches and not the cached bytecode of the other tree.
+    """
+    module_path = str(tmp_path / "regenerated_predictor.py")
+
+    for labels in [("a", "b"), ("b", "a"), ("a", "b")]:
+        # Create a tree splitting at 1.5 with the given labels
+        decision_tree = DecisionTree()
+        decision_tree.tree = DecisionTreeInternalNode(
+            attribute_label="Age",
+            branches=[
+                DecisionTreeBranch(
+                    label=DecisionTreeDecisionOutcomeBelowEqual(value=1.5),
+                    branch_node=DecisionTreeLeafNode(class_label=labels[0]),
+                ),
+                DecisionTreeBranch(
+                    label=DecisionTreeDecisionOutcomeAbove(value=1.5),
+                    branch_node=DecisionTreeLeafNode(class_label=labels[1]),
+                ),
+            ],
+        )
+        dataset = pd.DataFrame({"Age": [1.0, 2.0]})
+
+        # Generate the module to the same path
+        predict = decision_tree.generate_predictor(module_path=module_path)
+
+        # Check that the function and the module imported again predict like the tree
+        assert [predict({"Age": 1.0}), predict({"Age": 2.0})] == decision_tree.predict(dataset)
+        sys.path.insert(0, str(tmp_path))
+        try:
+            module = importlib.import_module("regenerated_predictor")
+        finally:
+            sys.path.remove(str(tmp_path))
+            sys.modules.pop("regenerated_predictor", None)
+        assert module.predict({"Age": 1.0}) == labels[0]
+
+
+def test_with_deep_tree():
+    """
+    Test that a tree deeper than the nesting limit of the Python parser is generated in several functions.
+    """
+    # Create a chain of 300 thresholds: the leaf of threshold i is i
+    tree = DecisionTreeLeafNode(class_label=-1)
+    for threshold in range(300):
+        tree = DecisionTreeInternalNode(
+            attribute_label="Age",
+            branches=[
+                DecisionTreeBranch(
+                    label=DecisionTreeDecisionOutcomeAbove(value=float(threshold)),
+                    branch_node=DecisionTreeLeafNode(class_label=threshold),
+                ),
+                DecisionTreeBranch(
+                    label=DecisionTreeDecisionOutcomeBelowEqual(value=float(threshold)),
+                    branch_node=tree,
+                ),
+            ],
+        )
+    decision_tree = DecisionTree()
+    decision_tree.tree = tree
+
+    # Generate the function
+    predict = decision_tree.generate_predictor()
+
+    # Check if the predictions are correct
+    assert predict({"Age": 0.5}) == 0
+    assert predict({"Age": 150.5}) == 150
+    assert predict({"Age": -1}) == -1
+
+
+#####
+# Tests with fitted decision trees
+#####
+
+
+@pytest.mark.parametrize("attribute_selection_method", ["information_gain", "gini_index"])
+def test_with_fitted_tree(attribute_selection_method):
+    """
+    Test that the generated function predicts the same labels as predict on a random dataset with continuous,
+    discrete-valued and boolean attributes.
+    """
+    rng = np.random.default_rng(0)
+    dataset = pd.DataFrame(
+        {
+            "Hours": rng.integers(0, 30, 500).astype(float),
+            "Topic": rng.choice(["Classification", "Clustering", "Regression", "Rules"], 500),
+            "Late": rng.random(500) < 0.3,
+            "Passed": rng.choice(["Yes", "No"], 500),
+        }
+    )
+
+    # Fit the decision tree and generate the functions
+    decision_tree = DecisionTree()
+    decision_tree.fit(dataset, "Passed", attribute_selection_method)
+    predict = decision_tree.generate_predictor()
+    predict_tuple = decision_tree.generate_predictor(row_format="tuple")
+
+    # Check that the functions predict the same labels
+    rows = dataset.drop(columns="Passed")
+    predictions = decision_tree.predict(dataset)
+    assert [predict(row) for row in rows.to_dict("records")] == predictions
+    assert [predict_tuple(row) for row in rows.itertuples(index=False)] == predictions
+
+
+def test_with_invalid_row_format(decision_tree):
+    """
+    Test that an invalid row format raises a ValueError.
+    """
+    with pytest.raises(ValueError):
+        decision_tree.generate_predictor(row_format="list")
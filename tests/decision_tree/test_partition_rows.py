@@ -0,0 +1,42 @@
+import numpy as np
+
+from decision_tree import DecisionTree
+
+#####
+# Tests with a small array of row positions
+#####
+
+
+def test_rows_are_partitioned_in_place():
+    """
+    Test that the rows are reordered in place and that the rows of every branch are views
+    of a contiguous part of the rows (keeping their relative order).
+    """
+    # The positions of the rows of a node and the branch every row falls into
+    rows = np.array([7, 3, 9, 1, 4, 8])
+    branch_of_row = np.array([1, 0, 2, 1, 0, 1])
+
+    # Partition the rows
+    subset_rows = DecisionTree._partition_rows(rows, branch_of_row, n_branches=3)
+
+    # Check if the rows of every branch are correct
+    assert [list(branch_rows) for branch_rows in subset_rows] == [[3, 4], [7, 1, 8], [9]]
+
+    # Check if the rows were reordered in place and the branches are views of them
+    assert list(rows) == [3, 4, 7, 1, 8, 9]
+    assert all(branch_rows.base is rows for branch_rows in subset_rows)
+
+
+def test_with_empty_branch():
+    """
+    Test the partition of the rows if one of the branches does not get any rows.
+    """
+    # The positions of the rows of a node and the branch every row falls into
+    rows = np.array([2, 0, 1])
+    branch_of_row = np.array([0, 0, 2])
+
+    # Partition the rows
+    subset_rows = DecisionTree._partition_rows(rows, branch_of_row, n_branches=3)
+
+    # Check if the rows of every branch are correct
+    assert [list(branch_rows) for branch_rows in subset_rows] == [[2, 0], [], [1]]
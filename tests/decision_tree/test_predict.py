@@ -1,4 +1,6 @@
+import numpy as np
 import pandas as pd
+import pytest
 
 from decision_tree import DecisionTree
 
@@ -84,3 +86,123 @@ def test_with_decision_tree_inspired_by_small_student_dataset():
 
     # Check if the predictions are correct
     assert predictions == ["Yes", "No", "No"]
+
+
+#####
+# Tests with the "partition" engine
+# Tree structure:
+# Participation
+# ├── High: Yes
+# ├── {Medium, Unknown}: Age
+# │   ├── <= 25: Yes
+# │   └── > 25: No
+# └── Low: No
+#####
+
+
+def _create_decision_tree_with_list() -> DecisionTree:
+    """
+    Create a DecisionTree object with a decision tree inspired by the small student dataset,
+    with a list of values in one branch.
+    """
+    decision_tree = DecisionTree()
+    decision_tree.tree = DecisionTreeInternalNode(
+        attribute_label="Participation",
+        branches=[
+            DecisionTreeBranch(
+                label=DecisionTreeDecisionOutcomeEquals(value="High"),
+                branch_node=DecisionTreeLeafNode(class_label="Yes"),
+            ),
+            DecisionTreeBranch(
+                label=DecisionTreeDecisionOutcomeInList(values=["Medium", "Unknown"]),
+                branch_node=DecisionTreeInternalNode(
+                    attribute_label="Age",
+                    branches=[
+                        DecisionTreeBranch(
+                            label=DecisionTreeDecisionOutcomeBelowEqual(value=25),
+                            branch_node=DecisionTreeLeafNode(class_label="Yes"),
+                        ),
+                        DecisionTreeBranch(
+                            label=DecisionTreeDecisionOutcomeAbove(value=25),
+                            branch_node=DecisionTreeLeafNode(class_label="No"),
+                        ),
+                    ],
+                ),
+            ),
+            DecisionTreeBranch(
+                label=DecisionTreeDecisionOutcomeEquals(value="Low"),
+                branch_node=DecisionTreeLeafNode(class_label="No"),
+            ),
+        ],
+    )
+
+    return decision_tree
+
+
+def test_with_partition_engine():
+    """
+    Test predict() with the "partition" engine, which has to predict the same labels as the "rows" engine.
+    """
+    decision_tree = _create_decision_tree_with_list()
+
+    # Create the tuples to predict (pandas DataFrame)
+    tuples_to_predict = pd.DataFrame(
+        {
+            "Age": [20, 30, 40, 25, 26],
+            "Major": ["CS", "DS", "DS", "CS", "CS"],
+            "Participation": ["High", "Medium", "Low", "Unknown", "Unknown"],
+        }
+    )
+
+    # Predict the tuples with both engines
+    predictions = decision_tree.predict(dataset=tuples_to_predict, engine="partition")
+
+    # Check if the predictions are correct
+    assert predictions == ["Yes", "No", "No", "Yes", "No"]
+    assert predictions == decision_tree.predict(dataset=tuples_to_predict, engine="rows")
+
+
+def test_with_partition_engine_without_matching_branch():
+    """
+    Test that the "partition" engine raises a ValueError for a value without a matching branch.
+    """
+    decision_tree = _create_decision_tree_with_list()
+
+    # Check that the missing participation raises a ValueError
+    with pytest.raises(ValueError, match="of attribute 'Participation'"):
+        decision_tree.predict(
+            dataset=pd.DataFrame({"Age": [20, 30], "Participation": ["High", None]}),
+            engine="partition",
+        )
+
+
+def test_missing_value_does_not_match_a_missing_value_in_a_list():
+    """
+    Test that a missing value (NaN) matches no list of values, even a list holding the same NaN object.
+    Both engines have to raise a ValueError, as for any other value without a matching branch.
+    """
+    decision_tree = _create_decision_tree_with_list()
+
+    # Put the NaN object into the list of values of the second branch
+    outcome = DecisionTreeDecisionOutcomeInList(values=["Medium", np.nan])
+    decision_tree.tree.branches[1].label = outcome
+
+    # Check that the missing participation matches no branch
+    assert not outcome.value_matches(np.nan)
+    for engine in ["rows", "partition"]:
+        with pytest.raises(ValueError):
+            decision_tree.predict(
+                dataset=pd.DataFrame({"Age": [20], "Participation": pd.Series([np.nan], dtype=object)}),
+                engine=engine,
+            )
+
+
+def test_with_invalid_engine():
+    """
+    Test that an invalid engine raises a ValueError.
+    """
+    decision_tree = _create_decision_tree_with_list()
+
+    # Check that the invalid engine raises a ValueError
+    with pytest.raises(ValueError):
+        decision_tree.predict(dataset=pd.DataFrame({"Age": [20]}), engine="tree")
@@ -0,0 +1,132 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from decision_tree import DecisionTree
+
+from classes.decision_tree_leaf_node import DecisionTreeLeafNode
+from classes.decision_tree_internal_node import DecisionTreeInternalNode
+
+#####
+# Tests with a decision tree inspired by the small student dataset
+# (see the pruning_decision_tree fixture, pruning alphas 0.1 for "Age" and 0.15 for the root node)
+#####
+
+
+def test_with_alpha_below_all_pruning_alphas(pruning_decision_tree):
+    """
+    Test prune() with an alpha below all pruning alphas. The tree has to stay the same.
+    """
+    # Use the DecisionTree object of the fixture
+    decision_tree = pruning_decision_tree
+
+    # Prune the decision tree
+    pruned_decision_tree = decision_tree.prune(alpha=0.05)
+
+    # Check if the pruned decision tree is the same
+    assert str(pruned_decision_tree.tree) == str(decision_tree.tree)
+
+
+def test_with_alpha_of_inner_node(pruning_decision_tree):
+    """
+    Test prune() with the pruning alpha of the "Age" node. The "Age" node has to become a leaf
+    (with the first of the equally frequent class labels), the original tree must not change.
+    """
+    # Use the DecisionTree object of the fixture
+    decision_tree = pruning_decision_tree
+
+    # Prune the decision tree
+    pruned_decision_tree = decision_tree.prune(alpha=0.1)
+
+    # Check if the "Age" node became a leaf
+    medium_node = pruned_decision_tree.tree.get_branches()[1].get_branch_node()
+    assert isinstance(medium_node, DecisionTreeLeafNode)
+    assert medium_node.get_label() == "No"
+    prediction = pruned_decision_tree._predict_tuple(
+        tuple={"Participation": "Medium", "Age": 20}, node=pruned_decision_tree.tree
+    )
+    assert prediction == "No"
+
+    # Check that the original decision tree did not change
+    assert isinstance(
+        decision_tree.tree.get_branches()[1].get_branch_node(), DecisionTreeInternalNode
+    )
+    prediction = decision_tree._predict_tuple(
+        tuple={"Participation": "Medium", "Age": 20}, node=decision_tree.tree
+    )
+    assert prediction == "Yes"
+
+
+def test_with_alpha_of_root_node(pruning_decision_tree):
+    """
+    Test prune() with the pruning alpha of the root node. The whole tree has to become a single leaf
+    with the majority class label.
+    """
+    # Use the DecisionTree object of the fixture
+    decision_tree = pruning_decision_tree
+
+    # Prune the decision tree
+    pruned_decision_tree = decision_tree.prune(alpha=0.15)
+
+    # Check if the tree is a single leaf
+    assert isinstance(pruned_decision_tree.tree, DecisionTreeLeafNode)
+    assert pruned_decision_tree.tree.get_label() == "Yes"
+
+
+def test_with_negative_alpha(pruning_decision_tree):
+    """
+    Test that an error is raised for a negative alpha.
+    """
+    # Use the DecisionTree object of the fixture
+    decision_tree = pruning_decision_tree
+
+    # Check that pruning raises an error
+    with pytest.raises(ValueError):
+        decision_tree.prune(alpha=-1)
+
+
+#####
+# Test with a random dataset
+#####
+
+
+def count_leaves(node) -> int:
+    """
+    Count the leaves of a (sub)tree.
+    """
+    if isinstance(node, DecisionTreeLeafNode):
+        return 1
+
+    return sum(count_leaves(branch.get_branch_node()) for branch in node.get_branches())
+
+
+def test_with_every_alpha_of_the_pruning_path():
+    """
+    Test prune() with every alpha of the pruning path of a fitted decision tree. Every pruned tree has to have the
+    number of leaves and the training error rate the pruning path states.
+    """
+    # Create the dataset
+    rng = np.random.default_rng(8)
+    dataset = pd.DataFrame(
+        {
+            "Hours": rng.normal(20, 5, size=200).round(1),
+            "Topic": rng.choice(["Classification", "Clustering", "Regression"], size=200),
+            "Passed": rng.choice(["Yes", "No"], size=200),
+        }
+    )
+
+    # Fit the decision tree
+    decision_tree = DecisionTree()
+    decision_tree.fit(
+        dataset=dataset, target_attribute="Passed", attribute_selection_method="information_gain"
+    )
+
+    # Prune the decision tree with every alpha of the pruning path
+    path = decision_tree.cost_complexity_pruning_path()
+    for alpha, n_leaves, error_rate in path.itertuples(index=False):
+        pruned_decision_tree = decision_tree.prune(alpha)
+
+        # Check the number of leaves and the training error rate
+        predictions = pruned_decision_tree.predict(dataset)
+        assert count_leaves(pruned_decision_tree.tree) == n_leaves
+        assert np.mean(predictions != dataset["Passed"]) == pytest.approx(error_rate)
@@ -1,3 +1,5 @@
+import numpy as np
+import pandas as pd
 import pytest
 
 import gini_index
@@ -120,3 +122,27 @@ def test_with_small_student_dataset_age_as_partition_attribute_and_split_25_5(
 
     # Check if the calculated gini index is correct
     assert gini_index_value == pytest.approx(0.05555555555555558)
+
+
+#####
+# Test with missing values
+#####
+
+
+def test_with_missing_values_of_the_partition_attribute():
+    """
+    Test the calculate_gini_index function with a missing value of the continuous-valued partition attribute. The row with the missing value is in neither partition, but counts in the impurity before partitioning and in the weights of the partitions.
+    """
+    # Create the dataset
+    dataset = pd.DataFrame({"A": [1, 2, 3, np.nan], "Class": ["x", "x", "y", "y"]})
+
+    # Calculate the gini index for the partitioned dataset
+    gini_index_value = gini_index.calculate_gini_index(
+        dataset=dataset,
+        target_attribute="Class",
+        partition_attribute="A",
+        split=1.5,
+    )
+
+    # Check if the calculated gini index is correct: 0.5 - (1/4 * 0 + 2/4 * 0.5)
+    assert gini_index_value == pytest.approx(0.25)
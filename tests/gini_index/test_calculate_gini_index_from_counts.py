@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import gini_index
+
+
+#####
+# Test with the small student dataset
+#####
+
+
+def test_with_small_student_dataset_participation_as_partition_attribute(
+    small_student_dataset,
+):
+    """
+    Test the calculate_gini_index_from_counts function with the contingency tables of every split of the discrete-valued "Participation" attribute of the small student dataset at once. The results have to be the same as calculating the gini index of every split one after another with the dataset.
+    """
+
+    # Count the class labels in and not in every split
+    splits = [{"Low"}, {"Medium"}, {"High"}]
+    contingency_tables = np.stack(
+        [
+            pd.crosstab(
+                small_student_dataset["Participation"].isin(list(split)),
+                small_student_dataset["Passed"],
+            ).to_numpy()
+            for split in splits
+        ]
+    )
+
+    # Calculate the gini index of all splits at once
+    gini_index_values = gini_index.calculate_gini_index_from_counts(contingency_tables)
+
+    # Check if every gini index is correct
+    assert gini_index_values.shape == (len(splits),)
+    for split, gini_index_value in zip(splits, gini_index_values):
+        assert gini_index_value == pytest.approx(
+            gini_index.calculate_gini_index(
+                small_student_dataset, "Passed", "Participation", split
+            )
+        )
+
+
+#####
+# Tests with contingency tables
+#####
+
+
+def test_with_pure_partitions():
+    """
+    Test the calculate_gini_index_from_counts function with a split into pure partitions (the gini index is the whole impurity).
+    """
+
+    # Calculate the gini index
+    gini_index_value = gini_index.calculate_gini_index_from_counts(np.array([[4, 0], [0, 4]]))
+
+    # Check if the calculated gini index is correct
+    assert gini_index_value == pytest.approx(0.5)
+
+
+def test_with_empty_partition():
+    """
+    Test the calculate_gini_index_from_counts function with an empty partition (it does not contribute to the impurity).
+    """
+
+    # Calculate the impurity of the partitions
+    impurities = gini_index.calculate_impurity_from_counts(np.array([[3, 1], [0, 0]]))
+    impurity_partitioned = gini_index.calculate_impurity_partitioned_from_counts(
+        np.array([[3, 1], [0, 0]])
+    )
+
+    # Check if the empty partition has no impurity
+    assert impurities == pytest.approx([0.375, 0])
+    assert impurity_partitioned == pytest.approx(0.375)
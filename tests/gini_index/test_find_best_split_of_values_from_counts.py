@@ -0,0 +1,78 @@
+import itertools
+
+import numpy as np
+import pytest
+
+import gini_index
+
+
+#####
+# Tests with random class counts
+#####
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_exhaustive_search_finds_the_best_split(seed):
+    """
+    Test the find_best_split_of_values_from_counts function with the class counts of 7 values and three classes.
+    The Gray code search has to find the best Gini index of evaluating every split into two groups one after another.
+    """
+    # Create random class counts
+    rng = np.random.default_rng(seed)
+    class_counts = rng.integers(1, 20, size=(7, 3))
+
+    # Calculate the Gini index of every split into two groups of values
+    gini_index_values = []
+    for size in range(1, len(class_counts)):
+        for group in itertools.combinations(range(len(class_counts)), size):
+            group_counts = class_counts[list(group)].sum(axis=0)
+            gini_index_values.append(
+                gini_index.calculate_gini_index_from_counts(
+                    np.stack([group_counts, class_counts.sum(axis=0) - group_counts])
+                )
+            )
+
+    # Find the best split
+    gini_index_value, first_group = gini_index.find_best_split_of_values_from_counts(class_counts)
+
+    # Check if the best gini index is found and the first group is the smaller group
+    assert gini_index_value == pytest.approx(max(gini_index_values))
+    assert 1 <= len(first_group) <= len(class_counts) // 2
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_ordered_search_with_binary_target_attribute(seed):
+    """
+    Test that only evaluating the splits of the ordered values (max_exhaustive_categories below the number of values)
+    finds the same best Gini index as the exhaustive search if the target attribute is binary.
+    """
+    # Create random class counts of two classes
+    rng = np.random.default_rng(seed)
+    class_counts = rng.integers(1, 20, size=(9, 2))
+
+    # Find the best split with both searches
+    exhaustive_gini_index_value, _ = gini_index.find_best_split_of_values_from_counts(class_counts)
+    ordered_gini_index_value, first_group = gini_index.find_best_split_of_values_from_counts(
+        class_counts, max_exhaustive_categories=4
+    )
+
+    # Check if the best gini index is the same
+    assert ordered_gini_index_value == pytest.approx(exhaustive_gini_index_value)
+    assert 1 <= len(first_group) <= len(class_counts) // 2
+
+
+@pytest.mark.parametrize("max_exhaustive_categories", [10, 1])
+def test_without_split_leaving_min_samples_leaf_rows(max_exhaustive_categories):
+    """
+    Test that no split is found if no split leaves min_samples_leaf rows in both groups.
+    """
+    class_counts = np.array([[3, 0], [0, 2], [1, 1]])
+
+    # Find the best split
+    gini_index_value, first_group = gini_index.find_best_split_of_values_from_counts(
+        class_counts, max_exhaustive_categories, min_samples_leaf=5
+    )
+
+    # Check that there is no split
+    assert gini_index_value == -float("inf")
+    assert first_group is None
@@ -0,0 +1,139 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import gini_index
+from decision_tree import DecisionTree
+
+
+#####
+# Test with the small student dataset
+#####
+
+
+def test_with_small_student_dataset(small_student_dataset):
+    """
+    Test the score_all_attributes function with the small student dataset (using the "Passed" attribute as the target attribute as intended). The best gini index of every attribute has to be the same as evaluating every split one after another with calculate_gini_index.
+    """
+
+    # Score all attributes at once
+    scores = gini_index.score_all_attributes(small_student_dataset, "Passed")
+
+    for attribute, row in scores.iterrows():
+        values = sorted(small_student_dataset[attribute].unique())
+        if pd.api.types.is_numeric_dtype(small_student_dataset[attribute]):
+            # Every midpoint between two distinct values
+            candidates = [(low + high) / 2 for low, high in zip(values[:-1], values[1:])]
+        else:
+            # Every split into two groups of values
+            candidates = [
+                set(combination)
+                for size in range(1, len(values))
+                for combination in itertools.combinations(values, size)
+            ]
+        gini_index_values = [
+            gini_index.calculate_gini_index(small_student_dataset, "Passed", attribute, candidate)
+            for candidate in candidates
+        ]
+
+        # Check if the best gini index is the same and the split achieves it
+        assert row["gini_index"] == pytest.approx(max(gini_index_values))
+        assert gini_index.calculate_gini_index(
+            small_student_dataset, "Passed", attribute, row["split"]
+        ) == pytest.approx(row["gini_index"])
+
+
+#####
+# Test with a random dataset
+#####
+
+
+def test_with_many_categories_and_binary_target():
+    """
+    Test the score_all_attributes function with a discrete-valued attribute that has more values than max_exhaustive_categories and a binary target.
+    The splits of the ordered values contain the best split, so the result has to be the same as evaluating all splits.
+    """
+
+    # Create the dataset
+    rng = np.random.default_rng(4)
+    dataset = pd.DataFrame(
+        {
+            "Value": rng.choice(list("abcdefgh"), size=300),
+            "Class": rng.choice(["A", "B"], size=300),
+        }
+    )
+
+    # Score the attribute with and without evaluating all splits
+    exhaustive_scores = gini_index.score_all_attributes(dataset, "Class")
+    ordered_scores = gini_index.score_all_attributes(
+        dataset, "Class", max_exhaustive_categories=4
+    )
+
+    # Check if the best gini index is the same
+    assert ordered_scores.loc["Value", "gini_index"] == pytest.approx(
+        exhaustive_scores.loc["Value", "gini_index"]
+    )
+
+
+#####
+# Tests with missing values
+#####
+
+
+@pytest.mark.parametrize("split_finder", ["exact", "histogram"])
+def test_with_missing_values(split_finder):
+    """
+    Test the score_all_attributes function with missing values of a continuous and a discrete-valued attribute. The rows with a missing value are in no partition, but count in the impurity before partitioning,
+    so the gini index has to be the same as the one of calculate_gini_index and of a DecisionTree.
+    """
+
+    # Create the dataset (the attributes split the rows with a value perfectly)
+    dataset = pd.DataFrame(
+        {
+            "Value": [1.0, 2.0, 3.0, np.nan],
+            "Category": ["p", "p", "q", None],
+            "Class": ["x", "x", "y", "y"],
+        }
+    )
+
+    # Score all attributes at once
+    scores = gini_index.score_all_attributes(dataset, "Class", split_finder=split_finder)
+
+    # Create a DecisionTree object
+    decision_tree = DecisionTree()
+    decision_tree.target_attribute = "Class"
+    decision_tree.split_finder = split_finder
+
+    # Check if the gini index of the threshold is the same
+    assert scores.loc["Value", "split"] == pytest.approx(2.5)
+    assert scores.loc["Value", "gini_index"] == pytest.approx(0.5)
+    assert scores.loc["Value", "gini_index"] == pytest.approx(
+        gini_index.calculate_gini_index(dataset, "Class", "Value", 2.5)
+    )
+    assert scores.loc["Value", "gini_index"] == pytest.approx(
+        decision_tree._calculate_gini_index(dataset, "Value")[0]
+    )
+
+    # Check if the gini index of the split into two groups of values is the same (the missing value is in neither group)
+    assert scores.loc["Category", "split"] in [{"p"}, {"q"}]
+    assert scores.loc["Category", "gini_index"] == pytest.approx(0.5)
+    assert scores.loc["Category", "gini_index"] == pytest.approx(
+        gini_index.calculate_gini_index(dataset, "Class", "Category", scores.loc["Category", "split"])
+    )
+    assert scores.loc["Category", "gini_index"] == pytest.approx(
+        decision_tree._calculate_gini_index(dataset, "Category")[0]
+    )
+
+
+@pytest.mark.parametrize("max_exhaustive_categories", [-1, gini_index.MAX_EXHAUSTIVE_CATEGORIES + 1])
+def test_with_invalid_max_exhaustive_categories(small_student_dataset, max_exhaustive_categories):
+    """
+    Test that the score_all_attributes function raises a ValueError if max_exhaustive_categories is below 0 or above
+    MAX_EXHAUSTIVE_CATEGORIES (all 2^(k-1) - 1 splits are evaluated at once).
+    """
+    with pytest.raises(ValueError):
+        gini_index.score_all_attributes(
+            small_student_dataset, "Passed", max_exhaustive_categories=max_exhaustive_categories
+        )
@@ -1,3 +1,5 @@
+import numpy as np
+import pandas as pd
 import pytest
 
 import information_gain
@@ -79,3 +81,27 @@ def test_with_small_student_dataset_age_as_partition_attribute_and_a_split_point
 
     # Check if the calculated information gain is correct
     assert information_gain_value == pytest.approx(0.08170416594551044)
+
+
+#####
+# Test with missing values
+#####
+
+
+def test_with_missing_values_of_the_partition_attribute():
+    """
+    Test the calculate_information_gain function with a missing value of the continuous-valued partition attribute. The row with the missing value is in neither partition, but counts in the entropy before partitioning and in the weights of the partitions.
+    """
+    # Create the dataset
+    dataset = pd.DataFrame({"A": [1, 2, 3, np.nan], "Class": ["x", "x", "y", "y"]})
+
+    # Calculate the information gain for the partitioned dataset
+    information_gain_value = information_gain.calculate_information_gain(
+        dataset=dataset,
+        target_attribute="Class",
+        partition_attribute="A",
+        split_value=1.5,
+    )
+
+    # Check if the calculated information gain is correct: 1 - (1/4 * 0 + 2/4 * 1)
+    assert information_gain_value == pytest.approx(0.5)
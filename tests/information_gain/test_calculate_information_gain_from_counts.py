@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import information_gain
+
+
+#####
+# Test with the small submission dataset
+#####
+
+
+def test_with_small_submission_dataset_hours_as_partition_attribute(
+    small_submission_dataset,
+):
+    """
+    Test the calculate_information_gain_from_counts function with the contingency tables of every threshold of the continuous-valued "Hours" attribute of the small submission dataset at once. The results have to be the same as calculating the information gain of every threshold one after another with the dataset.
+    """
+
+    # Count the class labels below or equal and above every threshold
+    thresholds = sorted(small_submission_dataset["Hours"].unique())[:-1]
+    contingency_tables = np.stack(
+        [
+            pd.crosstab(
+                small_submission_dataset["Hours"] > threshold,
+                small_submission_dataset["Passed"],
+            ).to_numpy()
+            for threshold in thresholds
+        ]
+    )
+
+    # Calculate the information gain of all thresholds at once
+    information_gain_values = information_gain.calculate_information_gain_from_counts(
+        contingency_tables
+    )
+
+    # Check if every information gain is correct
+    assert information_gain_values.shape == (len(thresholds),)
+    for threshold, information_gain_value in zip(thresholds, information_gain_values):
+        assert information_gain_value == pytest.approx(
+            information_gain.calculate_information_gain(
+                small_submission_dataset, "Passed", "Hours", threshold
+            )
+        )
+
+
+#####
+# Tests with contingency tables
+#####
+
+
+def test_with_pure_partitions():
+    """
+    Test the calculate_information_gain_from_counts function with a split into pure partitions (the information gain is the whole entropy).
+    """
+
+    # Calculate the information gain
+    information_gain_value = information_gain.calculate_information_gain_from_counts(
+        np.array([[4, 0], [0, 4]])
+    )
+
+    # Check if the calculated information gain is correct
+    assert information_gain_value == pytest.approx(1)
+
+
+def test_with_empty_partition():
+    """
+    Test the calculate_information_gain_from_counts function with an empty partition (it does not contribute to the information).
+    """
+
+    # Calculate the information and the entropy
+    information = information_gain.calculate_information_partitioned_from_counts(
+        np.array([[3, 1], [0, 0]])
+    )
+    entropy = information_gain.calculate_entropy_from_counts(np.array([3, 1]))
+
+    # Check if the information equals the entropy of the non-empty partition
+    assert information == pytest.approx(entropy)
+    assert entropy == pytest.approx(0.8112781244591328)
@@ -0,0 +1,153 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import information_gain
+from decision_tree import DecisionTree
+
+
+#####
+# Test with the small submission dataset
+#####
+
+
+def test_with_small_submission_dataset(small_submission_dataset):
+    """
+    Test the score_all_attributes function with the small submission dataset (using the "Passed" attribute as the target attribute as intended). The best information gain of every attribute has to be the same as evaluating every split one after another with calculate_information_gain.
+    """
+
+    # Score all attributes at once
+    scores = information_gain.score_all_attributes(small_submission_dataset, "Passed")
+
+    # Check if every attribute except the target attribute is scored
+    assert list(scores.index) == [
+        attribute for attribute in small_submission_dataset.columns if attribute != "Passed"
+    ]
+
+    for attribute, row in scores.iterrows():
+        if pd.api.types.is_numeric_dtype(small_submission_dataset[attribute]):
+            # Evaluate every midpoint one after another
+            unique_values = sorted(small_submission_dataset[attribute].unique())
+            candidates = [
+                (low + high) / 2 for low, high in zip(unique_values[:-1], unique_values[1:])
+            ]
+            gains = [
+                information_gain.calculate_information_gain(
+                    small_submission_dataset, "Passed", attribute, candidate
+                )
+                for candidate in candidates
+            ]
+
+            # Check if the best threshold is the same
+            assert row["information_gain"] == pytest.approx(max(gains))
+            assert row["split"] == pytest.approx(candidates[int(np.argmax(gains))])
+        else:
+            # Check if the information gain of the split into one partition per value is the same
+            assert row["split"] is None
+            assert row["information_gain"] == pytest.approx(
+                information_gain.calculate_information_gain(
+                    small_submission_dataset, "Passed", attribute
+                )
+            )
+
+
+#####
+# Tests with a random dataset
+#####
+
+
+def test_with_histogram_split_finder():
+    """
+    Test the score_all_attributes function with the histogram split finder on a continuous attribute with more distinct values than bins. The threshold has to be found among the bin thresholds, so its information gain can not be better than the exact one.
+    """
+
+    # Create the dataset
+    rng = np.random.default_rng(3)
+    dataset = pd.DataFrame(
+        {
+            "Value": rng.normal(size=400),
+            "Constant": np.ones(400),
+            "Class": rng.choice(["A", "B"], size=400),
+        }
+    )
+
+    # Score all attributes with both split finders
+    exact_scores = information_gain.score_all_attributes(dataset, "Class")
+    histogram_scores = information_gain.score_all_attributes(
+        dataset, "Class", split_finder="histogram", max_bins=16
+    )
+
+    # Check if the histogram threshold is scored correctly and not better than the exact one
+    assert histogram_scores.loc["Value", "information_gain"] == pytest.approx(
+        information_gain.calculate_information_gain(
+            dataset, "Class", "Value", histogram_scores.loc["Value", "split"]
+        )
+    )
+    assert (
+        histogram_scores.loc["Value", "information_gain"]
+        <= exact_scores.loc["Value", "information_gain"] + 1e-12
+    )
+
+    # Check that the constant attribute can not be split
+    assert exact_scores.loc["Constant", "information_gain"] == 0
+    assert exact_scores.loc["Constant", "split"] is None
+
+
+def test_with_invalid_split_finder(small_submission_dataset):
+    """
+    Test the score_all_attributes function with an invalid split finder.
+    """
+
+    with pytest.raises(ValueError):
+        information_gain.score_all_attributes(
+            small_submission_dataset, "Passed", split_finder="approximate"
+        )
+
+
+#####
+# Tests with missing values
+#####
+
+
+@pytest.mark.parametrize("split_finder", ["exact", "histogram"])
+def test_with_missing_values(split_finder):
+    """
+    Test the score_all_attributes function with missing values of a continuous and a discrete-valued attribute. The rows with a missing value are in no partition, but count in the entropy before partitioning,
+    so the information gain has to be the same as the one of calculate_information_gain and of a DecisionTree.
+    """
+
+    # Create the dataset (the attributes split the rows with a value perfectly)
+    dataset = pd.DataFrame(
+        {
+            "Value": [1.0, 2.0, 3.0, np.nan],
+            "Category": ["p", "p", "q", None],
+            "Class": ["x", "x", "y", "y"],
+        }
+    )
+
+    # Score all attributes at once
+    scores = information_gain.score_all_attributes(dataset, "Class", split_finder=split_finder)
+
+    # Create a DecisionTree object
+    decision_tree = DecisionTree()
+    decision_tree.target_attribute = "Class"
+    decision_tree.split_finder = split_finder
+
+    # Check if the information gain of the threshold is the same
+    assert scores.loc["Value", "split"] == pytest.approx(2.5)
+    assert scores.loc["Value", "information_gain"] == pytest.approx(1.0)
+    assert scores.loc["Value", "information_gain"] == pytest.approx(
+        information_gain.calculate_information_gain(dataset, "Class", "Value", 2.5)
+    )
+    assert scores.loc["Value", "information_gain"] == pytest.approx(
+        decision_tree._calculate_information_gain(dataset, "Value")[0]
+    )
+
+    # Check if the information gain of the split into one partition per value is the same
+    assert scores.loc["Category", "information_gain"] == pytest.approx(1.0)
+    assert scores.loc["Category", "information_gain"] == pytest.approx(
+        information_gain.calculate_information_gain(dataset, "Class", "Category")
+    )
+    assert scores.loc["Category", "information_gain"] == pytest.approx(
+        decision_tree._calculate_information_gain(dataset, "Category")[0]
+    )
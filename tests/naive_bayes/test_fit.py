@@ -165,3 +165,93 @@ def test_with_small_submission_dataset(small_submission_dataset):
     assert naive_bayes.likelihoods.likelihoods["Hours"]["No"]["std"] == pytest.approx(
         1.5275252316519468
     )
+
+
+#####
+# Tests with sample weights
+#####
+
+
+def test_sample_weight_is_the_same_as_repeated_rows(small_submission_dataset):
+    """
+    Test that a row with integer weight k gives the same prior probabilities and likelihoods as k copies of the row.
+    """
+    # Give every row a weight between 0 and 3
+    sample_weight = [1, 3, 0, 2, 1, 2, 3, 1, 2, 1][: len(small_submission_dataset)]
+    repeated_dataset = small_submission_dataset.loc[
+        small_submission_dataset.index.repeat(sample_weight)
+    ]
+
+    # Fit one Naive Bayes classifier on the repeated rows and one on the weighted rows
+    repeated_naive_bayes = NaiveBayes()
+    repeated_naive_bayes.fit(repeated_dataset, "Passed")
+    weighted_naive_bayes = NaiveBayes()
+    weighted_naive_bayes.fit(small_submission_dataset, "Passed", sample_weight=sample_weight)
+
+    # Check if the prior probabilities are the same
+    for class_label in repeated_naive_bayes.class_labels:
+        assert weighted_naive_bayes.prior_probabilities.get_prior_probability(
+            class_label
+        ) == pytest.approx(
+            repeated_naive_bayes.prior_probabilities.get_prior_probability(class_label)
+        )
+
+    # Check if the likelihoods are the same
+    likelihoods = repeated_naive_bayes.likelihoods.likelihoods
+    weighted_likelihoods = weighted_naive_bayes.likelihoods.likelihoods
+    assert weighted_likelihoods.keys() == likelihoods.keys()
+    for attribute in likelihoods:
+        for key, value in likelihoods[attribute].items():
+            assert weighted_likelihoods[attribute][key] == pytest.approx(value)
+
+
+def test_compress_duplicates(small_submission_dataset):
+    """
+    Test that compressing the duplicate rows does not change the predictions.
+    """
+    # Duplicate every row a few times
+    dataset = small_submission_dataset.loc[small_submission_dataset.index.repeat(3)]
+
+    # Fit one Naive Bayes classifier on all rows and one on the compressed rows
+    naive_bayes = NaiveBayes()
+    naive_bayes.fit(dataset, "Passed")
+    compressed_naive_bayes = NaiveBayes()
+    compressed_naive_bayes.fit(dataset, "Passed", compress_duplicates=True)
+
+    # Check if the predictions are the same
+    assert compressed_naive_bayes.predict(small_submission_dataset) == naive_bayes.predict(
+        small_submission_dataset
+    )
+    assert compressed_naive_bayes.prior_probabilities.get_prior_probability(
+        "Yes"
+    ) == pytest.approx(0.7)
+
+
+def test_arrow_table(small_submission_dataset):
+    """
+    Test that fitting on a pyarrow Table gives the same prior probabilities, likelihoods and predictions as the pandas DataFrame.
+    """
+    pa = pytest.importorskip("pyarrow")
+    table = pa.Table.from_pandas(small_submission_dataset, preserve_index=False)
+
+    # Fit one Naive Bayes classifier on the DataFrame and one on the Table
+    naive_bayes = NaiveBayes()
+    naive_bayes.fit(small_submission_dataset, "Passed")
+    arrow_naive_bayes = NaiveBayes()
+    arrow_naive_bayes.fit(table, "Passed")
+
+    # Check if the prior probabilities and likelihoods are the same
+    assert arrow_naive_bayes.class_labels == naive_bayes.class_labels
+    for class_label in naive_bayes.class_labels:
+        assert arrow_naive_bayes.prior_probabilities.get_prior_probability(
+            class_label
+        ) == pytest.approx(naive_bayes.prior_probabilities.get_prior_probability(class_label))
+    likelihoods = naive_bayes.likelihoods.likelihoods
+    arrow_likelihoods = arrow_naive_bayes.likelihoods.likelihoods
+    assert arrow_likelihoods.keys() == likelihoods.keys()
+    for attribute in likelihoods:
+        for key, value in likelihoods[attribute].items():
+            assert arrow_likelihoods[attribute][key] == pytest.approx(value)
+
+    # Check if the predictions are the same
+    assert arrow_naive_bayes.predict(table) == naive_bayes.predict(small_submission_dataset)
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+
+import sample_weights
+
+
+#####
+# Test with the small student dataset
+#####
+
+
+def test_with_small_student_dataset(small_student_dataset):
+    """
+    Test the compress_duplicate_rows function with the small student dataset repeated twice (every row has one duplicate).
+    """
+    dataset = pd.concat([small_student_dataset, small_student_dataset])
+
+    # Compress the duplicate rows
+    compressed_dataset, weights = sample_weights.compress_duplicate_rows(dataset)
+
+    # Check that every row is kept once, in the order of first appearance, with weight 2
+    pd.testing.assert_frame_equal(compressed_dataset, small_student_dataset)
+    assert np.array_equal(weights, [2] * len(small_student_dataset))
+
+
+#####
+# Tests with missing values and weights
+#####
+
+
+def test_with_missing_values_and_weights():
+    """
+    Test that missing values are compared like any other value and that the weights of the copies are added up.
+    """
+    dataset = pd.DataFrame(
+        {
+            "Hours": [1.0, np.nan, 1.0, np.nan, 2.0],
+            "Passed": ["Yes", "No", "Yes", "No", "Yes"],
+        }
+    )
+
+    # Compress the duplicate rows with weights
+    compressed_dataset, weights = sample_weights.compress_duplicate_rows(
+        dataset, np.array([0.5, 1.0, 2.0, 3.0, 1.5])
+    )
+
+    # Check the distinct rows and their total weights
+    assert compressed_dataset["Passed"].tolist() == ["Yes", "No", "Yes"]
+    assert np.array_equal(compressed_dataset["Hours"].to_numpy(), [1.0, np.nan, 2.0], equal_nan=True)
+    assert np.array_equal(weights, [2.5, 4.0, 1.5])